@@ -1,4 +1,10 @@
 from django.contrib import admin
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
 from airport.models import (
     AirplaneType,
     Airplane,
@@ -10,21 +16,155 @@ from airport.models import (
     Ticket
 )
 
+# Below this many rows an exact COUNT(*) is cheap enough to run.
+ESTIMATED_COUNT_THRESHOLD = 10_000
+
+
+def estimated_count(queryset) -> int | None:
+    """Return the planner's row estimate of an unfiltered table.
+
+    PostgreSQL keeps it in ``pg_class.reltuples``, refreshed by
+    autovacuum and ANALYZE. ``None`` means it is unknown or does not
+    apply: other backends, filtered querysets, never analyzed tables.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql" or queryset.query.where:
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+            [connection.ops.quote_name(queryset.model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Count large unfiltered changelists from table statistics"""
+
+    @cached_property
+    def count(self) -> int:
+        estimate = estimated_count(self.object_list)
+        if estimate is None or estimate < ESTIMATED_COUNT_THRESHOLD:
+            return super().count
+        return estimate
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Admin of a table too large for full counts and text scans.
+
+    Search terms match ``search_fields`` exactly, so indexes serve them,
+    and fields a term is not valid for (text for an id) are skipped.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+
+        query = Q()
+        for name in self.get_search_fields(request):
+            try:
+                value = self.search_field(name).to_python(term)
+            except ValidationError:
+                continue
+            query |= Q(**{f"{name}__exact": value})
+        return queryset.filter(query) if query else queryset.none(), False
+
+    def search_field(self, name: str):
+        opts = self.opts
+        for part in name.split("__"):
+            field = opts.get_field(part)
+            if field.is_relation:
+                opts = field.related_model._meta
+        if field.is_relation:
+            field = field.target_field
+        return field
+
 
 class TicketInline(admin.TabularInline):
     model = Ticket
-    extra = 1
+    extra = 0
+    raw_id_fields = ("flight",)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            "flight__route__source",
+            "flight__route__destination",
+        )
 
 
 @admin.register(Order)
-class OrderAdmin(admin.ModelAdmin):
+class OrderAdmin(LargeTableAdmin):
     inlines = (TicketInline,)
+    list_display = ("id", "user", "created_at")
+    list_select_related = ("user",)
+    # Ids grow with created_at, which has no index to sort by.
+    ordering = ("-id",)
+    raw_id_fields = ("user",)
+    search_fields = ("id", "user__email")
+
+
+@admin.register(Flight)
+class FlightAdmin(LargeTableAdmin):
+    list_display = (
+        "id",
+        "route",
+        "airplane",
+        "departure_time",
+        "arrival_time",
+    )
+    list_select_related = (
+        "route__source",
+        "route__destination",
+        "airplane",
+    )
+    autocomplete_fields = ("route", "airplane", "crew")
+    date_hierarchy = "departure_time"
+    ordering = ("departure_time", "arrival_time", "id")
+    search_fields = ("id", "route__source__name", "route__destination__name")
+
+
+@admin.register(Ticket)
+class TicketAdmin(LargeTableAdmin):
+    list_display = ("id", "flight", "order", "row", "seat")
+    list_select_related = (
+        "flight__route__source",
+        "flight__route__destination",
+        "order__user",
+    )
+    # Meta.ordering sorts by flight times over a join no index serves.
+    ordering = ("-id",)
+    raw_id_fields = ("flight", "order")
+    search_fields = ("order__id", "order__user__email")
+
+
+@admin.register(Route)
+class RouteAdmin(admin.ModelAdmin):
+    list_select_related = ("source", "destination")
+    autocomplete_fields = ("source", "destination")
+    search_fields = ("source__name", "destination__name")
+
+
+@admin.register(Airplane)
+class AirplaneAdmin(admin.ModelAdmin):
+    search_fields = ("name",)
+
+
+@admin.register(Airport)
+class AirportAdmin(admin.ModelAdmin):
+    search_fields = ("name", "closest_big_city")
+
+
+@admin.register(Crew)
+class CrewAdmin(admin.ModelAdmin):
+    search_fields = ("first_name", "last_name")
 
 
 admin.site.register(AirplaneType)
-admin.site.register(Airplane)
-admin.site.register(Airport)
-admin.site.register(Route)
-admin.site.register(Crew)
-admin.site.register(Flight)
-admin.site.register(Ticket)
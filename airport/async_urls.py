@@ -0,0 +1,25 @@
+from django.urls import path
+
+from airport.async_views import (
+    AsyncAirportView,
+    AsyncFlightView,
+    AsyncRouteView
+)
+
+urlpatterns = [
+    path("airports/", AsyncAirportView.as_view(), name="airport-list"),
+    path("routes/", AsyncRouteView.as_view(), name="route-list"),
+    path(
+        "routes/<int:pk>/",
+        AsyncRouteView.as_view(),
+        name="route-detail"
+    ),
+    path("flights/", AsyncFlightView.as_view(), name="flight-list"),
+    path(
+        "flights/<int:pk>/",
+        AsyncFlightView.as_view(),
+        name="flight-detail"
+    ),
+]
+
+app_name = "airport-async"
@@ -0,0 +1,82 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils.decorators import classonlymethod
+from django.views import View
+
+from airport.views import AirportViewSet, FlightViewSet, RouteViewSet
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide pool running async read requests"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.ASYNC_READ_WORKERS,
+                thread_name_prefix="airport-async-read",
+            )
+        return _executor
+
+
+class AsyncReadOnlyView(View):
+    """Serve ``list`` and ``retrieve`` of a DRF viewset asynchronously.
+
+    The viewset handles the request as its synchronous endpoint does, so
+    responses match. Authentication, the queries, serialization and
+    rendering run in a single call on one of ``ASYNC_READ_WORKERS``
+    threads instead of one ``sync_to_async`` hop each on the one thread
+    Django keeps for sync code, where concurrent requests would queue
+    behind each other's queries. Worker threads close their connections
+    like request threads do, once unusable or past ``CONN_MAX_AGE``.
+    """
+
+    viewset_class = None
+    thread_sensitive = False
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True
+        return view
+
+    async def get(self, request, *args, **kwargs):
+        if self.thread_sensitive:
+            respond = sync_to_async(self.respond)
+        else:
+            respond = sync_to_async(
+                self.respond,
+                thread_sensitive=False,
+                executor=get_executor(),
+            )
+        return await respond(request, *args, **kwargs)
+
+    def respond(self, request, *args, **kwargs):
+        action = "retrieve" if "pk" in kwargs else "list"
+        view = self.viewset_class.as_view({"get": action, "head": action})
+        if self.thread_sensitive:
+            return view(request, *args, **kwargs).render()
+
+        close_old_connections()
+        try:
+            return view(request, *args, **kwargs).render()
+        finally:
+            close_old_connections()
+
+
+class AsyncFlightView(AsyncReadOnlyView):
+    viewset_class = FlightViewSet
+
+
+class AsyncRouteView(AsyncReadOnlyView):
+    viewset_class = RouteViewSet
+
+
+class AsyncAirportView(AsyncReadOnlyView):
+    viewset_class = AirportViewSet
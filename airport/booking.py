@@ -0,0 +1,141 @@
+from collections import defaultdict
+from typing import Iterable
+
+from django.db import IntegrityError, transaction
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException
+
+from airport.models import Flight, Order, Ticket
+from airport.seat_map import SeatMap, invalidate_seat_maps, load_seat_maps
+
+MAX_ALLOCATION_ATTEMPTS = 3
+
+
+class SeatConflict(APIException):
+    """Requested seats were sold to someone else in the meantime"""
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Some of the requested seats are already taken."
+    default_code = "seat_conflict"
+
+    def __init__(
+        self,
+        seats: Iterable[tuple[int, int, int]] = (),
+        detail: str | None = None,
+    ):
+        super().__init__(detail)
+        self.seats = sorted(seats)
+        self.detail = {
+            "detail": self.detail,
+            "seats": [
+                {"flight": flight_id, "row": row, "seat": seat}
+                for flight_id, row, seat in self.seats
+            ],
+        }
+
+
+def lock_flights(flight_ids: Iterable[int]) -> dict[int, Flight]:
+    """Lock flight rows in id order for the rest of the transaction.
+
+    Every order locks its flights in the same order, so concurrent
+    orders over overlapping flights queue up instead of deadlocking.
+    """
+    return {
+        flight.id: flight
+        for flight in Flight.objects.select_related("airplane")
+        .select_for_update(of=("self",))
+        .filter(id__in=flight_ids)
+        .order_by("id")
+    }
+
+
+def allocate_seats(
+    tickets: list[dict],
+    seat_maps: dict[int, SeatMap],
+) -> list[tuple[int, int, int]]:
+    """Return ``(flight_id, row, seat)`` for each requested ticket.
+
+    Tickets with a row and seat keep them. Tickets without one are seated
+    together per flight: side by side in one row when possible, otherwise
+    in the fewest consecutive rows. Raises ``SeatConflict`` when a requested
+    seat is taken or a flight has no free seats left.
+    """
+    allocated = [None] * len(tickets)
+    conflicts = []
+    for index, ticket in enumerate(tickets):
+        if ticket.get("row") is None:
+            continue
+        flight_id, row, seat = (
+            ticket["flight_id"],
+            ticket["row"],
+            ticket["seat"],
+        )
+        seat_map = seat_maps[flight_id]
+        if not seat_map.contains(row, seat) or seat_map.is_taken(row, seat):
+            conflicts.append((flight_id, row, seat))
+        else:
+            seat_map.take(row, seat)
+            allocated[index] = (flight_id, row, seat)
+    if conflicts:
+        raise SeatConflict(conflicts)
+
+    unassigned = defaultdict(list)
+    for index, ticket in enumerate(tickets):
+        if allocated[index] is None:
+            unassigned[ticket["flight_id"]].append(index)
+
+    sold_out = set()
+    for flight_id, indexes in unassigned.items():
+        seats = seat_maps[flight_id].find_adjacent(len(indexes))
+        if seats is None:
+            sold_out.add(flight_id)
+            continue
+        for index, (row, seat) in zip(indexes, seats):
+            seat_maps[flight_id].take(row, seat)
+            allocated[index] = (flight_id, row, seat)
+    if sold_out:
+        raise SeatConflict(
+            detail=f"Not enough free seats on flights "
+            f"{', '.join(map(str, sorted(sold_out)))}."
+        )
+
+    return allocated
+
+
+def place_order(tickets: list[dict], **order_fields) -> Order:
+    """Create an order with its tickets, allocating seats under locks.
+
+    Seats are checked against the tickets stored in the database while
+    the flights are locked, so a stale seat map can never oversell. An
+    insert that still collides, e.g. with a write that bypassed the
+    locks, is retried from scratch: seatless tickets are given other
+    seats and requested ones are reported as a conflict.
+    """
+    for _ in range(MAX_ALLOCATION_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                return _place_order(tickets, order_fields)
+        except IntegrityError:
+            continue
+
+    raise SeatConflict(detail="Seats could not be allocated, try again.")
+
+
+def _place_order(tickets: list[dict], order_fields: dict) -> Order:
+    flights = lock_flights({ticket["flight_id"] for ticket in tickets})
+    missing = {ticket["flight_id"] for ticket in tickets} - flights.keys()
+    if missing:
+        raise serializers.ValidationError({
+            "tickets": f"Flights {', '.join(map(str, sorted(missing)))} "
+            f"no longer exist."
+        })
+
+    allocated = allocate_seats(tickets, load_seat_maps(flights.values()))
+
+    order = Order.objects.create(**order_fields)
+    Ticket.objects.bulk_create(
+        Ticket(order=order, flight_id=flight_id, row=row, seat=seat)
+        for flight_id, row, seat in allocated
+    )
+    transaction.on_commit(lambda: invalidate_seat_maps(flights))
+    return order
@@ -0,0 +1,227 @@
+import json
+from collections import Counter
+from functools import partial
+
+from django.core.management.color import no_style
+from django.core.serializers.base import DeserializationError
+from django.db import connections, transaction
+from django.db.models.constants import OnConflict
+
+from airport.models import Ticket
+from airport.seat_map import invalidate_seat_maps
+
+CHUNK_SIZE = 1 << 16
+BATCH_SIZE = 2_000
+
+_decoder = json.JSONDecoder()
+_whitespace = " \t\n\r"
+_number_chars = "+-.0123456789eE"
+
+
+class JsonArrayReader:
+    """Decode the items of a top-level JSON array one at a time.
+
+    Only the item being decoded and one chunk of text are held in
+    memory, so dumps of any size stream at constant memory.
+    """
+
+    def __init__(self, file, chunk_size: int = CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, or "" at the end"""
+        while True:
+            while (
+                self.position < len(self.buffer)
+                and self.buffer[self.position] in _whitespace
+            ):
+                self.position += 1
+            if self.position < len(self.buffer) or not self.fill():
+                return self.buffer[self.position:self.position + 1]
+
+    def expect(self, tokens: str) -> str:
+        token = self.peek()
+        if not token or token not in tokens:
+            raise DeserializationError(
+                f"Expected one of {tokens!r} in fixture, got {token!r}."
+            )
+        self.position += 1
+        return token
+
+    def buffer_number(self):
+        """Make sure a number is not cut at the end of the buffer"""
+        end = self.position
+        while True:
+            while (
+                end < len(self.buffer)
+                and self.buffer[end] in _number_chars
+            ):
+                end += 1
+            offset = end - self.position
+            if end < len(self.buffer) or not self.fill():
+                return
+            end = self.position + offset
+
+    def decode(self):
+        if self.peek() in _number_chars:
+            self.buffer_number()
+        while True:
+            try:
+                item, end = _decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError as exc:
+                # The item may continue in the next chunk.
+                if self.fill():
+                    continue
+                raise DeserializationError(str(exc))
+            self.position = end
+            return item
+
+    def __iter__(self):
+        self.expect("[")
+        if self.peek() == "]":
+            return
+        while True:
+            yield self.decode()
+            if self.expect(",]") == "]":
+                return
+
+
+def iter_json_array(file, chunk_size: int = CHUNK_SIZE):
+    """Yield the items of the JSON array in ``file`` lazily"""
+    return iter(JsonArrayReader(file, chunk_size))
+
+
+class FixtureLoader:
+    """Write deserialized fixture objects in bounded per-model batches.
+
+    Rows are upserted by primary key with raw bulk inserts, so reloading a
+    dump updates existing rows like ``loaddata`` does. A batch is written
+    once it reaches ``batch_size``, after the pending batches of the
+    models it references, and many-to-many links replace the existing
+    ones. Like ``loaddata``, the caller defers constraint checks and
+    checks them once everything is written, as dumps may list children
+    before their parents.
+    """
+
+    def __init__(self, using: str = "default", batch_size: int = BATCH_SIZE):
+        self.using = using
+        self.batch_size = batch_size
+        self.buffers = {}
+        self.counts = Counter()
+
+    def add(self, deserialized):
+        model = type(deserialized.object)
+        batch = self.buffers.setdefault(model, [])
+        batch.append(deserialized)
+        if len(batch) >= self.batch_size:
+            self.flush(model)
+
+    def flush(self, model, flushing=()):
+        batch = self.buffers.pop(model, None)
+        if not batch:
+            return
+        for field in model._meta.concrete_fields:
+            related = field.related_model
+            if (
+                field.is_relation
+                and related in self.buffers
+                and related not in flushing
+            ):
+                self.flush(related, (*flushing, model))
+
+        self.write(model, [deserialized.object for deserialized in batch])
+        self.write_m2m(model, batch)
+        self.counts[model._meta.label] += len(batch)
+        if model is Ticket:
+            flight_ids = {d.object.flight_id for d in batch}
+            transaction.on_commit(
+                partial(invalidate_seat_maps, flight_ids),
+                using=self.using,
+            )
+
+    def write(self, model, objects):
+        if any(obj.pk is None for obj in objects):
+            raise DeserializationError(
+                f"{model._meta.label} objects need a primary key."
+            )
+        # A raw insert stores the values as dumped, without running
+        # pre_save (which would reset auto_now_add fields, for one).
+        fields = model._meta.local_concrete_fields
+        update_fields = [field for field in fields if not field.primary_key]
+        options = {"on_conflict": OnConflict.IGNORE}
+        if update_fields:
+            options = {
+                "on_conflict": OnConflict.UPDATE,
+                "update_fields": update_fields,
+                "unique_fields": [model._meta.pk],
+            }
+        queryset = model._base_manager.using(self.using)
+        batch_size = min(
+            self.batch_size,
+            connections[self.using].ops.bulk_batch_size(fields, objects),
+        )
+        for start in range(0, len(objects), batch_size):
+            queryset._insert(
+                objects[start:start + batch_size],
+                fields=fields,
+                raw=True,
+                **options,
+            )
+
+    def write_m2m(self, model, batch):
+        for field in model._meta.local_many_to_many:
+            through = field.remote_field.through
+            if not through._meta.auto_created:
+                continue
+            source = field.m2m_field_name() + "_id"
+            target = field.m2m_reverse_field_name() + "_id"
+            batch_links = [
+                (deserialized.object.pk, deserialized.m2m_data[field.name])
+                for deserialized in batch
+                if field.name in deserialized.m2m_data
+            ]
+            if not batch_links:
+                continue
+
+            links = through._base_manager.using(self.using)
+            links.filter(**{
+                f"{source}__in": [pk for pk, _ in batch_links]
+            }).delete()
+            links.bulk_create(
+                [
+                    through(**{source: pk, target: target_pk})
+                    for pk, target_pks in batch_links
+                    for target_pk in target_pks
+                ],
+                batch_size=self.batch_size,
+            )
+
+    def finish(self) -> Counter:
+        while self.buffers:
+            self.flush(next(iter(self.buffers)))
+        return self.counts
+
+
+def reset_sequences(using: str, models) -> None:
+    """Move primary key sequences past the loaded ids"""
+    connection = connections[using]
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
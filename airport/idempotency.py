@@ -0,0 +1,183 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import timedelta
+from typing import Callable
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+from airport.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+# Longer than any request may run; claims still in progress after that
+# were left behind by a crashed or timed out request.
+IDEMPOTENCY_CLAIM_LEASE = timedelta(seconds=60)
+MAX_IDEMPOTENCY_KEYS = 100_000
+PURGE_INTERVAL = 60.0
+
+
+class IdempotencyKeyInUse(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "A request with this idempotency key is in progress."
+    default_code = "idempotency_key_in_use"
+
+
+class IdempotencyKeyMismatch(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = (
+        "This idempotency key was used with a different request."
+    )
+    default_code = "idempotency_key_mismatch"
+
+
+def request_hash(request) -> str:
+    """Fingerprint the method, path and body of a request"""
+    body = json.dumps(
+        request.data,
+        sort_keys=True,
+        separators=(",", ":"),
+        cls=DjangoJSONEncoder,
+    )
+    return hashlib.sha256(
+        f"{request.method} {request.path}\n{body}".encode()
+    ).hexdigest()
+
+
+def claim_key(
+    user,
+    key: str,
+    fingerprint: str,
+) -> tuple[IdempotencyKey, bool]:
+    """Claim a key for a new request, or return the record holding it.
+
+    Returns the record and whether this request claimed it. The claim is
+    committed on its own, so concurrent retries see the key as taken
+    while the first request is still running. Records past their TTL and
+    claims in progress for longer than ``IDEMPOTENCY_CLAIM_LEASE`` are
+    taken over.
+    """
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(
+                    user=user,
+                    key=key,
+                    request_hash=fingerprint,
+                )
+            return record, True
+        except IntegrityError:
+            record = IdempotencyKey.objects.filter(
+                user=user,
+                key=key
+            ).first()
+            if record is None:
+                continue
+            expires = (
+                IDEMPOTENCY_KEY_TTL if record.is_complete
+                else IDEMPOTENCY_CLAIM_LEASE
+            )
+            if record.created_at >= timezone.now() - expires:
+                return record, False
+            # Only if unchanged: its request may have just completed.
+            IdempotencyKey.objects.filter(
+                pk=record.pk,
+                status_code=record.status_code,
+            ).delete()
+
+    raise IdempotencyKeyInUse()
+
+
+def idempotent_response(request, handler: Callable[[], Response]):
+    """Run ``handler`` at most once per ``Idempotency-Key`` and user.
+
+    Successful responses are stored and replayed verbatim for repeats of
+    the same request, without running the handler again. Failed requests
+    release their key so the client can retry them.
+    """
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if key is None:
+        return handler()
+    if not key or len(key) > IdempotencyKey._meta.get_field("key").max_length:
+        raise ValidationError({
+            IDEMPOTENCY_HEADER: "Must be between 1 and 255 characters."
+        })
+
+    purge_idempotency_keys()
+
+    fingerprint = request_hash(request)
+    record, claimed = claim_key(request.user, key, fingerprint)
+    if not claimed:
+        if record.request_hash != fingerprint:
+            raise IdempotencyKeyMismatch()
+        if not record.is_complete:
+            raise IdempotencyKeyInUse()
+        return Response(
+            record.response_body,
+            status=record.status_code,
+            headers={REPLAYED_HEADER: "true"},
+        )
+
+    # By primary key, so a request that lost its claim to a retry after
+    # the lease leaves the retry's record alone.
+    claim = IdempotencyKey.objects.filter(pk=record.pk)
+    try:
+        response = handler()
+    except Exception:
+        claim.delete()
+        raise
+
+    if status.is_success(response.status_code):
+        claim.update(
+            status_code=response.status_code,
+            response_body=json.loads(
+                json.dumps(response.data, cls=DjangoJSONEncoder)
+            ),
+        )
+    else:
+        claim.delete()
+    return response
+
+
+_purged_at = 0.0
+_purge_lock = threading.Lock()
+
+
+def purge_idempotency_keys(force: bool = False) -> int:
+    """Delete expired keys and the oldest ones beyond the size limit.
+
+    Runs at most once per ``PURGE_INTERVAL`` seconds per process unless
+    forced, so it can be called on every request.
+    """
+    global _purged_at
+
+    now = time.monotonic()
+    if not force and now - _purged_at < PURGE_INTERVAL:
+        return 0
+    if not _purge_lock.acquire(blocking=False):
+        return 0
+    try:
+        _purged_at = now
+        deleted, _ = IdempotencyKey.objects.filter(
+            created_at__lt=timezone.now() - IDEMPOTENCY_KEY_TTL
+        ).delete()
+
+        cutoff = (
+            IdempotencyKey.objects.order_by("-created_at")
+            .values_list("created_at", flat=True)[MAX_IDEMPOTENCY_KEYS:]
+            .first()
+        )
+        if cutoff is not None:
+            deleted += IdempotencyKey.objects.filter(
+                created_at__lte=cutoff
+            ).delete()[0]
+        return deleted
+    finally:
+        _purge_lock.release()
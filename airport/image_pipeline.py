@@ -0,0 +1,207 @@
+import io
+import logging
+import pathlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from PIL import Image, ImageOps
+
+from airport.media import acquire_blob, release_blob
+from airport.models import Airport
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZES = {"small": 160, "medium": 480, "large": 1024}
+WEBP_QUALITY = 80
+JPEG_QUALITY = 85
+EXTENSIONS = {"webp": "webp", "jpeg": "jpg", "png": "png"}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide image worker pool"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_PROCESSING_WORKERS,
+                thread_name_prefix="airport-image",
+            )
+        return _executor
+
+
+def schedule_airport_image(airport: Airport) -> None:
+    """Process the airport's image once the upload is committed"""
+    airport_id, name = airport.id, airport.image.name
+
+    def submit():
+        if settings.IMAGE_PROCESSING_EAGER:
+            process_airport_image(airport_id, name)
+        else:
+            get_executor().submit(run_in_worker, airport_id, name)
+
+    transaction.on_commit(submit)
+
+
+def run_in_worker(airport_id: int, name: str) -> None:
+    try:
+        process_airport_image(airport_id, name)
+    except Exception:
+        logger.exception(
+            "Processing image %s of airport %s failed", name, airport_id
+        )
+    finally:
+        connections.close_all()
+
+
+def normalize(image: Image.Image) -> Image.Image:
+    """Apply the EXIF orientation and drop all metadata"""
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        has_alpha = image.mode in ("LA", "PA") or (
+            image.mode == "P" and "transparency" in image.info
+        )
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    image.info = {}
+    return image
+
+
+def encode(image: Image.Image, image_format: str) -> bytes:
+    buffer = io.BytesIO()
+    if image_format == "WEBP":
+        image.save(buffer, "WEBP", quality=WEBP_QUALITY, method=4)
+    elif image_format == "JPEG":
+        image.save(
+            buffer,
+            "JPEG",
+            quality=JPEG_QUALITY,
+            optimize=True,
+            progressive=True,
+        )
+    else:
+        image.save(buffer, image_format, optimize=True)
+    return buffer.getvalue()
+
+
+def store_original(
+    airport: Airport,
+    image: Image.Image,
+    image_format: str,
+) -> str:
+    """Save the normalized original as a new content-addressed file"""
+    field = Airport._meta.get_field("image")
+    name = field.generate_filename(
+        airport,
+        f"image.{EXTENSIONS[image_format.lower()]}"
+    )
+    return field.storage.save(
+        name,
+        ContentFile(encode(image, image_format))
+    )
+
+
+def replace_file(name: str, content: bytes) -> str:
+    """Store ``content`` under ``name``, replacing any file there"""
+    default_storage.delete(name)
+    return default_storage.save(name, ContentFile(content))
+
+
+def variant_name(name: str, size: str, extension: str) -> str:
+    """Name a variant next to the original, e.g. ``city-uuid-small.webp``"""
+    path = pathlib.PurePosixPath(name)
+    return str(path.with_name(f"{path.stem}-{size}.{extension}"))
+
+
+def render_variants(image: Image.Image):
+    """Yield every thumbnail size encoded as WebP and as JPEG or PNG"""
+    fallback = "PNG" if image.mode == "RGBA" else "JPEG"
+    for size, edge in THUMBNAIL_SIZES.items():
+        thumbnail = image.copy()
+        thumbnail.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        yield size, thumbnail.size, {
+            "webp": encode(thumbnail, "WEBP"),
+            fallback.lower(): encode(thumbnail, fallback),
+        }
+
+
+def process_airport_image(
+    airport_id: int,
+    name: str,
+    reuse: bool = True,
+) -> dict | None:
+    """Normalize an uploaded airport image and store its thumbnails.
+
+    The normalized original is saved as a new content-addressed file and
+    replaces the upload on the airport together with the variants, unless
+    another image was uploaded meanwhile. Images that already have
+    variants were normalized before, so only their thumbnails are
+    rendered again. With ``reuse``, an image file already processed for
+    another airport is not processed again.
+    """
+    airport = Airport.objects.filter(pk=airport_id, image=name).first()
+    if airport is None:
+        return None
+    processed = (
+        Airport.objects.filter(image=name)
+        .exclude(image_variants={})
+        .values_list("image_variants", flat=True)
+        .first()
+    )
+    if reuse and processed:
+        Airport.objects.filter(pk=airport_id, image=name).update(
+            image_variants=processed
+        )
+        return processed
+
+    storage = Airport._meta.get_field("image").storage
+    with storage.open(name) as file, Image.open(file) as upload:
+        original_format = upload.format
+        image = normalize(upload)
+
+    original = name
+    if not processed:
+        if original_format not in ("JPEG", "PNG", "WEBP"):
+            original_format = "PNG"
+        if original_format == "JPEG" and image.mode == "RGBA":
+            image = image.convert("RGB")
+        original = store_original(airport, image, original_format)
+
+    variants = {}
+    for size, (width, height), encoded in render_variants(image):
+        variants[size] = {
+            "width": width,
+            "height": height,
+            "files": {
+                image_format: replace_file(
+                    variant_name(original, size, EXTENSIONS[image_format]),
+                    content,
+                )
+                for image_format, content in encoded.items()
+            },
+        }
+
+    with transaction.atomic():
+        if original != name:
+            acquire_blob(original)
+        if Airport.objects.filter(pk=airport_id, image=name).update(
+            image=original,
+            image_variants=variants,
+        ):
+            if original != name:
+                release_blob(name, {})
+            return variants
+        if original != name:
+            release_blob(original, variants)
+            return None
+
+    if not Airport.objects.filter(image=name).exists():
+        for variant in variants.values():
+            for file_name in variant["files"].values():
+                default_storage.delete(file_name)
+    return None
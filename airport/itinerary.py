@@ -0,0 +1,396 @@
+import heapq
+import itertools
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable, NamedTuple
+
+from django.utils import timezone
+
+from airport.models import Flight
+from airport.reference_cache import get_reference_data
+
+FLIGHT_INDEX_TTL = 5 * 60
+MAX_LEGS = 3
+MAX_CANDIDATES = 5000
+
+
+class Leg(NamedTuple):
+    flight_id: int
+    route_id: int
+    source_id: int
+    destination_id: int
+    departure: float
+    arrival: float
+    distance: int
+
+
+class Itinerary(NamedTuple):
+    legs: tuple[Leg, ...]
+
+    @property
+    def departure(self) -> float:
+        return self.legs[0].departure
+
+    @property
+    def arrival(self) -> float:
+        return self.legs[-1].arrival
+
+    @property
+    def duration(self) -> float:
+        return self.arrival - self.departure
+
+    @property
+    def distance(self) -> int:
+        return sum(leg.distance for leg in self.legs)
+
+    @property
+    def flight_ids(self) -> list[int]:
+        return [leg.flight_id for leg in self.legs]
+
+
+SORT_KEYS = {
+    "duration": lambda itinerary: (
+        itinerary.duration,
+        itinerary.distance,
+        itinerary.departure,
+    ),
+    "distance": lambda itinerary: (
+        itinerary.distance,
+        itinerary.duration,
+        itinerary.departure,
+    ),
+}
+
+
+class FlightIndex:
+    """In-memory route graph with time-sorted departures per route.
+
+    Searching expands at most ``max_legs`` hops and finds each hop's
+    connections by bisecting the departures of a route, so its cost
+    depends on the local fan-out and not on the size of the flight table.
+    """
+
+    reference_version = None
+    changes = 0
+
+    def __init__(
+        self,
+        routes: Iterable[tuple[int, int, int, int]],
+        flights: Iterable[tuple[int, int, datetime, datetime]],
+    ):
+        self.routes_from = defaultdict(list)
+        self.sources_into = defaultdict(set)
+        self.route_ends = {}
+        for route_id, source_id, destination_id, distance in routes:
+            self.routes_from[source_id].append((route_id, destination_id))
+            self.sources_into[destination_id].add(source_id)
+            self.route_ends[route_id] = (source_id, destination_id, distance)
+
+        legs_by_route = defaultdict(list)
+        for flight in flights:
+            leg = self._leg(*flight)
+            if leg is not None:
+                legs_by_route[leg.route_id].append(leg)
+
+        # Departure times and legs of each route, sorted by departure.
+        # Both lists are replaced, never mutated, so searches running in
+        # other threads always see a consistent pair.
+        self.timetable = {}
+        self.flight_routes = {}
+        for route_id, legs in legs_by_route.items():
+            legs.sort(key=lambda leg: leg.departure)
+            self.timetable[route_id] = (
+                [leg.departure for leg in legs],
+                legs,
+            )
+            self.flight_routes.update(
+                (leg.flight_id, route_id) for leg in legs
+            )
+
+    def _leg(
+        self,
+        flight_id: int,
+        route_id: int,
+        departure_time: datetime,
+        arrival_time: datetime,
+    ) -> Leg | None:
+        if route_id not in self.route_ends:
+            return None
+        source_id, destination_id, distance = self.route_ends[route_id]
+        return Leg(
+            flight_id,
+            route_id,
+            source_id,
+            destination_id,
+            departure_time.timestamp(),
+            arrival_time.timestamp(),
+            distance,
+        )
+
+    def add(
+        self,
+        flight_id: int,
+        route_id: int,
+        departure_time: datetime,
+        arrival_time: datetime,
+    ) -> None:
+        """Insert or move one flight; flights of unknown routes are skipped"""
+        self.remove(flight_id)
+        leg = self._leg(flight_id, route_id, departure_time, arrival_time)
+        if leg is None:
+            return
+        departures, legs = self.timetable.get(route_id, ([], []))
+        position = bisect_right(departures, leg.departure)
+        self.timetable[route_id] = (
+            [*departures[:position], leg.departure, *departures[position:]],
+            [*legs[:position], leg, *legs[position:]],
+        )
+        self.flight_routes[flight_id] = route_id
+
+    def remove(self, flight_id: int) -> None:
+        route_id = self.flight_routes.pop(flight_id, None)
+        if route_id is None:
+            return
+        departures, legs = self.timetable[route_id]
+        kept = [
+            index for index, leg in enumerate(legs)
+            if leg.flight_id != flight_id
+        ]
+        self.timetable[route_id] = (
+            [departures[index] for index in kept],
+            [legs[index] for index in kept],
+        )
+
+    @classmethod
+    def from_database(cls) -> "FlightIndex":
+        reference_data = get_reference_data()
+        index = cls(
+            (
+                (route_id, source_id, destination_id, distance)
+                for route_id, (source_id, destination_id, distance)
+                in reference_data.routes.items()
+            ),
+            Flight.objects.filter(departure_time__gte=timezone.now())
+            .order_by()
+            .values_list("id", "route_id", "departure_time", "arrival_time")
+            .iterator(chunk_size=10_000),
+        )
+        index.reference_version = reference_data.version
+        return index
+
+    def _departing(self, route_id: int, start: float, end: float):
+        departures, legs = self.timetable.get(route_id, ((), ()))
+        for index in range(bisect_left(departures, start), len(legs)):
+            if departures[index] >= end:
+                return
+            yield legs[index]
+
+    def search(
+        self,
+        source_id: int,
+        destination_id: int,
+        departure_from: datetime,
+        departure_to: datetime,
+        max_legs: int = MAX_LEGS,
+        min_layover: timedelta = timedelta(minutes=45),
+        max_layover: timedelta = timedelta(hours=6),
+        max_candidates: int = MAX_CANDIDATES,
+        sort: str = "duration",
+    ) -> list[Itinerary]:
+        """Find the best journeys of up to ``max_legs`` flights, ranked.
+
+        The first leg departs within ``[departure_from, departure_to)``
+        and every connection leaves within the layover window after the
+        previous arrival. Airports are never revisited.
+
+        Only the ``max_candidates`` best journeys by ``sort`` are kept,
+        so the cap never drops a journey ranked above one it returns.
+        Partial journeys already worse than the worst kept one on the
+        first ranking criterion are not expanded further.
+        """
+        min_gap = min_layover.total_seconds()
+        max_gap = max_layover.total_seconds()
+        rank = SORT_KEYS[sort]
+        # Airports that reach the destination within ``n`` more legs.
+        reaches = [{destination_id}]
+        for _ in range(max_legs - 1):
+            reaches.append(reaches[-1] | {
+                source
+                for airport in reaches[-1]
+                for source in self.sources_into[airport]
+            })
+
+        # Max-heap of the best journeys by negated key: the worst on top.
+        best = []
+        counter = itertools.count()
+        path = []
+
+        def ranks_out(key) -> bool:
+            return len(best) == max_candidates and key[0] > -best[0][0][0]
+
+        def keep(key, itinerary) -> None:
+            entry = (tuple(-value for value in key), next(counter), itinerary)
+            if len(best) < max_candidates:
+                heapq.heappush(best, entry)
+            else:
+                heapq.heappushpop(best, entry)
+
+        def expand(airport_id, start, end, visited):
+            legs_left = max_legs - len(path)
+            for route_id, next_airport in self.routes_from[airport_id]:
+                if (
+                    next_airport in visited
+                    or next_airport not in reaches[legs_left - 1]
+                ):
+                    continue
+                for leg in self._departing(route_id, start, end):
+                    path.append(leg)
+                    itinerary = Itinerary(tuple(path))
+                    key = rank(itinerary)
+                    if ranks_out(key):
+                        # Every extension ranks at least as low.
+                        pass
+                    elif next_airport == destination_id:
+                        keep(key, itinerary)
+                    elif legs_left > 1:
+                        expand(
+                            next_airport,
+                            leg.arrival + min_gap,
+                            leg.arrival + max_gap,
+                            visited | {next_airport},
+                        )
+                    path.pop()
+
+        if source_id != destination_id and max_legs >= 1:
+            expand(
+                source_id,
+                departure_from.timestamp(),
+                departure_to.timestamp(),
+                {source_id},
+            )
+        return rank_itineraries([entry[2] for entry in best], sort)
+
+
+_index = None
+_index_built_at = 0.0
+# Bumped by changes the current index cannot apply in place; an index
+# built before the latest bump is stale.
+_index_changes = 0
+_index_lock = threading.Lock()
+_build_lock = threading.Lock()
+
+
+def get_flight_index() -> FlightIndex:
+    """Return the process-wide flight index, rebuilding it when stale.
+
+    Only the first build blocks every caller. Later, one request
+    rebuilds a stale index while the others keep searching the old one.
+    """
+    global _index, _index_built_at
+
+    reference_version = get_reference_data().version
+    with _index_lock:
+        index, changes = _index, _index_changes
+        if index is not None and not (
+            time.monotonic() - _index_built_at > FLIGHT_INDEX_TTL
+            or index.changes != changes
+            or index.reference_version != reference_version
+        ):
+            return index
+
+    if not _build_lock.acquire(blocking=index is None):
+        return index
+    try:
+        if _index is not index:
+            return _index
+        built_at = time.monotonic()
+        rebuilt = FlightIndex.from_database()
+        rebuilt.changes = changes
+        with _index_lock:
+            _index, _index_built_at = rebuilt, built_at
+        return rebuilt
+    finally:
+        _build_lock.release()
+
+
+def update_flight_index(
+    flight_id: int,
+    route_id: int | None = None,
+    departure_time: datetime | None = None,
+    arrival_time: datetime | None = None,
+) -> None:
+    """Apply one saved flight, or a deleted one without ``route_id``"""
+    global _index_changes
+
+    with _index_lock:
+        if _build_lock.locked():
+            # A rebuild in progress may have read the flight before.
+            _index_changes += 1
+        if _index is None:
+            return
+        _index.remove(flight_id)
+        if route_id is not None and departure_time >= timezone.now():
+            _index.add(flight_id, route_id, departure_time, arrival_time)
+
+
+def mark_flight_index_stale() -> None:
+    """Have the index rebuilt, e.g. after route changes"""
+    global _index_changes
+
+    with _index_lock:
+        _index_changes += 1
+
+
+def invalidate_flight_index() -> None:
+    """Drop the index so that the next search rebuilds it first"""
+    global _index
+
+    with _index_lock:
+        _index = None
+
+
+def rank_itineraries(
+    itineraries: list[Itinerary],
+    sort: str = "duration",
+) -> list[Itinerary]:
+    return sorted(itineraries, key=SORT_KEYS[sort])
+
+
+def with_seats_available(
+    itineraries: list[Itinerary],
+    passengers: int,
+    limit: int,
+) -> list[Itinerary]:
+    """Keep the first ``limit`` itineraries that can seat ``passengers``.
+
+    Availability is checked against the database in batches, in ranking
+    order, so a full flight never appears in the results.
+    """
+    available = []
+    seats = {}
+    batch_size = max(limit * 2, 20)
+    for start in range(0, len(itineraries), batch_size):
+        batch = itineraries[start:start + batch_size]
+        unknown = {
+            flight_id
+            for itinerary in batch
+            for flight_id in itinerary.flight_ids
+            if flight_id not in seats
+        }
+        seats.update(
+            Flight.objects.filter(id__in=unknown)
+            .with_availability()
+            .values_list("id", "tickets_available")
+        )
+        for itinerary in batch:
+            if all(
+                seats.get(flight_id, 0) >= passengers
+                for flight_id in itinerary.flight_ids
+            ):
+                available.append(itinerary)
+                if len(available) == limit:
+                    return available
+    return available
@@ -0,0 +1,62 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from airport.ticket_export import (
+    CHUNK_SIZE,
+    EXPORT_FORMATS,
+    export_rows,
+    format_rows
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream all tickets with their order, user, flight and route as "
+        "CSV or JSON lines"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--export-format",
+            choices=EXPORT_FORMATS,
+            default="csv",
+        )
+        parser.add_argument(
+            "--output",
+            "-o",
+            help="File to write to instead of stdout",
+        )
+        parser.add_argument(
+            "--created-from",
+            type=date.fromisoformat,
+            help="Orders created on or after this day (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--created-to",
+            type=date.fromisoformat,
+            help="Orders created on or before this day (YYYY-MM-DD)",
+        )
+        parser.add_argument("--flight", type=int)
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        rows = export_rows(
+            created_from=options["created_from"],
+            created_to=options["created_to"],
+            flight_id=options["flight"],
+            chunk_size=options["chunk_size"],
+        )
+        chunks = format_rows(rows, options["export_format"])
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(
+            options["output"],
+            "w",
+            encoding="utf-8",
+            newline="",
+        ) as file:
+            file.writelines(chunks)
@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from airport.itinerary import invalidate_flight_index
+from airport.reference_cache import invalidate_reference_data
+from airport.schedule_import import (
+    BATCH_SIZE,
+    RECORD_TYPES,
+    ScheduleImporter,
+    ScheduleImportError,
+    read_records
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Import airports, airplanes, routes and flights from CSV or JSONL "
+        "files in one transaction"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+")
+        parser.add_argument(
+            "--type",
+            choices=RECORD_TYPES,
+            help="Record type of rows without a \"type\" field",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                importer = ScheduleImporter(options["batch_size"])
+                for path in options["paths"]:
+                    for line, record in read_records(path):
+                        try:
+                            importer.add(line, record, options["type"])
+                        except ScheduleImportError as exc:
+                            raise ScheduleImportError(f"{path}: {exc}")
+                counts = importer.finish()
+        except (ScheduleImportError, OSError) as exc:
+            raise CommandError(exc)
+
+        # Bulk writes skip the signals that normally drop these.
+        invalidate_reference_data()
+        invalidate_flight_index()
+
+        elapsed = time.perf_counter() - started
+        for name, count in sorted(counts.items()):
+            self.stdout.write(f"{name}: {count}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {counts['flight']} flights in {elapsed:.1f}s "
+                f"({counts['flight'] / max(elapsed, 1e-9):.0f} flights/s)."
+            )
+        )
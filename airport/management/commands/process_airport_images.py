@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from airport.image_pipeline import process_airport_image
+from airport.models import Airport
+
+
+class Command(BaseCommand):
+    help = "Create thumbnails for airport images that have none"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Reprocess images that already have thumbnails",
+        )
+
+    def handle(self, *args, **options):
+        airports = Airport.objects.exclude(image="").exclude(image=None)
+        if not options["all"]:
+            airports = airports.filter(image_variants={})
+
+        processed = 0
+        for airport_id, name in airports.values_list("id", "image"):
+            if process_airport_image(
+                airport_id,
+                name,
+                reuse=not options["all"],
+            ) is not None:
+                processed += 1
+        self.stdout.write(f"Processed {processed} airport images.")
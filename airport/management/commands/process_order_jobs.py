@@ -0,0 +1,135 @@
+import logging
+import threading
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from airport.order_queue import (
+    BATCH_SIZE,
+    claim_batch,
+    process_batch,
+    requeue_stale_jobs
+)
+from airport.retry import backoff
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Place queued orders with a pool of worker threads"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the queue is empty",
+        )
+        parser.add_argument(
+            "--max-delay",
+            type=float,
+            default=30.0,
+            help="Longest wait after repeated errors",
+        )
+        parser.add_argument(
+            "--requeue-interval",
+            type=float,
+            default=60.0,
+            help="Seconds between returning jobs of dead workers to the "
+                 "queue",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is drained",
+        )
+
+    def requeue(self):
+        try:
+            requeued = requeue_stale_jobs()
+        except Exception:
+            logger.exception("Requeueing stale order jobs failed")
+            connection.close()
+            return
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale jobs.")
+
+    def handle(self, *args, **options):
+        self.requeue()
+
+        stop = threading.Event()
+        processed = []
+        threads = [
+            threading.Thread(
+                target=self.work,
+                args=(stop, options, processed),
+                daemon=True,
+            )
+            for _ in range(options["workers"])
+        ]
+        for thread in threads:
+            thread.start()
+        next_requeue = time.monotonic() + options["requeue_interval"]
+        try:
+            while True:
+                alive = [thread for thread in threads if thread.is_alive()]
+                # Workers record their count only when they exit cleanly.
+                if len(threads) - len(alive) > len(processed):
+                    stop.set()
+                    for thread in alive:
+                        thread.join()
+                    raise CommandError(
+                        "An order worker died, stopping the others."
+                    )
+                if not alive:
+                    break
+                alive[0].join(timeout=1.0)
+                if time.monotonic() >= next_requeue:
+                    self.requeue()
+                    next_requeue = (
+                        time.monotonic() + options["requeue_interval"]
+                    )
+        except KeyboardInterrupt:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Processed {sum(processed)} order jobs.")
+        )
+
+    def work(self, stop, options, processed):
+        worker = uuid.uuid4().hex
+        count = 0
+        errors = 0
+        try:
+            while not stop.is_set():
+                try:
+                    jobs = claim_batch(worker, options["batch_size"])
+                    if jobs:
+                        process_batch(jobs)
+                        count += len(jobs)
+                except Exception:
+                    # Jobs of a failed batch stay claimed until requeued.
+                    errors += 1
+                    logger.exception("Order worker %s failed a batch", worker)
+                    connection.close()
+                    stop.wait(backoff(
+                        errors,
+                        options["poll_interval"],
+                        options["max_delay"]
+                    ))
+                    continue
+                errors = 0
+                if jobs:
+                    continue
+                if options["once"]:
+                    break
+                stop.wait(options["poll_interval"])
+            processed.append(count)
+        finally:
+            connection.close()
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from airport.idempotency import purge_idempotency_keys
+
+
+class Command(BaseCommand):
+    help = "Delete expired order idempotency keys"
+
+    def handle(self, *args, **options):
+        deleted = purge_idempotency_keys(force=True)
+        self.stdout.write(f"Deleted {deleted} idempotency keys.")
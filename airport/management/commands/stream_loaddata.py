@@ -0,0 +1,101 @@
+import time
+from pathlib import Path
+
+from django.apps import apps
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.base import DeserializationError
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db import transaction
+
+from airport.fixture_stream import (
+    BATCH_SIZE,
+    CHUNK_SIZE,
+    FixtureLoader,
+    iter_json_array,
+    reset_sequences
+)
+from airport.itinerary import invalidate_flight_index
+from airport.reference_cache import invalidate_reference_data
+from airport.schedule_import import open_text
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a JSON fixture in loaddata format incrementally, in bounded "
+        "batches per model"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("fixture", help="A .json or .json.gz fixture")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to load the fixture into",
+        )
+        parser.add_argument(
+            "--progress-interval",
+            type=float,
+            default=5.0,
+            help="Seconds between progress reports",
+        )
+        parser.add_argument(
+            "--ignorenonexistent",
+            "-i",
+            action="store_true",
+            help="Ignore fields that no longer exist on the models",
+        )
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        connection = connections[using]
+        self.started = self.reported = time.perf_counter()
+        self.interval = options["progress_interval"]
+        loaded = 0
+
+        try:
+            with open_text(Path(options["fixture"])) as file, \
+                    transaction.atomic(using=using):
+                loader = FixtureLoader(using, options["batch_size"])
+                with connection.constraint_checks_disabled():
+                    for deserialized in serializers.deserialize(
+                        "python",
+                        iter_json_array(file, CHUNK_SIZE),
+                        using=using,
+                        ignorenonexistent=options["ignorenonexistent"],
+                    ):
+                        loader.add(deserialized)
+                        loaded += 1
+                        self.report(loaded)
+                    counts = loader.finish()
+
+                models = [apps.get_model(label) for label in counts]
+                connection.check_constraints(
+                    table_names=[model._meta.db_table for model in models]
+                )
+                reset_sequences(using, models)
+        except (DeserializationError, DatabaseError, OSError) as exc:
+            raise CommandError(f"{options['fixture']}: {exc}")
+
+        # Bulk writes skip the signals that normally drop these.
+        invalidate_reference_data()
+        invalidate_flight_index()
+
+        for label, count in sorted(counts.items()):
+            self.stdout.write(f"{label}: {count}")
+        self.report(loaded, final=True)
+
+    def report(self, loaded: int, final: bool = False):
+        now = time.perf_counter()
+        if not final and now - self.reported < self.interval:
+            return
+        self.reported = now
+        elapsed = now - self.started
+        message = (
+            f"Loaded {loaded} objects in {elapsed:.1f}s "
+            f"({loaded / max(elapsed, 1e-9):.0f} objects/s)"
+        )
+        if final:
+            message = self.style.SUCCESS(message + ".")
+        self.stdout.write(message)
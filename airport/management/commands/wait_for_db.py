@@ -1,17 +1,68 @@
 import time
 
-from django.core.management.base import BaseCommand
-from django.db import connection, OperationalError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+
+from airport.retry import backoff
 
 
 class Command(BaseCommand):
-    help_info = "Wait for the database to be available"
+    help = "Wait for the database to accept connections"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=60.0,
+            help="Seconds to wait before giving up",
+        )
+        parser.add_argument(
+            "--initial-delay",
+            type=float,
+            default=0.1,
+            help="Longest wait after the first failed attempt, doubled "
+                 "after each one",
+        )
+        parser.add_argument(
+            "--max-delay",
+            type=float,
+            default=5.0,
+            help="Longest wait between attempts",
+        )
 
     def handle(self, *args, **options):
-        db_connection = None
-        while not db_connection:
+        connection = connections[options["database"]]
+        started = time.monotonic()
+        deadline = started + options["timeout"]
+        attempt = 0
+        while True:
+            attempt += 1
             try:
                 connection.ensure_connection()
-                db_connection = True
-            except OperationalError:
-                time.sleep(1)
+                break
+            except OperationalError as error:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise CommandError(
+                        f"Database unavailable after {attempt} attempts "
+                        f"in {options['timeout']:g}s: {error}"
+                    )
+                delay = min(
+                    backoff(
+                        attempt,
+                        options["initial_delay"],
+                        options["max_delay"]
+                    ),
+                    remaining
+                )
+                self.stderr.write(
+                    f"Database unavailable ({str(error).strip()}), "
+                    f"retrying in {delay:.2f}s"
+                )
+                time.sleep(delay)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Database available after {attempt} attempts "
+            f"({time.monotonic() - started:.1f}s)."
+        ))
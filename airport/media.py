@@ -0,0 +1,57 @@
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from airport.models import Airport, MediaBlob
+
+
+def acquire_blob(name: str) -> None:
+    """Count one more reference to a stored file"""
+    with transaction.atomic():
+        if MediaBlob.objects.filter(name=name).update(
+            references=F("references") + 1
+        ):
+            return
+        try:
+            with transaction.atomic():
+                MediaBlob.objects.create(name=name, references=1)
+        except IntegrityError:
+            MediaBlob.objects.filter(name=name).update(
+                references=F("references") + 1
+            )
+
+
+def release_blob(name: str, variants: dict) -> None:
+    """Drop one reference, deleting the file and its variants at zero.
+
+    Files without a ``MediaBlob``, such as uploads that predate it, are
+    left alone.
+    """
+    with transaction.atomic():
+        blob = (
+            MediaBlob.objects.select_for_update()
+            .filter(name=name)
+            .first()
+        )
+        if blob is None:
+            return
+        if blob.references > 1:
+            blob.references = F("references") - 1
+            blob.save(update_fields=["references"])
+            return
+        blob.delete()
+
+    variant_names = [
+        file_name
+        for variant in variants.values()
+        for file_name in variant["files"].values()
+    ]
+
+    def delete_files():
+        if MediaBlob.objects.filter(name=name).exists():
+            return
+        Airport._meta.get_field("image").storage.delete(name)
+        for file_name in variant_names:
+            default_storage.delete(file_name)
+
+    transaction.on_commit(delete_files)
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-17 06:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0008_throttle_counter"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="airport",
+            name="image_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
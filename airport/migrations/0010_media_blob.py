@@ -0,0 +1,40 @@
+# Generated by Django 5.1.6 on 2026-10-17 06:30
+
+import airport.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0009_airport_image_variants"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MediaBlob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, unique=True)),
+                ("references", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name="airport",
+            name="image",
+            field=models.ImageField(
+                null=True,
+                storage=airport.models.airport_image_storage,
+                upload_to=airport.models.airport_image_path,
+            ),
+        ),
+    ]
@@ -1,10 +1,16 @@
 import pathlib
 import uuid
 from django.conf import settings
+from django.core.files.storage import storages
 from django.db import models
+from django.db.models import Count, F, Max, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils.functional import cached_property
 from django.utils.text import slugify
 from rest_framework.exceptions import ValidationError
 
+from airport.seat_map import SeatMap, get_seat_map
+
 
 class AirplaneType(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -43,10 +49,30 @@ def airport_image_path(instance: "Airport", filename: str) -> pathlib.Path:
     return pathlib.Path("upload/airports/") / pathlib.Path(filename)
 
 
+def airport_image_storage():
+    return storages["airport_images"]
+
+
 class Airport(models.Model):
     name = models.CharField(max_length=100, unique=True)
     closest_big_city = models.CharField(max_length=100)
-    image = models.ImageField(null=True, upload_to=airport_image_path)
+    image = models.ImageField(
+        null=True,
+        upload_to=airport_image_path,
+        storage=airport_image_storage,
+    )
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored image so replacing it releases the old blob.
+        instance.stored_image = (
+            (instance.image.name, instance.image_variants)
+            if "image" in field_names and "image_variants" in field_names
+            else None
+        )
+        return instance
 
     @property
     def full_name(self) -> str:
@@ -100,6 +126,41 @@ class Crew(models.Model):
         ordering = ["last_name", "first_name"]
 
 
+class FlightQuerySet(models.QuerySet):
+    def with_availability(self) -> "FlightQuerySet":
+        """Annotate flights with sold and available ticket counts"""
+        tickets_sold = (
+            Ticket.objects.filter(flight=OuterRef("pk"))
+            .order_by()
+            .values("flight")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        return self.annotate(
+            tickets_sold=Coalesce(Subquery(tickets_sold), 0),
+            tickets_available=(
+                F("airplane__rows") * F("airplane__seats_in_row")
+                - F("tickets_sold")
+            ),
+        )
+
+    def availability_by_day(self) -> models.QuerySet:
+        """Group flights by departure day with seat availability bounds"""
+        return (
+            self.with_availability()
+            .annotate(date=TruncDate("departure_time"))
+            .order_by()
+            .values("date")
+            .annotate(
+                flights=Count("id"),
+                min_tickets_available=Min("tickets_available"),
+                max_tickets_available=Max("tickets_available"),
+                earliest_departure=Min("departure_time"),
+            )
+            .order_by("date")
+        )
+
+
 class Flight(models.Model):
     route = models.ForeignKey(
         Route,
@@ -118,6 +179,8 @@ class Flight(models.Model):
         related_name="flights"
     )
 
+    objects = FlightQuerySet.as_manager()
+
     @staticmethod
     def validate_flight(departure_time, arrival_time, error_to_raise):
         if not departure_time or not arrival_time:
@@ -130,6 +193,10 @@ class Flight(models.Model):
                 "Arrival time must be later than departure time."
             )
 
+    @cached_property
+    def seat_map(self) -> SeatMap:
+        return get_seat_map(self)
+
     def clean(self):
         Flight.validate_flight(
             self.departure_time,
@@ -143,6 +210,20 @@ class Flight(models.Model):
 
     class Meta:
         ordering = ["departure_time", "arrival_time"]
+        indexes = [
+            models.Index(
+                fields=["route", "departure_time"],
+                name="flight_route_departure_idx",
+            ),
+            models.Index(
+                fields=["departure_time", "arrival_time", "id"],
+                name="flight_departure_idx",
+            ),
+            models.Index(
+                fields=["arrival_time"],
+                name="flight_arrival_idx",
+            ),
+        ]
 
 
 class Order(models.Model):
@@ -210,3 +291,100 @@ class Ticket(models.Model):
     class Meta:
         ordering = ["flight", "row", "seat"]
         unique_together = ("flight", "row", "seat")
+
+
+class IdempotencyKey(models.Model):
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="idempotency_keys"
+    )
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response_body = models.JSONField(null=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    @property
+    def is_complete(self) -> bool:
+        return self.status_code is not None
+
+    def __str__(self):
+        return f"Idempotency key {self.key} ({self.user_id})"
+
+    class Meta:
+        unique_together = ("user", "key")
+
+
+class OrderJob(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        PROCESSING = "processing"
+        DONE = "done"
+        FAILED = "failed"
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="order_jobs"
+    )
+    flight = models.ForeignKey(
+        Flight,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="order_jobs"
+    )
+    tickets = models.JSONField()
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING
+    )
+    worker = models.CharField(max_length=64, blank=True)
+    order = models.OneToOneField(
+        Order,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="job"
+    )
+    error = models.JSONField(null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Order job {self.id} ({self.status})"
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(
+                fields=["status", "flight", "id"],
+                name="order_job_queue_idx",
+            ),
+        ]
+
+
+class ThrottleCounter(models.Model):
+    """Requests counted for one throttle key in one rate window"""
+
+    key = models.CharField(max_length=255)
+    period = models.BigIntegerField()
+    count = models.PositiveIntegerField(default=0)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"Throttle {self.key} #{self.period}: {self.count}"
+
+    class Meta:
+        unique_together = ("key", "period")
+
+
+class MediaBlob(models.Model):
+    """Stored file shared by every upload with the same content"""
+
+    name = models.CharField(max_length=255, unique=True)
+    references = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.references} references)"
@@ -0,0 +1,98 @@
+import uuid
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import APIException
+
+from airport.booking import place_order
+from airport.models import OrderJob
+
+BATCH_SIZE = 50
+STALE_JOB_TIMEOUT = timedelta(minutes=5)
+
+
+def enqueue_order(user, tickets: list[dict]) -> OrderJob:
+    """Store validated tickets as a pending job for the worker pool"""
+    return OrderJob.objects.create(
+        user=user,
+        flight_id=min(ticket["flight_id"] for ticket in tickets),
+        tickets=tickets,
+    )
+
+
+def claim_batch(worker: str, batch_size: int = BATCH_SIZE) -> list[OrderJob]:
+    """Claim the oldest pending jobs of one flight for ``worker``.
+
+    Jobs are grouped by flight so a batch takes the flight lock once and
+    workers rarely wait on each other. Rows locked by other workers are
+    skipped where the database supports it; the conditional update keeps
+    claims exclusive everywhere else.
+    """
+    pending = OrderJob.objects.filter(status=OrderJob.Status.PENDING)
+    with transaction.atomic():
+        head = (
+            pending.select_for_update(skip_locked=True)
+            .values_list("flight_id")
+            .first()
+        )
+        if head is None:
+            return []
+        ids = list(
+            pending.select_for_update(skip_locked=True)
+            .filter(flight_id=head[0])
+            .values_list("id", flat=True)[:batch_size]
+        )
+        pending.filter(id__in=ids).update(
+            status=OrderJob.Status.PROCESSING,
+            worker=worker,
+            updated_at=timezone.now(),
+        )
+    return list(
+        OrderJob.objects.filter(
+            id__in=ids,
+            status=OrderJob.Status.PROCESSING,
+            worker=worker,
+        )
+    )
+
+
+def process_batch(jobs: list[OrderJob]) -> None:
+    """Place the orders of claimed jobs in a single transaction.
+
+    Every order is placed in its own savepoint, so a seat conflict fails
+    only that job while the rest of the batch is committed.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        for job in jobs:
+            try:
+                job.order = place_order(job.tickets, user_id=job.user_id)
+            except APIException as error:
+                job.status = OrderJob.Status.FAILED
+                job.error = error.detail
+            else:
+                job.status = OrderJob.Status.DONE
+            job.updated_at = now
+        OrderJob.objects.bulk_update(
+            jobs,
+            ["status", "order", "error", "updated_at"]
+        )
+
+
+def requeue_stale_jobs(timeout: timedelta = STALE_JOB_TIMEOUT) -> int:
+    """Return jobs of workers that died mid-batch to the queue"""
+    return OrderJob.objects.filter(
+        status=OrderJob.Status.PROCESSING,
+        updated_at__lt=timezone.now() - timeout,
+    ).update(status=OrderJob.Status.PENDING, worker="")
+
+
+def drain_queue(batch_size: int = BATCH_SIZE) -> int:
+    """Process pending jobs until the queue is empty, return the count"""
+    worker = uuid.uuid4().hex
+    processed = 0
+    while jobs := claim_batch(worker, batch_size):
+        process_batch(jobs)
+        processed += len(jobs)
+    return processed
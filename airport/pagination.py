@@ -0,0 +1,256 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor.")
+
+
+class KeysetPagination(BasePagination):
+    """Paginate by the ordering values of the last row of a page.
+
+    The ordering follows the queryset (or model ``Meta.ordering``) with the
+    primary key appended as a tie-breaker. Each page is fetched with a
+    ``WHERE (a, b, id) > (...)``-style filter and ``LIMIT page_size + 1``,
+    so deep pages cost the same as the first one and no ``COUNT(*)`` runs.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, queryset) -> list[str]:
+        model_meta = queryset.model._meta
+        ordering = []
+        for field_name in queryset.query.order_by or model_meta.ordering:
+            if not isinstance(field_name, str):
+                raise ImproperlyConfigured(
+                    "KeysetPagination supports only field name ordering."
+                )
+            descending = field_name.startswith("-")
+            name = field_name.lstrip("-")
+            if "__" not in name and name != "pk":
+                field = model_meta.get_field(name)
+                if field.many_to_one:
+                    name = field.attname
+            ordering.append(f"-{name}" if descending else name)
+
+        if not any(
+            field_name.lstrip("-") in ("pk", model_meta.pk.attname)
+            for field_name in ordering
+        ):
+            ordering.append("pk")
+        return ordering
+
+    def decode_cursor(self, request) -> dict | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position, reverse = cursor["p"], bool(cursor.get("r"))
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list):
+            raise NotFound(self.invalid_cursor_message)
+        return {"position": position, "reverse": reverse}
+
+    def encode_cursor(self, position: list, reverse: bool = False) -> str:
+        cursor = {"p": position}
+        if reverse:
+            cursor["r"] = 1
+        encoded = json.dumps(cursor, default=_encode_value).encode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            base64.urlsafe_b64encode(encoded).decode(),
+        )
+
+    @staticmethod
+    def get_position(instance, ordering: list[str]) -> list:
+        position = []
+        for field_name in ordering:
+            value = instance
+            for attr in field_name.lstrip("-").split("__"):
+                value = getattr(value, attr)
+            position.append(value)
+        return position
+
+    @staticmethod
+    def get_position_filter(
+        ordering: list[str],
+        position: list,
+        reverse: bool
+    ) -> Q:
+        """Build ``a >= x AND ((a > x) OR (a = x AND b > y) OR ...)``.
+
+        The OR expansion alone gives the planner no range on the leading
+        column, so the redundant ``a >= x`` is what lets it seek into an
+        index on the ordering instead of scanning every earlier row.
+        """
+        position_filter = Q()
+        equal_prefix = Q()
+        leading_bound = Q()
+        for field_name, value in zip(ordering, position):
+            name = field_name.lstrip("-")
+            descending = field_name.startswith("-") != reverse
+            lookup = "lt" if descending else "gt"
+            if not leading_bound:
+                leading_bound = Q(**{f"{name}__{lookup}e": value})
+            position_filter |= equal_prefix & Q(**{f"{name}__{lookup}": value})
+            equal_prefix &= Q(**{name: value})
+        if len(ordering) == 1:
+            return position_filter
+        return leading_bound & position_filter
+
+    def get_page_queryset(self, queryset, request):
+        """Return the queryset of one page plus one row to detect more"""
+        self.request = request
+        self.ordering = self.get_ordering(queryset)
+        self.page_size_requested = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        self.has_cursor = cursor is not None
+        self.reverse = bool(cursor and cursor["reverse"])
+
+        if cursor is not None:
+            if len(cursor["position"]) != len(self.ordering):
+                raise NotFound(self.invalid_cursor_message)
+            try:
+                queryset = queryset.filter(
+                    self.get_position_filter(
+                        self.ordering,
+                        cursor["position"],
+                        self.reverse
+                    )
+                )
+            except (ValidationError, TypeError, ValueError):
+                # Position values the ordering fields cannot take.
+                raise NotFound(self.invalid_cursor_message)
+
+        if self.reverse:
+            queryset = queryset.order_by(*(
+                field_name[1:] if field_name.startswith("-")
+                else f"-{field_name}"
+                for field_name in self.ordering
+            ))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        return queryset[:self.page_size_requested + 1]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        rows = list(self.get_page_queryset(queryset, request))
+        return self.paginate_rows(
+            rows,
+            self.page_size_requested,
+            self.has_cursor,
+            self.reverse
+        )
+
+    def paginate_rows(
+        self,
+        rows: list,
+        page_size: int,
+        has_cursor: bool,
+        reverse: bool
+    ) -> list:
+        has_following = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = has_cursor, has_following
+        else:
+            self.has_next, self.has_previous = has_following, has_cursor
+
+        self.first_row = rows[0] if rows else None
+        self.last_row = rows[-1] if rows else None
+        return rows
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next or self.last_row is None:
+            return None
+        return self.encode_cursor(
+            self.get_position(self.last_row, self.ordering)
+        )
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous:
+            return None
+        if self.first_row is None:
+            return remove_query_param(
+                self.request.build_absolute_uri(),
+                self.cursor_query_param
+            )
+        return self.encode_cursor(
+            self.get_position(self.first_row, self.ordering),
+            reverse=True
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri"
+                },
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
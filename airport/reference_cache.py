@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from airport.models import Airplane, Airport, Route
+
+REFERENCE_VERSION_KEY = "airport:reference_version"
+VERSION_CHECK_INTERVAL = 1.0
+
+
+class ReferenceData:
+    """Snapshot of airports, airplanes and routes kept in process memory.
+
+    These entities change rarely but are named on almost every read, so
+    serializers resolve them here by id instead of joining their tables.
+    """
+
+    def __init__(self, version, airports, airplanes, routes):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.airport_names = dict(airports)
+        self.airplane_names = dict(airplanes)
+        self.routes = {}
+        self.route_names = {}
+        self.routes_from = defaultdict(list)
+        for route_id, source_id, destination_id, distance in routes:
+            self.routes[route_id] = (source_id, destination_id, distance)
+            self.route_names[route_id] = (
+                f"{self.airport_names.get(source_id)} -> "
+                f"{self.airport_names.get(destination_id)}"
+            )
+            self.routes_from[source_id].append((route_id, destination_id))
+
+    @classmethod
+    def load(cls, version) -> "ReferenceData":
+        return cls(
+            version,
+            Airport.objects.values_list("id", "name"),
+            Airplane.objects.values_list("id", "name"),
+            Route.objects.values_list(
+                "id",
+                "source_id",
+                "destination_id",
+                "distance",
+            ),
+        )
+
+    def airport_name(self, airport_id: int) -> str | None:
+        return self.airport_names.get(airport_id)
+
+    def airplane_name(self, airplane_id: int) -> str | None:
+        return self.airplane_names.get(airplane_id)
+
+    def route_name(self, route_id: int) -> str | None:
+        return self.route_names.get(route_id)
+
+
+_snapshot = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def get_reference_version():
+    """Return the version shared by all workers through the cache"""
+    return cache.get_or_set(REFERENCE_VERSION_KEY, time.time_ns, None)
+
+
+def get_reference_data(refresh: bool = False) -> ReferenceData:
+    """Return the current snapshot, reloading it when the version moved.
+
+    The shared version is read at most once per
+    ``VERSION_CHECK_INTERVAL`` seconds, so changes made by other workers
+    show up within that interval when the cache is shared. Snapshots are
+    reloaded after ``REFERENCE_DATA_MAX_AGE`` seconds in any case, which
+    bounds staleness when each worker only sees its own cache.
+    """
+    global _snapshot, _checked_at
+
+    snapshot = _snapshot
+    now = time.monotonic()
+    if (
+        not refresh
+        and snapshot is not None
+        and now - _checked_at < VERSION_CHECK_INTERVAL
+    ):
+        return snapshot
+
+    with _lock:
+        version = get_reference_version()
+        if (
+            refresh
+            or _snapshot is None
+            or _snapshot.version != version
+            or now - _snapshot.loaded_at > settings.REFERENCE_DATA_MAX_AGE
+        ):
+            _snapshot = ReferenceData.load(version)
+        _checked_at = now
+        return _snapshot
+
+
+def lookup_reference(method: str, pk: int) -> str | None:
+    """Resolve a name by id, reloading the snapshot once on a miss"""
+    name = getattr(get_reference_data(), method)(pk)
+    if name is None:
+        name = getattr(get_reference_data(refresh=True), method)(pk)
+    return name
+
+
+def invalidate_reference_data() -> None:
+    """Drop this worker's snapshot and move the shared version"""
+    global _snapshot
+
+    _snapshot = None
+    try:
+        cache.incr(REFERENCE_VERSION_KEY)
+    except ValueError:
+        cache.set(REFERENCE_VERSION_KEY, time.time_ns(), None)
@@ -0,0 +1,11 @@
+import random
+
+
+def backoff(attempt: int, base: float, cap: float) -> float:
+    """Return the wait before retry ``attempt``, counted from 1.
+
+    Full jitter: a uniform pick below ``base * 2 ** (attempt - 1)``,
+    capped at ``cap``, keeps clients that failed together from retrying
+    in lockstep.
+    """
+    return random.uniform(0, min(base * 2 ** (attempt - 1), cap))
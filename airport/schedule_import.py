@@ -0,0 +1,338 @@
+import csv
+import gzip
+import json
+from collections import Counter
+from pathlib import Path
+
+from django.db import connection
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Crew,
+    Flight,
+    Route
+)
+
+BATCH_SIZE = 10_000
+RECORD_TYPES = ("airport", "airplane", "route", "flight")
+# Order in which buffered rows are written, dependencies first.
+FLUSH_ORDER = ("airport", "airplane", "route", "crew", "flight")
+CREW_SEPARATOR = ";"
+
+
+class ScheduleImportError(Exception):
+    """A record of the schedule cannot be imported"""
+
+
+def open_text(path: Path):
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return path.open(encoding="utf-8", newline="")
+
+
+def read_records(path):
+    """Yield ``(line, record)`` pairs of a CSV or JSONL file, lazily.
+
+    The format follows the extension (``.csv``, ``.jsonl`` or
+    ``.ndjson``, optionally gzipped).
+    """
+    path = Path(path)
+    suffix = Path(path.stem).suffix if path.suffix == ".gz" else path.suffix
+    if suffix not in (".csv", ".jsonl", ".ndjson"):
+        raise ScheduleImportError(
+            f"{path}: expected a .csv, .jsonl or .ndjson file."
+        )
+
+    with open_text(path) as file:
+        if suffix == ".csv":
+            reader = csv.DictReader(file)
+            for record in reader:
+                yield reader.line_num, record
+            return
+
+        for line, text in enumerate(file, start=1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except ValueError as exc:
+                raise ScheduleImportError(f"Line {line}: {exc}")
+            if not isinstance(record, dict):
+                raise ScheduleImportError(
+                    f"Line {line}: expected a JSON object."
+                )
+            yield line, record
+
+
+def parse_time(value: str):
+    parsed = parse_datetime(value or "")
+    if parsed is None:
+        raise ScheduleImportError(f"Invalid datetime {value!r}.")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def split_crew(value) -> list[tuple[str, str]]:
+    """Parse "First Last" crew names, ``;``-separated in CSV"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(CREW_SEPARATOR)
+    names = []
+    for name in value:
+        parts = name.split(maxsplit=1)
+        if len(parts) != 2:
+            raise ScheduleImportError(
+                f"Crew member {name!r} must be \"First Last\"."
+            )
+        names.append((parts[0], parts[1]))
+    return names
+
+
+class ScheduleImporter:
+    """Bulk import airports, airplanes, routes and flights.
+
+    Natural keys (airport, airplane and type names, crew names) resolve
+    through in-memory maps of ``key -> id`` loaded once, so no row is
+    looked up individually. New rows are buffered per type and written
+    ``batch_size`` at a time: flights and their crew links with
+    PostgreSQL ``COPY``, everything else with ``bulk_create``. A key
+    mapped to ``None`` is buffered but not written yet; resolving it
+    flushes its buffer first. Existing airports, airplanes, routes and
+    crew are kept as they are; flights are always added.
+
+    Bulk writes skip model signals, so callers must invalidate the
+    reference data and the flight index once the import is committed.
+    """
+
+    def __init__(self, batch_size: int = BATCH_SIZE):
+        self.batch_size = batch_size
+        self.use_copy = connection.vendor == "postgresql"
+        self.airports = dict(Airport.objects.values_list("name", "id"))
+        self.airplane_types = dict(
+            AirplaneType.objects.values_list("name", "id")
+        )
+        self.airplanes = dict(Airplane.objects.values_list("name", "id"))
+        self.routes = {
+            (source_id, destination_id): route_id
+            for route_id, source_id, destination_id
+            in Route.objects.values_list("id", "source_id", "destination_id")
+        }
+        self.crew = {
+            (first_name, last_name): crew_id
+            for crew_id, first_name, last_name in Crew.objects.values_list(
+                "id", "first_name", "last_name"
+            )
+        }
+        self.buffers = {record_type: [] for record_type in FLUSH_ORDER}
+        self.counts = Counter()
+
+    def add(self, line: int, record: dict, default_type: str = None):
+        record_type = record.get("type") or default_type
+        if record_type not in RECORD_TYPES:
+            raise ScheduleImportError(
+                f"Line {line}: unknown record type {record_type!r}."
+            )
+        try:
+            getattr(self, f"add_{record_type}")(record)
+        except KeyError as exc:
+            raise ScheduleImportError(
+                f"Line {line}: missing {record_type} field {exc}."
+            )
+        except (ScheduleImportError, ValueError, TypeError) as exc:
+            raise ScheduleImportError(f"Line {line}: {exc}")
+
+        if len(self.buffers[record_type]) >= self.batch_size:
+            self.flush(record_type)
+
+    def resolve(self, mapping: dict, key, record_type: str) -> int:
+        if key not in mapping:
+            raise ScheduleImportError(f"Unknown {record_type} {key!r}.")
+        if mapping[key] is None:
+            self.flush(record_type)
+        return mapping[key]
+
+    def add_airport(self, record):
+        name = record["name"]
+        if name in self.airports:
+            return
+        self.airports[name] = None
+        self.buffers["airport"].append(
+            Airport(name=name, closest_big_city=record["closest_big_city"])
+        )
+
+    def add_airplane(self, record):
+        name = record["name"]
+        if name in self.airplanes:
+            return
+        type_name = record["airplane_type"]
+        if type_name not in self.airplane_types:
+            self.airplane_types[type_name] = AirplaneType.objects.create(
+                name=type_name
+            ).id
+            self.counts["airplane_type"] += 1
+        self.airplanes[name] = None
+        self.buffers["airplane"].append(
+            Airplane(
+                name=name,
+                rows=int(record["rows"]),
+                seats_in_row=int(record["seats_in_row"]),
+                airplane_type_id=self.airplane_types[type_name],
+            )
+        )
+
+    def route_key(self, record) -> tuple[int, int]:
+        return (
+            self.resolve(self.airports, record["source"], "airport"),
+            self.resolve(self.airports, record["destination"], "airport"),
+        )
+
+    def add_route(self, record):
+        key = self.route_key(record)
+        if key in self.routes:
+            return
+        self.routes[key] = None
+        self.buffers["route"].append(
+            Route(
+                source_id=key[0],
+                destination_id=key[1],
+                distance=int(record["distance"]),
+            )
+        )
+
+    def add_flight(self, record):
+        route_key = self.route_key(record)
+        if route_key not in self.routes:
+            raise ScheduleImportError(
+                f"Unknown route {record['source']!r} -> "
+                f"{record['destination']!r}."
+            )
+        departure_time = parse_time(record["departure_time"])
+        arrival_time = parse_time(record["arrival_time"])
+        Flight.validate_flight(
+            departure_time,
+            arrival_time,
+            ScheduleImportError,
+        )
+
+        crew = split_crew(record.get("crew"))
+        for name in crew:
+            if name not in self.crew:
+                self.crew[name] = None
+                self.buffers["crew"].append(
+                    Crew(first_name=name[0], last_name=name[1])
+                )
+
+        self.buffers["flight"].append((
+            self.resolve(self.routes, route_key, "route"),
+            self.resolve(self.airplanes, record["airplane"], "airplane"),
+            departure_time,
+            arrival_time,
+            crew,
+        ))
+
+    def flush(self, record_type: str):
+        rows = self.buffers[record_type]
+        if not rows:
+            return
+        if record_type == "flight":
+            self.flush("crew")
+            self.write_flights(rows)
+        else:
+            self.write_objects(record_type, rows)
+        self.counts[record_type] += len(rows)
+        self.buffers[record_type] = []
+
+    def write_objects(self, record_type: str, objects: list):
+        model = type(objects[0])
+        model.objects.bulk_create(objects, batch_size=self.batch_size)
+        for obj in objects:
+            if record_type == "airport":
+                self.airports[obj.name] = obj.id
+            elif record_type == "airplane":
+                self.airplanes[obj.name] = obj.id
+            elif record_type == "route":
+                self.routes[obj.source_id, obj.destination_id] = obj.id
+            else:
+                self.crew[obj.first_name, obj.last_name] = obj.id
+
+    def write_flights(self, rows: list):
+        crew_links = Flight.crew.through
+        if self.use_copy:
+            ids = self.reserve_flight_ids(len(rows))
+        else:
+            flights = Flight.objects.bulk_create(
+                [
+                    Flight(
+                        route_id=route_id,
+                        airplane_id=airplane_id,
+                        departure_time=departure_time,
+                        arrival_time=arrival_time,
+                    )
+                    for route_id, airplane_id, departure_time, arrival_time, _
+                    in rows
+                ],
+                batch_size=self.batch_size,
+            )
+            ids = [flight.id for flight in flights]
+
+        links = [
+            (flight_id, self.crew[name])
+            for flight_id, row in zip(ids, rows)
+            for name in row[4]
+        ]
+        self.counts["flight_crew"] += len(links)
+
+        if not self.use_copy:
+            crew_links.objects.bulk_create(
+                [
+                    crew_links(flight_id=flight_id, crew_id=crew_id)
+                    for flight_id, crew_id in links
+                ],
+                batch_size=self.batch_size,
+            )
+            return
+
+        with connection.cursor() as cursor:
+            copy_rows(
+                cursor,
+                Flight,
+                ("id", "route", "airplane", "departure_time", "arrival_time"),
+                (
+                    (flight_id, *row[:4])
+                    for flight_id, row in zip(ids, rows)
+                ),
+            )
+            copy_rows(cursor, crew_links, ("flight", "crew"), links)
+
+    def reserve_flight_ids(self, count: int) -> list[int]:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, %s)) "
+                "FROM generate_series(1, %s)",
+                [Flight._meta.db_table, Flight._meta.pk.column, count],
+            )
+            return [flight_id for (flight_id,) in cursor.fetchall()]
+
+    def finish(self) -> Counter:
+        for record_type in FLUSH_ORDER:
+            self.flush(record_type)
+        return self.counts
+
+
+def copy_rows(cursor, model, field_names, rows):
+    """Stream ``rows`` into the table of ``model`` with ``COPY``"""
+    quote = connection.ops.quote_name
+    columns = ", ".join(
+        quote(model._meta.get_field(name).column) for name in field_names
+    )
+    with cursor.copy(
+        f"COPY {quote(model._meta.db_table)} ({columns}) FROM STDIN"
+    ) as copy:
+        for row in rows:
+            copy.write_row(row)
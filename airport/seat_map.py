@@ -0,0 +1,312 @@
+import time
+from collections import defaultdict
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class SeatMap:
+    """Seat occupancy of a single flight packed into a bitset.
+
+    Bit ``(row - 1) * seats_in_row + (seat - 1)`` is set when the seat
+    is taken, so a wide-body flight fits into a few dozen bytes.
+    """
+
+    __slots__ = ("rows", "seats_in_row", "_bits")
+
+    def __init__(self, rows: int, seats_in_row: int, bits: bytes = b""):
+        self.rows = rows
+        self.seats_in_row = seats_in_row
+        self._bits = bytearray(bits or (rows * seats_in_row + 7) // 8)
+
+    @classmethod
+    def build(
+        cls,
+        rows: int,
+        seats_in_row: int,
+        seats: Iterable[tuple[int, int]],
+    ) -> "SeatMap":
+        seat_map = cls(rows, seats_in_row)
+        for row, seat in seats:
+            seat_map.take(row, seat)
+        return seat_map
+
+    @property
+    def capacity(self) -> int:
+        return self.rows * self.seats_in_row
+
+    @property
+    def taken_count(self) -> int:
+        return int.from_bytes(self._bits, "little").bit_count()
+
+    @property
+    def available(self) -> int:
+        return self.capacity - self.taken_count
+
+    def contains(self, row: int, seat: int) -> bool:
+        return 1 <= row <= self.rows and 1 <= seat <= self.seats_in_row
+
+    def _position(self, row: int, seat: int) -> tuple[int, int]:
+        if not self.contains(row, seat):
+            raise IndexError(f"Seat ({row}, {seat}) is outside the cabin.")
+        index = (row - 1) * self.seats_in_row + seat - 1
+        return index >> 3, 1 << (index & 7)
+
+    def is_taken(self, row: int, seat: int) -> bool:
+        if not self.contains(row, seat):
+            return False
+        byte, mask = self._position(row, seat)
+        return bool(self._bits[byte] & mask)
+
+    def take(self, row: int, seat: int) -> None:
+        byte, mask = self._position(row, seat)
+        self._bits[byte] |= mask
+
+    def release(self, row: int, seat: int) -> None:
+        byte, mask = self._position(row, seat)
+        self._bits[byte] &= ~mask
+
+    def taken_seats(self) -> Iterator[tuple[int, int]]:
+        """Yield taken seats as ``(row, seat)`` in cabin order"""
+        for byte_index, byte in enumerate(self._bits):
+            if not byte:
+                continue
+            for bit in range(8):
+                if byte & (1 << bit):
+                    row, seat = divmod(
+                        (byte_index << 3) + bit,
+                        self.seats_in_row
+                    )
+                    yield row + 1, seat + 1
+
+    def find_adjacent(self, count: int) -> list[tuple[int, int]] | None:
+        """Pick ``count`` free seats as close together as possible.
+
+        The first row with a contiguous run of free seats wins; otherwise
+        seats come from the narrowest band of consecutive rows that has
+        enough of them. Returns ``None`` when the flight has too few free
+        seats left.
+        """
+        if count < 1 or count > self.available:
+            return None
+
+        taken = int.from_bytes(self._bits, "little")
+        row_mask = (1 << self.seats_in_row) - 1
+        free_rows = [
+            ~(taken >> (row * self.seats_in_row)) & row_mask
+            for row in range(self.rows)
+        ]
+
+        if count <= self.seats_in_row:
+            for row, free in enumerate(free_rows):
+                run = free
+                for _ in range(count - 1):
+                    run &= run >> 1
+                if run:
+                    first = (run & -run).bit_length()
+                    return [
+                        (row + 1, seat)
+                        for seat in range(first, first + count)
+                    ]
+
+        free_counts = [free.bit_count() for free in free_rows]
+        best = None
+        start = seats = 0
+        for end, row_count in enumerate(free_counts):
+            seats += row_count
+            while seats - free_counts[start] >= count:
+                seats -= free_counts[start]
+                start += 1
+            if seats >= count and (
+                best is None or end - start < best[1] - best[0]
+            ):
+                best = start, end
+
+        picked = []
+        for row in range(best[0], best[1] + 1):
+            free = free_rows[row]
+            while free and len(picked) < count:
+                seat = (free & -free).bit_length()
+                picked.append((row + 1, seat))
+                free &= free - 1
+        return picked
+
+    def to_cache(self) -> tuple[int, int, bytes]:
+        return self.rows, self.seats_in_row, bytes(self._bits)
+
+    @classmethod
+    def from_cache(cls, value: tuple[int, int, bytes]) -> "SeatMap":
+        return cls(*value)
+
+
+def seat_map_cache_key(flight_id: int) -> str:
+    return f"airport:seat_map:{flight_id}"
+
+
+def seat_map_generation_key(flight_id: int) -> str:
+    return f"airport:seat_map_generation:{flight_id}"
+
+
+def fetch_cached(flight_ids) -> tuple[dict, dict]:
+    """Return the generations and cached maps of flights, keyed by id.
+
+    Both are fetched in one round trip; flights without a generation get
+    a new one, so a map built from here on can be stored under it.
+    """
+    flight_ids = list(flight_ids)
+    cached = cache.get_many([
+        key
+        for flight_id in flight_ids
+        for key in (
+            seat_map_generation_key(flight_id),
+            seat_map_cache_key(flight_id),
+        )
+    ])
+    generations = {
+        flight_id: cached.get(seat_map_generation_key(flight_id))
+        for flight_id in flight_ids
+    }
+    new = [
+        seat_map_generation_key(flight_id)
+        for flight_id, generation in generations.items()
+        if generation is None
+    ]
+    if new:
+        for key in new:
+            cache.add(key, time.time_ns(), None)
+        added = cache.get_many(new)
+        for flight_id in generations:
+            generations[flight_id] = generations[flight_id] or added.get(
+                seat_map_generation_key(flight_id)
+            )
+    return generations, {
+        flight_id: cached.get(seat_map_cache_key(flight_id))
+        for flight_id in flight_ids
+    }
+
+
+def cached_seat_map(value, generation, airplane) -> SeatMap | None:
+    """Restore a cached map stored under the current generation"""
+    if (
+        value is None
+        or generation is None
+        or value[0] != generation
+        or value[1:3] != (airplane.rows, airplane.seats_in_row)
+    ):
+        return None
+    return SeatMap.from_cache(value[1:])
+
+
+def get_seat_map(flight) -> SeatMap:
+    """Return the cached seat map of a flight, building it on a miss.
+
+    A miss costs a single ``(row, seat)`` query, or none at all when the
+    flight tickets were already prefetched.
+    """
+    airplane = flight.airplane
+    generations, cached = fetch_cached([flight.id])
+    generation = generations[flight.id]
+    seat_map = cached_seat_map(cached[flight.id], generation, airplane)
+    if seat_map is not None:
+        return seat_map
+
+    if "tickets" in getattr(flight, "_prefetched_objects_cache", {}):
+        seats = [(ticket.row, ticket.seat) for ticket in flight.tickets.all()]
+    else:
+        seats = flight.tickets.values_list("row", "seat")
+
+    seat_map = SeatMap.build(airplane.rows, airplane.seats_in_row, seats)
+    if generation is not None:
+        cache.set(
+            seat_map_cache_key(flight.id),
+            (generation, *seat_map.to_cache()),
+            settings.SEAT_MAP_CACHE_TIMEOUT,
+        )
+    return seat_map
+
+
+def load_seat_maps(flights) -> dict[int, SeatMap]:
+    """Build seat maps of several flights from a single ticket query.
+
+    The cache is neither read nor written, so the maps reflect exactly
+    what the current transaction sees.
+    """
+    from airport.models import Ticket
+
+    flights = {flight.id: flight for flight in flights}
+    seats = defaultdict(list)
+    for flight_id, row, seat in Ticket.objects.filter(
+        flight_id__in=flights
+    ).values_list("flight_id", "row", "seat"):
+        seats[flight_id].append((row, seat))
+
+    return {
+        flight_id: SeatMap.build(
+            flight.airplane.rows,
+            flight.airplane.seats_in_row,
+            seats[flight_id],
+        )
+        for flight_id, flight in flights.items()
+    }
+
+
+def get_seat_maps(flights) -> dict[int, SeatMap]:
+    """Return seat maps of several flights keyed by flight id.
+
+    Cached maps are fetched in one round trip and all misses are built
+    from a single ticket query.
+    """
+    flights = {flight.id: flight for flight in flights}
+    generations, cached = fetch_cached(flights)
+
+    seat_maps = {}
+    for flight_id, flight in flights.items():
+        seat_map = cached_seat_map(
+            cached[flight_id],
+            generations[flight_id],
+            flight.airplane,
+        )
+        if seat_map is not None:
+            seat_maps[flight_id] = seat_map
+
+    missing = load_seat_maps(
+        flight
+        for flight_id, flight in flights.items()
+        if flight_id not in seat_maps
+    )
+    if missing:
+        seat_maps.update(missing)
+        cache.set_many(
+            {
+                seat_map_cache_key(flight_id): (
+                    generations[flight_id],
+                    *seat_map.to_cache(),
+                )
+                for flight_id, seat_map in missing.items()
+                if generations[flight_id] is not None
+            },
+            settings.SEAT_MAP_CACHE_TIMEOUT,
+        )
+    return seat_maps
+
+
+def invalidate_seat_map(flight_id: int) -> None:
+    """Move the flight to a new generation so cached maps go unused.
+
+    Maps are stored with the generation read before their tickets were,
+    so a map built from tickets an order had not committed yet is never
+    served once the order's invalidation ran. Writers never patch the
+    cached bitmap: two orders committing on the same flight would each
+    write back their own copy and one sale would be lost.
+    """
+    key = seat_map_generation_key(flight_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def invalidate_seat_maps(flight_ids: Iterable[int]) -> None:
+    for flight_id in set(flight_ids):
+        invalidate_seat_map(flight_id)
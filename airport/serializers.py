@@ -1,6 +1,7 @@
-from django.db import transaction
+from django.core.files.storage import default_storage
 from rest_framework import serializers
 
+from airport.booking import SeatConflict, place_order
 from airport.models import (
     AirplaneType,
     Airplane,
@@ -9,8 +10,22 @@ from airport.models import (
     Crew,
     Flight,
     Order,
+    OrderJob,
     Ticket
 )
+from airport.reference_cache import lookup_reference
+from airport.seat_map import get_seat_maps
+
+
+class ReferenceNameField(serializers.ReadOnlyField):
+    """Read-only name of a related object, resolved by id from memory"""
+
+    def __init__(self, lookup, **kwargs):
+        self.lookup = lookup
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return lookup_reference(self.lookup, value)
 
 
 class AirplaneTypeSerializer(serializers.ModelSerializer):
@@ -46,10 +61,34 @@ class AirplaneRetrieveSerializer(AirplaneSerializer):
 
 class AirportSerializer(serializers.ModelSerializer):
     image = serializers.ImageField(read_only=True)
+    thumbnails = serializers.SerializerMethodField()
 
     class Meta:
         model = Airport
-        fields = ("id", "name", "closest_big_city", "full_name", "image")
+        fields = (
+            "id",
+            "name",
+            "closest_big_city",
+            "full_name",
+            "image",
+            "thumbnails",
+        )
+
+    def get_thumbnails(self, obj) -> dict:
+        """URLs of each processed thumbnail size, empty until processed"""
+        request = self.context.get("request")
+        thumbnails = {}
+        for size, variant in obj.image_variants.items():
+            thumbnails[size] = {
+                "width": variant["width"],
+                "height": variant["height"],
+            }
+            for image_format, name in variant["files"].items():
+                url = default_storage.url(name)
+                thumbnails[size][image_format] = (
+                    request.build_absolute_uri(url) if request else url
+                )
+        return thumbnails
 
 
 class AirportImageSerializer(serializers.ModelSerializer):
@@ -65,16 +104,9 @@ class RouteSerializer(serializers.ModelSerializer):
 
 
 class RouteListSerializer(RouteSerializer):
-    source = serializers.SlugRelatedField(
-        many=False,
-        read_only=True,
-        slug_field="name"
-    )
-    destination = serializers.SlugRelatedField(
-        many=False,
-        read_only=True,
-        slug_field="name"
-    )
+    source = ReferenceNameField("airport_name", source="source_id")
+    destination = ReferenceNameField("airport_name", source="destination_id")
+    full_route = ReferenceNameField("route_name", source="id")
 
 
 class RouteRetrieveSerializer(RouteSerializer):
@@ -82,6 +114,14 @@ class RouteRetrieveSerializer(RouteSerializer):
     destination = AirportSerializer(many=False, read_only=True)
 
 
+class RouteAvailabilitySerializer(serializers.Serializer):
+    date = serializers.DateField(read_only=True)
+    flights = serializers.IntegerField(read_only=True)
+    min_tickets_available = serializers.IntegerField(read_only=True)
+    max_tickets_available = serializers.IntegerField(read_only=True)
+    earliest_departure = serializers.DateTimeField(read_only=True)
+
+
 class CrewSerializer(serializers.ModelSerializer):
     class Meta:
         model = Crew
@@ -101,16 +141,24 @@ class FlightSerializer(serializers.ModelSerializer):
         )
 
 
-class FlightListSerializer(serializers.ModelSerializer):
-    route = serializers.SerializerMethodField()
-    airplane = serializers.SerializerMethodField()
+class FlightSummarySerializer(serializers.ModelSerializer):
+    route = ReferenceNameField("route_name", source="route_id")
+    airplane = ReferenceNameField("airplane_name", source="airplane_id")
+
+    class Meta:
+        model = Flight
+        fields = (
+            "id",
+            "route",
+            "airplane",
+            "departure_time",
+            "arrival_time",
+        )
 
-    def get_route(self, obj):
-        return (f"{obj.route.source.name} -> "
-                f"{obj.route.destination.name}")
 
-    def get_airplane(self, obj):
-        return obj.airplane.name
+class FlightListSerializer(FlightSummarySerializer):
+    tickets_sold = serializers.IntegerField(read_only=True)
+    tickets_available = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Flight
@@ -120,6 +168,8 @@ class FlightListSerializer(serializers.ModelSerializer):
             "airplane",
             "departure_time",
             "arrival_time",
+            "tickets_sold",
+            "tickets_available",
         )
 
 
@@ -131,13 +181,13 @@ class FlightRetrieveSerializer(FlightSerializer):
     tickets_available = serializers.SerializerMethodField()
 
     def get_taken_seats(self, obj):
-        tickets = obj.tickets.values_list("row", "seat")
-        return [{"Row": row, "Seat": seat} for row, seat in tickets]
+        return [
+            {"Row": row, "Seat": seat}
+            for row, seat in obj.seat_map.taken_seats()
+        ]
 
     def get_tickets_available(self, obj):
-        total_seats = obj.airplane.capacity
-        taken_seats_count = obj.tickets.count()
-        return total_seats - taken_seats_count
+        return obj.seat_map.available
 
     class Meta:
         model = Flight
@@ -153,6 +203,17 @@ class FlightRetrieveSerializer(FlightSerializer):
         )
 
 
+class ItinerarySerializer(serializers.Serializer):
+    legs = FlightListSerializer(many=True, read_only=True)
+    departure_time = serializers.DateTimeField(read_only=True)
+    arrival_time = serializers.DateTimeField(read_only=True)
+    total_duration = serializers.IntegerField(
+        read_only=True,
+        help_text="Total journey time in minutes"
+    )
+    total_distance = serializers.IntegerField(read_only=True)
+
+
 class TicketSerializer(serializers.ModelSerializer):
     order = serializers.PrimaryKeyRelatedField(read_only=True, many=False)
 
@@ -164,6 +225,13 @@ class TicketSerializer(serializers.ModelSerializer):
             attrs["flight"].airplane,
             serializers.ValidationError
         )
+        if attrs["flight"].seat_map.is_taken(attrs["row"], attrs["seat"]):
+            raise serializers.ValidationError(
+                {
+                    "seat": f"Seat {attrs['seat']} in row {attrs['row']} "
+                    f"is already taken."
+                }
+            )
         return data
 
     class Meta:
@@ -172,29 +240,101 @@ class TicketSerializer(serializers.ModelSerializer):
 
 
 class TicketListSerializer(TicketSerializer):
-    flight = serializers.SlugRelatedField(
-        many=False,
-        read_only=True,
-        slug_field="route.full_route"
-    )
+    flight = ReferenceNameField("route_name", source="flight.route_id")
 
 
 class TicketRetrieveSerializer(TicketSerializer):
-    flight = FlightListSerializer(many=False, read_only=True)
+    flight = FlightSummarySerializer(many=False, read_only=True)
 
 
-class OrderSerializer(serializers.ModelSerializer):
-    tickets = TicketSerializer(many=True, read_only=False, allow_empty=False)
+class OrderTicketSerializer(serializers.ModelSerializer):
+    row = serializers.IntegerField(required=False)
+    seat = serializers.IntegerField(required=False)
+    flight = serializers.IntegerField(source="flight_id", min_value=1)
+    order = serializers.PrimaryKeyRelatedField(read_only=True, many=False)
 
-    def create(self, validated_data):
-        with transaction.atomic():
-            tickets_data = validated_data.pop("tickets")
-            order = Order.objects.create(**validated_data)
+    def validate(self, attrs):
+        if ("row" in attrs) != ("seat" in attrs):
+            raise serializers.ValidationError(
+                "Set both row and seat, or neither to get any free seat."
+            )
+        return attrs
+
+    class Meta:
+        model = Ticket
+        fields = ("id", "row", "seat", "flight", "order")
 
-            for ticket_data in tickets_data:
-                Ticket.objects.create(order=order, **ticket_data)
 
-            return order
+class OrderSerializer(serializers.ModelSerializer):
+    tickets = OrderTicketSerializer(
+        many=True,
+        read_only=False,
+        allow_empty=False
+    )
+
+    def validate_tickets(self, tickets):
+        """Validate all tickets against their flights in one pass.
+
+        Flights and airplanes are loaded with one query and seats are
+        checked against the flights' seat maps, so the number of queries
+        does not grow with the number of tickets. Seats already taken are
+        a ``SeatConflict``, just like seats sold while the order is placed.
+        """
+        flight_ids = {ticket["flight_id"] for ticket in tickets}
+        flights = Flight.objects.select_related("airplane").in_bulk(
+            flight_ids
+        )
+        seat_maps = get_seat_maps(flights.values())
+
+        errors = []
+        requested = set()
+        taken = []
+        unassigned = {}
+        for ticket in tickets:
+            flight = flights.get(ticket["flight_id"])
+            row, seat = ticket.get("row"), ticket.get("seat")
+            try:
+                if flight is None:
+                    raise serializers.ValidationError({
+                        "flight": f"Invalid pk \"{ticket['flight_id']}\" "
+                        f"- object does not exist."
+                    })
+                if row is None:
+                    unassigned[flight.id] = unassigned.get(flight.id, 0) + 1
+                    if unassigned[flight.id] > seat_maps[flight.id].available:
+                        raise serializers.ValidationError({
+                            "flight": "Not enough free seats on this flight."
+                        })
+                    errors.append({})
+                    continue
+                Ticket.validate_ticket(
+                    row,
+                    seat,
+                    flight.airplane,
+                    serializers.ValidationError
+                )
+                if (flight.id, row, seat) in requested:
+                    raise serializers.ValidationError({
+                        "seat": f"Seat {seat} in row {row} is requested "
+                        f"more than once."
+                    })
+                if seat_maps[flight.id].is_taken(row, seat):
+                    taken.append((flight.id, row, seat))
+            except serializers.ValidationError as error:
+                errors.append(error.detail)
+            else:
+                errors.append({})
+                requested.add((flight.id, row, seat))
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        if taken:
+            raise SeatConflict(taken)
+        return tickets
+
+    def create(self, validated_data):
+        tickets_data = validated_data.pop("tickets")
+        return place_order(tickets_data, **validated_data)
 
     class Meta:
         model = Order
@@ -207,3 +347,21 @@ class OrderListSerializer(OrderSerializer):
 
 class OrderRetrieveSerializer(OrderSerializer):
     tickets = TicketRetrieveSerializer(many=True, read_only=True)
+
+
+class OrderJobSerializer(serializers.ModelSerializer):
+    status_url = serializers.HyperlinkedIdentityField(
+        view_name="airport:orderjob-detail"
+    )
+
+    class Meta:
+        model = OrderJob
+        fields = (
+            "id",
+            "status",
+            "order",
+            "error",
+            "created_at",
+            "updated_at",
+            "status_url",
+        )
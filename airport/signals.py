@@ -0,0 +1,78 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from airport.itinerary import mark_flight_index_stale, update_flight_index
+from airport.media import acquire_blob, release_blob
+from airport.models import Airplane, Airport, Flight, Route, Ticket
+from airport.reference_cache import invalidate_reference_data
+from airport.seat_map import invalidate_seat_map
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+def drop_ticket_seat_map(sender, instance, **kwargs):
+    transaction.on_commit(lambda: invalidate_seat_map(instance.flight_id))
+
+
+@receiver(post_save, sender=Flight)
+@receiver(post_delete, sender=Flight)
+def drop_flight_seat_map(sender, instance, **kwargs):
+    transaction.on_commit(lambda: invalidate_seat_map(instance.id))
+
+
+@receiver(post_save, sender=Flight)
+def index_flight(sender, instance, **kwargs):
+    flight = (
+        instance.id,
+        instance.route_id,
+        instance.departure_time,
+        instance.arrival_time,
+    )
+    transaction.on_commit(lambda: update_flight_index(*flight))
+
+
+@receiver(post_delete, sender=Flight)
+def unindex_flight(sender, instance, **kwargs):
+    flight_id = instance.id
+    transaction.on_commit(lambda: update_flight_index(flight_id))
+
+
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+def rebuild_flight_index(sender, **kwargs):
+    transaction.on_commit(mark_flight_index_stale)
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_delete, sender=Airport)
+@receiver(post_save, sender=Airplane)
+@receiver(post_delete, sender=Airplane)
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+def move_reference_version(sender, **kwargs):
+    invalidate_reference_data()
+    transaction.on_commit(invalidate_reference_data)
+
+
+@receiver(post_save, sender=Airport)
+def count_airport_image(sender, instance, created, update_fields, **kwargs):
+    if update_fields is not None and "image" not in update_fields:
+        return
+    stored = ("", {}) if created else getattr(instance, "stored_image", None)
+    if stored is None:
+        return
+
+    stored_name, stored_variants = stored
+    if instance.image.name != stored_name:
+        if instance.image.name:
+            acquire_blob(instance.image.name)
+        if stored_name:
+            release_blob(stored_name, stored_variants)
+    instance.stored_image = (instance.image.name, instance.image_variants)
+
+
+@receiver(post_delete, sender=Airport)
+def release_airport_image(sender, instance, **kwargs):
+    if instance.image.name:
+        release_blob(instance.image.name, instance.image_variants)
@@ -0,0 +1,26 @@
+import hashlib
+import pathlib
+
+from django.core.files.storage import FileSystemStorage
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Store each file under the SHA-256 of its content.
+
+    The directory and extension of the proposed name are kept, the stem is
+    replaced with the digest, e.g. ``upload/airports/3f/3fa1...c2.jpg``.
+    Saving content that is already stored reuses the existing file.
+    """
+
+    def _save(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+
+        digest = digest.hexdigest()
+        path = pathlib.PurePosixPath(name)
+        name = str(path.parent / digest[:2] / f"{digest}{path.suffix.lower()}")
+        if self.exists(name):
+            return name
+        return super()._save(name, content)
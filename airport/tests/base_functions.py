@@ -1,5 +1,5 @@
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from django.contrib.auth import get_user_model
 from airport.models import (
     Airport,
@@ -35,11 +35,12 @@ def sample_airplane(**params) -> Airplane:
     """Create a sample airplane"""
     defaults = {
         "name": "Airbus A320neo",
-        "airplane_type": sample_airplane_type(),
         "rows": 30,
         "seats_in_row": 6,
     }
     defaults.update(params)
+    if "airplane_type" not in defaults:
+        defaults["airplane_type"] = sample_airplane_type()
 
     return Airplane.objects.create(**defaults)
 
@@ -129,12 +130,49 @@ def sample_order(**params) -> Order:
 
 def sample_ticket(**params) -> Ticket:
     """Create a sample ticket"""
-    defaults = {
-        "row": 1,
-        "seat": 1,
-        "flight": sample_flight(),
-        "order": sample_order(),
-    }
+    defaults = {"row": 1, "seat": 1}
     defaults.update(params)
+    if "flight" not in defaults:
+        defaults["flight"] = sample_flight()
+    if "order" not in defaults:
+        defaults["order"] = sample_order()
 
     return Ticket.objects.create(**defaults)
+
+
+def sample_flights_with_tickets(
+    flights_count: int,
+    tickets_per_flight: int,
+    batch_size: int = 5000,
+) -> None:
+    """Bulk create flights on one route, each with sold tickets"""
+    airplane = sample_airplane(
+        name="Boeing 747-8",
+        rows=(tickets_per_flight // 10) + 1,
+        seats_in_row=10,
+    )
+    route = sample_route()
+    order = sample_order()
+    departure_time = datetime(2025, 2, 24, 14, 30, tzinfo=timezone.utc)
+
+    for start in range(0, flights_count, batch_size):
+        flights = Flight.objects.bulk_create(
+            Flight(
+                route=route,
+                airplane=airplane,
+                departure_time=departure_time + timedelta(hours=index),
+                arrival_time=departure_time + timedelta(hours=index + 8),
+            )
+            for index in range(start, min(start + batch_size, flights_count))
+        )
+        tickets = [
+            Ticket(
+                flight=flight,
+                order=order,
+                row=index // 10 + 1,
+                seat=index % 10 + 1,
+            )
+            for flight in flights
+            for index in range(tickets_per_flight)
+        ]
+        Ticket.objects.bulk_create(tickets, batch_size=batch_size)
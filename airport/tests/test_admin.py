@@ -0,0 +1,132 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from airport.admin import EstimatedCountPaginator
+from airport.models import Ticket
+from airport.tests.base_functions import (
+    sample_flight,
+    sample_order,
+    sample_ticket,
+    sample_user
+)
+
+
+class AdminChangelistTests(TestCase):
+    """Test the order, flight and ticket admin pages"""
+
+    def setUp(self):
+        self.client.force_login(
+            sample_user(is_staff=True, is_superuser=True)
+        )
+        self.flight = sample_flight()
+        self.order = sample_order(user=sample_user(email="buyer@test.com"))
+
+    def add_tickets(self, count):
+        start = Ticket.objects.count() + 2
+        for row in range(start, start + count):
+            sample_ticket(
+                flight=self.flight,
+                order=sample_order(),
+                row=row,
+            )
+
+    def get_changelist(self, model, **params):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(
+                reverse(f"admin:airport_{model}_changelist"),
+                params
+            )
+        self.assertEqual(res.status_code, 200)
+        return res, len(queries)
+
+    def test_ticket_changelist_queries_constant(self):
+        """Test ticket rows do not query their flight, route or order"""
+        self.add_tickets(1)
+        _, queries = self.get_changelist("ticket")
+
+        self.add_tickets(5)
+        _, more_queries = self.get_changelist("ticket")
+
+        self.assertEqual(queries, more_queries)
+
+    def test_ticket_changelist_sorted_by_id(self):
+        """Test ticket pages sort by the primary key index alone"""
+        self.add_tickets(2)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get_changelist("ticket")
+
+        order_by = [
+            query["sql"].split("ORDER BY")[1]
+            for query in queries
+            if "ORDER BY" in query["sql"]
+            and 'FROM "airport_ticket"' in query["sql"]
+        ]
+        self.assertEqual(
+            [clause.split("LIMIT")[0].strip() for clause in order_by],
+            ['"airport_ticket"."id" DESC']
+        )
+
+    def test_exact_search(self):
+        """Test searching tickets by order id and by customer email"""
+        ticket = sample_ticket(flight=self.flight, order=self.order)
+        self.add_tickets(2)
+
+        for term in (str(self.order.id), "buyer@test.com"):
+            res, _ = self.get_changelist("ticket", q=term)
+            self.assertEqual(
+                list(res.context["cl"].result_list),
+                [ticket]
+            )
+
+        res, _ = self.get_changelist("ticket", q="buyer")
+        self.assertEqual(list(res.context["cl"].result_list), [])
+
+    def test_flight_and_order_pages(self):
+        """Test flight date hierarchy and order change pages"""
+        sample_ticket(flight=self.flight, order=self.order)
+        self.get_changelist("flight")
+        self.get_changelist(
+            "flight",
+            departure_time__year=self.flight.departure_time.year
+        )
+        self.get_changelist("order", q="Airport")
+
+        res = self.client.get(
+            reverse("admin:airport_order_change", args=[self.order.id])
+        )
+        self.assertEqual(res.status_code, 200)
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    """Test counting changelists from table statistics"""
+
+    def setUp(self):
+        sample_ticket()
+
+    def paginator(self, queryset):
+        return EstimatedCountPaginator(queryset, 100)
+
+    @mock.patch("airport.admin.estimated_count", return_value=2_000_000)
+    def test_estimate_used_for_large_tables(self, estimated_count):
+        """Test large tables report the estimate"""
+        self.assertEqual(
+            self.paginator(Ticket.objects.all()).count,
+            2_000_000
+        )
+
+    @mock.patch("airport.admin.estimated_count", return_value=50)
+    def test_exact_count_for_small_tables(self, estimated_count):
+        """Test small tables are counted exactly"""
+        self.assertEqual(self.paginator(Ticket.objects.all()).count, 1)
+
+    def test_exact_count_without_statistics(self):
+        """Test backends without statistics count exactly"""
+        self.assertEqual(
+            self.paginator(Ticket.objects.filter(row=1)).count,
+            1
+        )
@@ -55,7 +55,7 @@ class AuthenticatedAirportTests(TestCase):
         serializer = AirportSerializer(airports, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_create_airport_forbidden(self):
         """Test that regular users cannot create an airport"""
@@ -0,0 +1,188 @@
+import io
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from airport.image_pipeline import process_airport_image
+from airport.models import Airport, MediaBlob
+from airport.tests.base_functions import sample_airport
+
+AIRPORT_URL = reverse("airport:airport-list")
+
+
+def upload_image_url(airport_id):
+    """Return the airport image upload URL"""
+    return reverse("airport:airport-upload-image", args=[airport_id])
+
+
+def image_file(image_format="JPEG", size=(2000, 1000), mode="RGB", **params):
+    """Return an uploadable image file"""
+    buffer = io.BytesIO()
+    Image.new(mode, size, "red").save(buffer, image_format, **params)
+    extension = "jpg" if image_format == "JPEG" else image_format.lower()
+    return SimpleUploadedFile(f"airport.{extension}", buffer.getvalue())
+
+
+def open_stored(name):
+    with default_storage.open(name) as file:
+        image = Image.open(file)
+        image.load()
+    return image
+
+
+class AirportImageTests(TestCase):
+    """Test processing uploaded airport images"""
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root.name,
+            IMAGE_PROCESSING_EAGER=True,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                email="admin@admin.admin",
+                password="adminpassword",
+            )
+        )
+        self.airport = sample_airport()
+
+    def upload(self, file):
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                upload_image_url(self.airport.id),
+                {"image": file},
+                format="multipart",
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.airport.refresh_from_db()
+
+    def test_upload_normalizes_original(self):
+        """Test the original is rotated upright and loses its metadata"""
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation: rotate 90 degrees clockwise
+        exif[0x010F] = "Camera maker"
+
+        self.upload(image_file(exif=exif.tobytes()))
+
+        image = open_stored(self.airport.image.name)
+        self.assertEqual(image.size, (1000, 2000))
+        self.assertEqual(len(image.getexif()), 0)
+
+    def test_normalized_original_stored_as_new_blob(self):
+        """Test the upload is kept and replaced by a new blob"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                upload_image_url(self.airport.id),
+                {"image": image_file()},
+                format="multipart",
+            )
+            self.airport.refresh_from_db()
+            upload = self.airport.image.name
+            self.assertEqual(self.airport.image_variants, {})
+
+        self.airport.refresh_from_db()
+        self.assertNotEqual(self.airport.image.name, upload)
+        self.assertFalse(MediaBlob.objects.filter(name=upload).exists())
+        self.assertEqual(
+            MediaBlob.objects.get(name=self.airport.image.name).references,
+            1
+        )
+        self.assertFalse(default_storage.exists(upload))
+
+    def test_upload_creates_thumbnails(self):
+        """Test every size is stored as WebP and JPEG next to the original"""
+        self.upload(image_file())
+
+        large = self.airport.image_variants["large"]
+        self.assertEqual((large["width"], large["height"]), (1024, 512))
+        self.assertEqual(
+            set(self.airport.image_variants),
+            {"small", "medium", "large"}
+        )
+        self.assertEqual(set(large["files"]), {"webp", "jpeg"})
+        self.assertEqual(
+            open_stored(large["files"]["webp"]).format,
+            "WEBP"
+        )
+        self.assertTrue(
+            large["files"]["jpeg"].startswith(
+                self.airport.image.name.rsplit(".", 1)[0]
+            )
+        )
+
+    def test_transparent_thumbnails_are_png(self):
+        """Test images with transparency keep it in the fallback format"""
+        self.upload(image_file("PNG", mode="RGBA"))
+
+        files = self.airport.image_variants["small"]["files"]
+        self.assertEqual(set(files), {"webp", "png"})
+
+    def test_list_exposes_thumbnail_urls(self):
+        """Test airport lists link every thumbnail"""
+        self.upload(image_file())
+
+        res = self.client.get(AIRPORT_URL)
+
+        thumbnails = res.data["results"][0]["thumbnails"]
+        self.assertEqual(thumbnails["small"]["width"], 160)
+        self.assertTrue(thumbnails["small"]["webp"].startswith("http://"))
+        self.assertTrue(thumbnails["small"]["webp"].endswith("-small.webp"))
+
+    def test_new_upload_discards_stale_processing(self):
+        """Test processing a replaced image stores nothing"""
+        self.upload(image_file())
+        stale = self.airport.image.name
+        self.upload(image_file(size=(800, 600)))
+
+        self.assertIsNone(process_airport_image(self.airport.id, stale))
+        self.assertNotEqual(self.airport.image.name, stale)
+
+    def test_command_processes_missing_thumbnails(self):
+        """Test the command fills in thumbnails lost with a worker"""
+        self.upload(image_file())
+        Airport.objects.update(image_variants={})
+
+        call_command("process_airport_images", stdout=io.StringIO())
+
+        self.airport.refresh_from_db()
+        self.assertEqual(
+            set(self.airport.image_variants),
+            {"small", "medium", "large"}
+        )
+
+    def test_command_keeps_normalized_original(self):
+        """Test reprocessing all images does not re-encode originals"""
+        self.upload(image_file())
+        name = self.airport.image.name
+        with default_storage.open(name) as file:
+            content = file.read()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command(
+                "process_airport_images",
+                "--all",
+                stdout=io.StringIO()
+            )
+
+        self.airport.refresh_from_db()
+        self.assertEqual(self.airport.image.name, name)
+        with default_storage.open(name) as file:
+            self.assertEqual(file.read(), content)
+        self.assertEqual(
+            set(self.airport.image_variants),
+            {"small", "medium", "large"}
+        )
@@ -0,0 +1,218 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from unittest import mock, skipUnless
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db.backends.utils import CursorWrapper
+from django.test import AsyncClient, Client, TestCase, TransactionTestCase
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.async_views import AsyncReadOnlyView
+from airport.tests.base_functions import (
+    sample_airplane,
+    sample_airport,
+    sample_flight,
+    sample_route,
+    sample_ticket,
+    sample_user
+)
+
+
+def bearer(user):
+    """Return an Authorization header for the user"""
+    return {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+
+
+# TestCase data is only visible to the connection of the test thread.
+@mock.patch.object(AsyncReadOnlyView, "thread_sensitive", True)
+class AsyncReadViewTests(TestCase):
+    """Test the async read endpoints mirror the synchronous ones"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = sample_user()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.flight = sample_flight()
+        sample_ticket(flight=self.flight, row=2, seat=3)
+
+    def assert_same(self, name, *args, **params):
+        sync = self.client.get(reverse(f"airport:{name}", args=args), params)
+        res = self.client.get(
+            reverse(f"airport-async:{name}", args=args),
+            params
+        )
+
+        self.assertEqual(res.status_code, sync.status_code)
+        if "results" in sync.data:
+            self.assertEqual(res.data["results"], sync.data["results"])
+        else:
+            self.assertEqual(res.data, sync.data)
+
+    def test_flights(self):
+        """Test flight list, filters and detail"""
+        self.assert_same("flight-list")
+        self.assert_same(
+            "flight-list",
+            departure_date=self.flight.departure_time.strftime("%d-%m-%Y")
+        )
+        self.assert_same("flight-detail", self.flight.id)
+
+    def test_routes_and_airports(self):
+        """Test route list and detail and airport list"""
+        self.assert_same("route-list")
+        self.assert_same("route-detail", self.flight.route_id)
+        self.assert_same("airport-list")
+
+    def test_errors(self):
+        """Test missing objects, bad parameters and anonymous access"""
+        self.assert_same("flight-detail", 10 ** 6)
+        self.assert_same("flight-list", departure_date="2025")
+
+        self.client.force_authenticate(user=None)
+        res = self.client.get(reverse("airport-async:flight-list"))
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_served_under_asgi(self):
+        """Test the async ORM path through the ASGI handler"""
+        res = await AsyncClient().get(
+            reverse("airport-async:flight-detail", args=[self.flight.id]),
+            headers=bearer(self.user)
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.json()["taken_seats"],
+            [{"Row": 2, "Seat": 3}]
+        )
+
+
+class AsyncReadWorkerThreadTests(TransactionTestCase):
+    """Test requests are handled on worker threads"""
+
+    def test_served_off_the_sync_thread(self):
+        """Test the view runs outside the thread kept for sync code"""
+        user = sample_user()
+        flight = sample_flight()
+        threads = []
+        respond = AsyncReadOnlyView.respond
+
+        def record_thread(view, *args, **kwargs):
+            threads.append(threading.current_thread())
+            return respond(view, *args, **kwargs)
+
+        with mock.patch.object(AsyncReadOnlyView, "respond", record_thread):
+            res = async_to_sync(AsyncClient().get)(
+                reverse("airport-async:flight-list"),
+                headers=bearer(user)
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["results"][0]["id"], flight.id)
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+
+
+@skipUnless(os.getenv("RUN_BENCHMARKS"), "Set RUN_BENCHMARKS=1 to run.")
+@mock.patch.dict(
+    api_settings.DEFAULT_THROTTLE_RATES,
+    {"user": None, "search": None, "order_create": None}
+)
+class AsyncReadBenchmark(TransactionTestCase):
+    """Compare WSGI threads with ASGI tasks at high concurrency"""
+
+    concurrency = 200
+    wsgi_threads = 16
+    query_latency = 0.002
+
+    def setUp(self):
+        cache.clear()
+        self.user = sample_user()
+        route = sample_route(sample_airport(), sample_airport())
+        airplane = sample_airplane()
+        start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        for hours in range(100):
+            sample_flight(
+                route=route,
+                airplane=airplane,
+                departure_time=start + timedelta(hours=hours),
+                arrival_time=start + timedelta(hours=hours + 2),
+            )
+
+    def run_wsgi(self, url):
+        # Time from submission, as for ASGI, so waiting for a free thread
+        # counts towards latency.
+        submitted = time.perf_counter()
+
+        def get(_):
+            res = Client(headers=bearer(self.user)).get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            return time.perf_counter() - submitted
+
+        with ThreadPoolExecutor(self.wsgi_threads) as pool:
+            return list(pool.map(get, range(self.concurrency)))
+
+    async def run_asgi(self, url):
+        client = AsyncClient()
+        headers = bearer(self.user)
+
+        async def get():
+            started = time.perf_counter()
+            res = await client.get(url, headers=headers)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            return time.perf_counter() - started
+
+        return await asyncio.gather(*(get() for _ in range(self.concurrency)))
+
+    def measure(self, label, run):
+        threads = threading.active_count()
+        started = time.perf_counter()
+        timings = sorted(run())
+        elapsed = time.perf_counter() - started
+        print(
+            f"{label}: {self.concurrency / elapsed:.0f} req/s, "
+            f"p50 {timings[len(timings) // 2] * 1000:.0f} ms, "
+            f"p99 {timings[int(len(timings) * 0.99)] * 1000:.0f} ms, "
+            f"+{threading.active_count() - threads} threads"
+        )
+
+    def compare(self):
+        self.measure(
+            f"WSGI ({self.wsgi_threads} threads)",
+            lambda: self.run_wsgi(reverse("airport:flight-list"))
+        )
+        self.measure(
+            "ASGI",
+            lambda: async_to_sync(self.run_asgi)(
+                reverse("airport-async:flight-list")
+            )
+        )
+
+    def test_flight_list(self):
+        print(f"\nFlight list at {self.concurrency} concurrent requests")
+        self.compare()
+
+    def test_flight_list_with_query_latency(self):
+        """Add a database round trip as to a server over the network"""
+        execute = CursorWrapper.execute
+
+        def execute_remotely(cursor, *args, **kwargs):
+            time.sleep(self.query_latency)
+            return execute(cursor, *args, **kwargs)
+
+        print(
+            f"\nFlight list at {self.concurrency} concurrent requests, "
+            f"{self.query_latency * 1000:.0f} ms per query"
+        )
+        with mock.patch.object(CursorWrapper, "execute", execute_remotely):
+            self.compare()
@@ -0,0 +1,220 @@
+import os
+import random
+import threading
+import time
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.db import connections
+from django.test import (
+    TestCase,
+    TransactionTestCase,
+    skipUnlessDBFeature
+)
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from airport.booking import SeatConflict, place_order
+from airport.models import Order, Ticket
+from airport.seat_map import SeatMap, get_seat_map, load_seat_maps
+from airport.serializers import OrderSerializer
+from airport.tests.base_functions import (
+    sample_airplane,
+    sample_flight,
+    sample_ticket,
+    sample_user
+)
+
+ORDER_URL = reverse("airport:order-list")
+
+
+class SeatAllocationTests(TestCase):
+    """Test seats are allocated against the stored tickets"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = sample_user()
+        self.client.force_authenticate(user=self.user)
+        self.flight = sample_flight(
+            airplane=sample_airplane(rows=2, seats_in_row=2)
+        )
+        # Warm the cache so it goes stale once a ticket is sold below.
+        get_seat_map(self.flight)
+
+    def post_tickets(self, *seats):
+        tickets = [
+            {"flight": self.flight.id, "row": row, "seat": seat}
+            if row else {"flight": self.flight.id}
+            for row, seat in seats
+        ]
+        return self.client.post(
+            ORDER_URL,
+            {"tickets": tickets},
+            format="json"
+        )
+
+    def test_conflict_names_seats(self):
+        """Test a seat sold after validation is reported as 409"""
+        sample_ticket(flight=self.flight, row=1, seat=2)
+
+        res = self.post_tickets((1, 1), (1, 2))
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            res.data["seats"],
+            [{"flight": self.flight.id, "row": 1, "seat": 2}]
+        )
+        self.assertEqual(Ticket.objects.count(), 1)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_conflict_from_serializer(self):
+        """Test a seat sold between validation and save raises"""
+        serializer = OrderSerializer(data={
+            "tickets": [{"flight": self.flight.id, "row": 2, "seat": 2}]
+        })
+        self.assertTrue(serializer.is_valid())
+        sample_ticket(flight=self.flight, row=2, seat=2)
+
+        with self.assertRaises(SeatConflict):
+            serializer.save(user=self.user)
+
+    def test_any_seat(self):
+        """Test tickets without a seat get free ones"""
+        sample_ticket(flight=self.flight, row=1, seat=1)
+
+        res = self.post_tickets((None, None), (1, 2), (None, None))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        seats = [(ticket["row"], ticket["seat"])
+                 for ticket in res.data["tickets"]]
+        self.assertEqual(seats, [(1, 2), (2, 1), (2, 2)])
+
+    def test_group_seated_together(self):
+        """Test seatless tickets on one flight are seated side by side"""
+        flight = sample_flight(
+            route=self.flight.route,
+            airplane=sample_airplane(
+                name="Embraer E190",
+                rows=3,
+                seats_in_row=4,
+                airplane_type=self.flight.airplane.airplane_type
+            )
+        )
+        sample_ticket(flight=flight, row=1, seat=2)
+
+        res = self.client.post(
+            ORDER_URL,
+            {"tickets": [{"flight": flight.id}] * 3},
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        seats = [(ticket["row"], ticket["seat"])
+                 for ticket in res.data["tickets"]]
+        self.assertEqual(seats, [(2, 1), (2, 2), (2, 3)])
+
+    def test_row_without_seat(self):
+        """Test a row alone is rejected"""
+        res = self.client.post(
+            ORDER_URL,
+            {"tickets": [{"flight": self.flight.id, "row": 1}]},
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_sold_out(self):
+        """Test more seatless tickets than free seats are rejected"""
+        res = self.post_tickets(*[(None, None)] * 5)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_any_seat_retried_on_collision(self):
+        """Test a colliding insert is retried with another seat"""
+        sample_ticket(flight=self.flight, row=1, seat=1)
+        stale = {self.flight.id: SeatMap(2, 2)}
+        fresh = load_seat_maps([self.flight])
+        with mock.patch(
+            "airport.booking.load_seat_maps",
+            side_effect=[stale, fresh]
+        ) as loader:
+            order = place_order(
+                [{"flight_id": self.flight.id}],
+                user=self.user
+            )
+
+        self.assertEqual(
+            list(order.tickets.values_list("row", "seat")),
+            [(1, 2)]
+        )
+        self.assertEqual(loader.call_count, 2)
+
+
+@skipUnless(os.getenv("RUN_BENCHMARKS"), "Set RUN_BENCHMARKS=1 to run.")
+@skipUnlessDBFeature("has_select_for_update")
+class SeatContentionBenchmark(TransactionTestCase):
+    """Measure orders per second with 50 buyers racing for one flight"""
+
+    buyers = 50
+    orders_per_buyer = 4
+
+    def setUp(self):
+        cache.clear()
+        self.flight = sample_flight(
+            airplane=sample_airplane(rows=40, seats_in_row=6)
+        )
+        self.users = [sample_user() for _ in range(self.buyers)]
+
+    def buy(self, user, seed, results, barrier):
+        rng = random.Random(seed)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        barrier.wait()
+        try:
+            for _ in range(self.orders_per_buyer):
+                ticket = {"flight": self.flight.id}
+                if rng.random() < 0.5:
+                    ticket["row"] = rng.randint(1, 10)
+                    ticket["seat"] = rng.randint(1, 6)
+                res = client.post(
+                    ORDER_URL,
+                    {"tickets": [ticket]},
+                    format="json"
+                )
+                results.append(res.status_code)
+        finally:
+            connections.close_all()
+
+    def test_contention(self):
+        results = []
+        barrier = threading.Barrier(self.buyers)
+        threads = [
+            threading.Thread(
+                target=self.buy,
+                args=(user, seed, results, barrier)
+            )
+            for seed, user in enumerate(self.users)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        created = results.count(status.HTTP_201_CREATED)
+        conflicts = len(results) - created
+        print(
+            f"\nSeat contention: {created / elapsed:.0f} orders/s, "
+            f"{conflicts / len(results):.1%} conflicts "
+            f"({created} sold, {len(results)} attempts)"
+        )
+        self.assertEqual(Ticket.objects.count(), created)
+        self.assertTrue(set(results) <= {
+            status.HTTP_201_CREATED,
+            status.HTTP_400_BAD_REQUEST,
+            status.HTTP_409_CONFLICT,
+        })
@@ -53,7 +53,7 @@ class AuthenticatedCrewTests(TestCase):
         serializer = CrewSerializer(crew, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_create_crew_forbidden(self):
         """Test that regular users cannot create a crew member"""
@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.tests.base_functions import sample_user
+from airport_service.views import database_pool_stats
+
+DB_POOL_URL = reverse("db-pool")
+
+
+def pooled_connection(**stats):
+    """Return a stand-in connection whose pool reports ``stats``"""
+    pool = mock.Mock()
+    pool.get_stats.return_value = stats
+    return SimpleNamespace(pool=pool, settings_dict={"CONN_MAX_AGE": 0})
+
+
+class DatabasePoolStatsTests(SimpleTestCase):
+    """Test summarizing connection pool statistics"""
+
+    def test_pool_utilization_and_wait(self):
+        """Test utilization and average checkout wait are derived"""
+        stats = database_pool_stats(pooled_connection(
+            pool_min=2,
+            pool_max=10,
+            pool_size=6,
+            pool_available=1,
+            requests_waiting=3,
+            requests_num=200,
+            requests_queued=20,
+            requests_wait_ms=500,
+        ))
+
+        self.assertTrue(stats["pooled"])
+        self.assertEqual(stats["in_use"], 5)
+        self.assertEqual(stats["utilization"], 0.5)
+        self.assertEqual(stats["waiting"], 3)
+        self.assertEqual(stats["avg_checkout_wait_ms"], 2.5)
+
+    def test_fresh_pool(self):
+        """Test a pool without checkouts reports no wait"""
+        stats = database_pool_stats(pooled_connection(
+            pool_min=2,
+            pool_max=4,
+            pool_size=2,
+            pool_available=2,
+            requests_waiting=0,
+        ))
+
+        self.assertEqual(stats["utilization"], 0.0)
+        self.assertEqual(stats["avg_checkout_wait_ms"], 0.0)
+
+
+class DatabasePoolViewTests(TestCase):
+    """Test the pool introspection endpoint"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_staff_only(self):
+        """Test regular users cannot read pool statistics"""
+        self.client.force_authenticate(user=sample_user())
+
+        res = self.client.get(DB_POOL_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_lists_databases(self):
+        """Test every database alias is reported"""
+        self.client.force_authenticate(user=sample_user(is_staff=True))
+
+        res = self.client.get(DB_POOL_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data["default"]["pooled"],
+            getattr(connection, "pool", None) is not None
+        )
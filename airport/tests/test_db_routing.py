@@ -0,0 +1,178 @@
+from unittest import mock, skipUnless
+
+from asgiref.sync import iscoroutinefunction
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import OperationalError, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework.reverse import reverse
+
+from airport.models import Flight, Order, Ticket
+from airport.tests.base_functions import sample_flight, sample_user
+from airport_service.db_routing import (
+    ReplicaMiddleware,
+    ReplicaRead,
+    ReplicaRouter,
+    _replica_read,
+    replica_health
+)
+
+REPLICAS = ["replica_1", "replica_2"]
+
+
+@override_settings(REPLICA_DATABASES=REPLICAS, REPLICA_PIN_SECONDS=5)
+class ReplicaRouterTests(SimpleTestCase):
+    """Test choosing databases for reads and writes"""
+
+    def setUp(self):
+        cache.clear()
+        replica_health.ejected = set()
+        replica_health.checked_at = 0.0
+        patcher = mock.patch.object(replica_health, "check")
+        self.check = patcher.start()
+        self.check.return_value = True
+        self.addCleanup(patcher.stop)
+        self.router = ReplicaRouter()
+        self.token = _replica_read.set(ReplicaRead())
+        self.addCleanup(_replica_read.reset, self.token)
+
+    def test_catalog_reads_use_one_replica(self):
+        """Test catalog models read from the same replica per request"""
+        alias = self.router.db_for_read(Flight)
+
+        self.assertIn(alias, REPLICAS)
+        self.assertEqual(self.router.db_for_read(Flight), alias)
+        self.assertEqual(self.router.db_for_read(Order), "default")
+        self.assertEqual(self.router.db_for_read(Ticket), "default")
+
+    def test_reads_after_write_use_primary(self):
+        """Test a write switches the rest of the request to the primary"""
+        self.assertEqual(self.router.db_for_write(Flight), "default")
+
+        self.assertEqual(self.router.db_for_read(Flight), "default")
+
+    def test_unhealthy_replicas_ejected(self):
+        """Test replicas failing the probe are not used"""
+        self.check.side_effect = lambda alias: alias == "replica_2"
+
+        self.assertEqual(self.router.db_for_read(Flight), "replica_2")
+
+        self.check.side_effect = None
+        self.check.return_value = False
+        replica_health.checked_at = 0.0
+        _replica_read.set(ReplicaRead())
+
+        self.assertEqual(self.router.db_for_read(Flight), "default")
+
+    def test_failed_request_ejects_replica(self):
+        """Test a database error on a replica ejects it until next probe"""
+        self.check.side_effect = lambda alias: alias == "replica_1"
+        alias = self.router.db_for_read(Flight)
+        middleware = ReplicaMiddleware(lambda request: HttpResponse())
+
+        middleware.process_exception(None, OperationalError())
+
+        self.assertIn(alias, replica_health.ejected)
+
+    def test_migrations_only_on_primary(self):
+        """Test replicas are never migrated"""
+        self.assertTrue(self.router.allow_migrate("default", "airport"))
+        self.assertFalse(self.router.allow_migrate("replica_1", "airport"))
+
+
+@override_settings(
+    REPLICA_DATABASES=REPLICAS,
+    REPLICA_PIN_SECONDS=5,
+    SHARED_CACHE=True,
+)
+class ReplicaMiddlewareTests(SimpleTestCase):
+    """Test which requests may read from replicas"""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory(headers={"Authorization": "Bearer a"})
+        self.states = []
+
+    def call(self, request, status_code=200):
+        def view(request):
+            self.states.append(_replica_read.get())
+            return HttpResponse(status=status_code)
+
+        return ReplicaMiddleware(view)(request)
+
+    def test_safe_methods_use_replicas(self):
+        """Test GET requests read from replicas and POST ones do not"""
+        self.call(self.factory.get("/"))
+        self.call(self.factory.post("/"), status_code=400)
+        self.call(self.factory.get("/"))
+
+        self.assertIsInstance(self.states[0], ReplicaRead)
+        self.assertIsNone(self.states[1])
+        self.assertIsInstance(self.states[2], ReplicaRead)
+        self.assertIsNone(_replica_read.get())
+
+    def test_read_your_writes(self):
+        """Test a client reads from the primary right after a write"""
+        self.call(self.factory.post("/"))
+        self.call(self.factory.get("/"))
+        self.call(RequestFactory().get("/"))
+
+        self.assertIsNone(self.states[1])
+        self.assertIsInstance(self.states[2], ReplicaRead)
+
+    @override_settings(SHARED_CACHE=False)
+    def test_warns_without_shared_cache(self):
+        """Test per-process caches are flagged, as pins would not hold"""
+        with self.assertLogs("airport_service.db_routing", "WARNING"):
+            ReplicaMiddleware(lambda request: HttpResponse())
+
+    async def test_async_requests(self):
+        """Test async views run without a thread and read their writes"""
+        async def view(request):
+            self.states.append(_replica_read.get())
+            return HttpResponse()
+
+        middleware = ReplicaMiddleware(view)
+        await middleware(self.factory.post("/"))
+        await middleware(self.factory.get("/"))
+        await middleware(RequestFactory().get("/"))
+
+        self.assertTrue(iscoroutinefunction(middleware))
+        self.assertIsNone(self.states[1])
+        self.assertIsInstance(self.states[2], ReplicaRead)
+
+
+@skipUnless(
+    settings.REPLICA_DATABASES,
+    "Set POSTGRES_REPLICA_HOSTS to run against replica aliases."
+)
+class ReplicaRoutingIntegrationTests(TransactionTestCase):
+    """Test catalog endpoints read from a configured replica alias"""
+
+    databases = "__all__"
+
+    def test_flight_list_reads_replica(self):
+        """Test flight queries of a GET request leave the primary"""
+        cache.clear()
+        client = APIClient()
+        client.force_authenticate(user=sample_user())
+        sample_flight()
+        replica = settings.REPLICA_DATABASES[0]
+
+        with mock.patch.object(replica_health, "check", return_value=True):
+            replica_health.checked_at = 0.0
+            with mock.patch(
+                "airport_service.db_routing.random.choice",
+                return_value=replica
+            ), CaptureQueriesContext(connections[replica]) as queries:
+                client.get(reverse("airport:flight-list"))
+
+        self.assertTrue(any(
+            "airport_flight" in query["sql"]
+            for query in queries.captured_queries
+        ))
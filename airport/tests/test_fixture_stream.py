@@ -0,0 +1,178 @@
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from io import StringIO
+from pathlib import Path
+from unittest import skipUnless
+
+from django.conf import settings
+from django.core import serializers
+from django.core.management import CommandError, call_command
+from django.core.serializers.base import DeserializationError
+from django.test import SimpleTestCase, TestCase
+
+from airport.fixture_stream import iter_json_array
+from airport.models import Airport, Flight
+
+FIXTURE = Path(settings.BASE_DIR) / "load_data.json"
+
+
+class JsonArrayReaderTests(SimpleTestCase):
+    """Test decoding a JSON array incrementally"""
+
+    def test_items_split_across_chunks(self):
+        """Test items are decoded whatever the chunk boundaries"""
+        items = [
+            {"text": "[1, 2], {\"a\": 3}", "n": 12345},
+            [], 1.5e10, "x", None, True, 678,
+        ]
+        text = json.dumps(items, indent=2)
+
+        for chunk_size in (1, 3, 7, 1024):
+            self.assertEqual(
+                list(iter_json_array(StringIO(text), chunk_size)),
+                items
+            )
+        self.assertEqual(list(iter_json_array(StringIO(" [ ] "))), [])
+
+    def test_malformed(self):
+        """Test invalid documents raise DeserializationError"""
+        for text in ("", "{}", "[1, 2", "[1 2]", "[1,]", "[{\"a\": }]"):
+            with self.subTest(text=text):
+                with self.assertRaises(DeserializationError):
+                    list(iter_json_array(StringIO(text), 2))
+
+
+class StreamLoaddataTests(TestCase):
+    """Test the streaming fixture loader command"""
+
+    def stream_loaddata(self, *args):
+        out = StringIO()
+        call_command("stream_loaddata", *args, stdout=out)
+        return out.getvalue()
+
+    def test_loads_fixture_like_loaddata(self):
+        """Test every object of the fixture is loaded with its fields"""
+        output = self.stream_loaddata(str(FIXTURE), "--batch-size", "4")
+
+        expected = json.loads(FIXTURE.read_text())
+        self.assertIn(f"Loaded {len(expected)} objects", output)
+        for obj in expected:
+            model = serializers.python._get_model(obj["model"])
+            [loaded] = json.loads(serializers.serialize(
+                "json",
+                model.objects.filter(pk=obj["pk"])
+            ))
+            for name, value in obj["fields"].items():
+                if isinstance(value, list):
+                    value = sorted(value)
+                    loaded["fields"][name].sort()
+                self.assertEqual(
+                    loaded["fields"][name],
+                    value,
+                    f"{obj['model']} {obj['pk']} {name}"
+                )
+
+    def test_reload_updates_rows(self):
+        """Test loading again upserts instead of duplicating"""
+        self.stream_loaddata(str(FIXTURE))
+        flight = Flight.objects.first()
+        crew = list(flight.crew.values_list("id", flat=True))
+        airport = Airport.objects.first()
+        Airport.objects.filter(pk=airport.pk).update(name="Renamed")
+        flight.crew.clear()
+
+        self.stream_loaddata(str(FIXTURE))
+
+        airport.refresh_from_db()
+        self.assertNotEqual(airport.name, "Renamed")
+        self.assertEqual(
+            list(flight.crew.values_list("id", flat=True)),
+            crew
+        )
+        self.assertEqual(
+            Airport.objects.count(),
+            sum(
+                obj["model"] == "airport.airport"
+                for obj in json.loads(FIXTURE.read_text())
+            )
+        )
+
+    def test_broken_reference_rolls_back(self):
+        """Test dangling foreign keys abort the load"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "broken.json"
+            path.write_text(json.dumps([
+                {"model": "airport.airport", "pk": 1,
+                 "fields": {"name": "A", "closest_big_city": "A"}},
+                {"model": "airport.route", "pk": 1,
+                 "fields": {"source": 1, "destination": 99,
+                            "distance": 100}},
+            ]))
+
+            with self.assertRaises(CommandError):
+                self.stream_loaddata(str(path))
+
+        self.assertFalse(Airport.objects.exists())
+
+
+@skipUnless(os.getenv("RUN_BENCHMARKS"), "Set RUN_BENCHMARKS=1 to run.")
+class StreamLoaddataBenchmark(TestCase):
+    """Compare memory and time of loaddata and stream_loaddata"""
+
+    flights_count = 20_000
+
+    def write_fixture(self, path):
+        with path.open("w") as file:
+            file.write("[\n")
+            file.write(json.dumps([
+                {"model": "airport.airplanetype", "pk": 1,
+                 "fields": {"name": "Type"}},
+                {"model": "airport.airplane", "pk": 1,
+                 "fields": {"name": "Plane", "rows": 10,
+                            "seats_in_row": 4, "airplane_type": 1}},
+                {"model": "airport.airport", "pk": 1,
+                 "fields": {"name": "A", "closest_big_city": "A"}},
+                {"model": "airport.airport", "pk": 2,
+                 "fields": {"name": "B", "closest_big_city": "B"}},
+                {"model": "airport.route", "pk": 1,
+                 "fields": {"source": 1, "destination": 2,
+                            "distance": 100}},
+            ])[1:-1])
+            for pk in range(1, self.flights_count + 1):
+                file.write(",\n" + json.dumps({
+                    "model": "airport.flight",
+                    "pk": pk,
+                    "fields": {
+                        "route": 1,
+                        "airplane": 1,
+                        "departure_time": "2030-01-01T08:00:00Z",
+                        "arrival_time": "2030-01-01T10:00:00Z",
+                        "crew": [],
+                    },
+                }))
+            file.write("\n]\n")
+
+    def measure(self, label, command, path):
+        Flight.objects.all().delete()
+        tracemalloc.start()
+        started = time.perf_counter()
+        call_command(command, str(path), stdout=StringIO())
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(
+            f"{label}: {self.flights_count / elapsed:.0f} objects/s, "
+            f"peak {peak / 2 ** 20:.1f} MiB"
+        )
+        self.assertEqual(Flight.objects.count(), self.flights_count)
+
+    def test_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "dump.json"
+            self.write_fixture(path)
+            print(f"\nFixture of {path.stat().st_size / 2 ** 20:.1f} MiB")
+            self.measure("loaddata", "loaddata", path)
+            self.measure("stream_loaddata", "stream_loaddata", path)
@@ -1,3 +1,7 @@
+import os
+import tracemalloc
+from unittest import skipUnless
+
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from rest_framework.test import APIClient
@@ -5,6 +9,7 @@ from rest_framework import status
 from rest_framework.reverse import reverse
 
 from airport.models import Flight
+from airport.pagination import KeysetPagination
 from airport.serializers import (
     FlightListSerializer,
     FlightRetrieveSerializer,
@@ -16,7 +21,8 @@ from airport.tests.base_functions import (
     sample_route,
     sample_airplane,
     sample_user,
-    sample_crew
+    sample_crew,
+    sample_flights_with_tickets
 )
 
 FLIGHT_URL = reverse("airport:flight-list")
@@ -63,11 +69,11 @@ class AuthenticatedFlightTests(TestCase):
         sample_flight(route=route, airplane=airplane)
 
         res = self.client.get(FLIGHT_URL)
-        flights = Flight.objects.all()
+        flights = Flight.objects.with_availability()
         serializer = FlightListSerializer(flights, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_retrieve_flight(self):
         """Test retrieving a specific flight"""
@@ -156,3 +162,53 @@ class AdminFlightTests(TestCase):
         serializer = FlightSerializer(flight)
 
         self.assertEqual(res.data, serializer.data)
+
+
+class FlightListQueryPlanTests(TestCase):
+    """Test flight listing does not load tickets"""
+
+    flights_count = 50
+    tickets_per_flight = 200
+    # One page costs about 90 KB whatever the table size; loading the
+    # tickets of the page alone would take several megabytes.
+    max_peak_memory = 512 * 1024
+
+    @classmethod
+    def setUpTestData(cls):
+        sample_flights_with_tickets(
+            cls.flights_count,
+            cls.tickets_per_flight
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=sample_user())
+
+    def test_list_flights_query_count_and_memory(self):
+        """Test list runs one query and memory does not grow with tickets"""
+        self.client.get(FLIGHT_URL)
+        tracemalloc.start()
+        try:
+            with self.assertNumQueries(1):
+                res = self.client.get(FLIGHT_URL)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            len(res.data["results"]),
+            KeysetPagination.page_size
+        )
+        self.assertEqual(
+            res.data["results"][0]["tickets_sold"],
+            self.tickets_per_flight
+        )
+        self.assertLess(peak, self.max_peak_memory)
+
+
+@skipUnless(os.getenv("RUN_BENCHMARKS"), "Set RUN_BENCHMARKS=1 to run.")
+class FlightListQueryPlanBenchmark(FlightListQueryPlanTests):
+    """Run the flight list query plan test on a production-size table"""
+
+    flights_count = 10_000
@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta, timezone
+
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from airport.models import Flight
+from airport.tests.base_functions import (
+    sample_airplane,
+    sample_flight,
+    sample_route,
+    sample_user
+)
+
+FLIGHT_URL = reverse("airport:flight-list")
+START = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+
+class FlightDateFilterTests(TestCase):
+    """Test filtering flights by departure and arrival dates"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=sample_user())
+        route = sample_route()
+        airplane = sample_airplane()
+        self.flights = [
+            sample_flight(
+                route=route,
+                airplane=airplane,
+                departure_time=START + timedelta(days=day, hours=23),
+                arrival_time=START + timedelta(days=day + 1, hours=2),
+            )
+            for day in range(4)
+        ]
+
+    def get_ids(self, **params):
+        res = self.client.get(FLIGHT_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [flight["id"] for flight in res.data["results"]]
+
+    def test_single_day(self):
+        """Test a single day covers the whole day and nothing after it"""
+        self.assertEqual(
+            self.get_ids(departure_date="02-03-2025"),
+            [self.flights[1].id]
+        )
+        self.assertEqual(
+            self.get_ids(arrival_date="02-03-2025"),
+            [self.flights[0].id]
+        )
+
+    def test_date_range(self):
+        """Test inclusive from/to date ranges"""
+        self.assertEqual(
+            self.get_ids(
+                departure_date_from="02-03-2025",
+                departure_date_to="03-03-2025"
+            ),
+            [self.flights[1].id, self.flights[2].id]
+        )
+        self.assertEqual(
+            self.get_ids(arrival_date_from="04-03-2025"),
+            [self.flights[2].id, self.flights[3].id]
+        )
+
+    def test_invalid_range(self):
+        """Test reversed or malformed ranges are rejected"""
+        for params in (
+            {"departure_date_from": "05-03-2025",
+             "departure_date_to": "01-03-2025"},
+            {"arrival_date_to": "2025-03-01"},
+        ):
+            res = self.client.get(FLIGHT_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class FlightSearchIndexTests(TestCase):
+    """Test flight search queries are served by indexes"""
+
+    def explain(self, queryset):
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+    def test_departure_range_uses_index(self):
+        """Test a departure range scans flight_departure_idx"""
+        plan = self.explain(Flight.objects.filter(
+            departure_time__gte=START,
+            departure_time__lt=START + timedelta(days=1),
+        ))
+
+        self.assertIn("flight_departure_idx", plan)
+
+    def test_route_and_departure_use_composite_index(self):
+        """Test route searches use the (route, departure_time) index"""
+        plan = self.explain(Flight.objects.filter(
+            route__source_id=1,
+            route__destination_id=2,
+            departure_time__gte=START,
+            departure_time__lt=START + timedelta(days=1),
+        ))
+
+        self.assertIn("flight_route_departure_idx", plan)
+
+    def test_arrival_range_uses_index(self):
+        """Test an arrival range scans flight_arrival_idx"""
+        plan = self.explain(Flight.objects.filter(
+            arrival_time__gte=START,
+            arrival_time__lt=START + timedelta(days=1),
+        ))
+
+        self.assertIn("flight_arrival_idx", plan)
@@ -0,0 +1,173 @@
+import io
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from airport_service import health
+from airport_service.schema import CachedSchemaGenerator
+
+HEALTHZ_URL = reverse("healthz")
+READYZ_URL = reverse("readyz")
+
+
+class HealthTests(TestCase):
+    """Test the liveness and readiness endpoints"""
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(health, "warmup", health.Warmup())
+        self.warmup = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.warmup.state = health.Warmup.DONE
+
+    def test_healthz(self):
+        """Test liveness does not depend on anything"""
+        res = self.client.get(HEALTHZ_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), {"status": "ok"})
+
+    def test_ready(self):
+        """Test readiness reports every check"""
+        res = self.client.get(READYZ_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        checks = res.json()["checks"]
+        self.assertEqual(
+            set(checks),
+            {"warmup", "database", "migrations", "cache"}
+        )
+        self.assertIn("latency_ms", checks["database"])
+        self.assertEqual(checks["migrations"]["pending"], 0)
+        self.assertIn("no-cache", res["Cache-Control"])
+
+    def test_not_ready_while_warming_up(self):
+        """Test workers start the warmup and report unready until done"""
+        self.warmup.state = health.Warmup.PENDING
+
+        with mock.patch("threading.Thread") as thread:
+            res = self.client.get(READYZ_URL)
+
+        thread.return_value.start.assert_called_once()
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(res.json()["checks"]["warmup"]["state"], "running")
+
+    @mock.patch.object(health, "_migrations_applied", False)
+    def test_not_ready_with_pending_migrations(self):
+        """Test workers wait for the schema to be migrated"""
+        with mock.patch.object(
+            health.MigrationExecutor,
+            "migration_plan",
+            return_value=[("migration", False)],
+        ):
+            res = self.client.get(READYZ_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(res.json()["checks"]["migrations"]["pending"], 1)
+
+    def test_not_ready_without_cache(self):
+        """Test cache errors are reported"""
+        with mock.patch.object(
+            health.cache,
+            "set",
+            side_effect=ConnectionError("Connection refused"),
+        ):
+            res = self.client.get(READYZ_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(
+            res.json()["checks"]["cache"]["error"],
+            "Connection refused"
+        )
+
+    @override_settings(READINESS_DB_MAX_LATENCY_MS=0)
+    def test_not_ready_with_slow_database(self):
+        """Test slow database round trips take workers out of rotation"""
+        res = self.client.get(READYZ_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(res.json()["checks"]["database"]["ok"])
+
+
+class WarmupTests(TestCase):
+    """Test loading caches before taking traffic"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_run_preloads_schema(self):
+        """Test the schema is generated once and then reused"""
+        warmup = health.Warmup()
+        with mock.patch.dict(CachedSchemaGenerator._schemas, clear=True):
+            warmup.run()
+
+            self.assertEqual(warmup.state, health.Warmup.DONE)
+            with mock.patch(
+                "drf_spectacular.generators.SchemaGenerator.get_schema"
+            ) as get_schema:
+                res = self.client.get(reverse("schema"))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        get_schema.assert_not_called()
+
+    def test_failure_is_retried(self):
+        """Test a failed warmup can be started again"""
+        warmup = health.Warmup()
+        with mock.patch.object(
+            health,
+            "get_reference_data",
+            side_effect=OperationalError("Database is starting up"),
+        ):
+            warmup.run()
+
+        self.assertEqual(warmup.report()["error"], "Database is starting up")
+        with mock.patch("threading.Thread"):
+            warmup.start()
+        self.assertEqual(warmup.state, health.Warmup.RUNNING)
+
+
+@mock.patch("time.sleep")
+@mock.patch("airport.management.commands.wait_for_db.connections")
+class WaitForDbTests(TestCase):
+    """Test waiting for the database"""
+
+    def test_retries_with_backoff(self, connections, sleep):
+        """Test waits grow exponentially, with jitter, until connected"""
+        connection = connections.__getitem__.return_value
+        connection.ensure_connection.side_effect = [
+            OperationalError("refused")
+        ] * 4 + [None]
+
+        with mock.patch("random.uniform", side_effect=lambda a, b: b):
+            call_command(
+                "wait_for_db",
+                stdout=io.StringIO(),
+                stderr=io.StringIO(),
+            )
+
+        self.assertEqual(
+            [call.args[0] for call in sleep.call_args_list],
+            [0.1, 0.2, 0.4, 0.8]
+        )
+
+    def test_gives_up_at_deadline(self, connections, sleep):
+        """Test the command fails once the timeout is spent"""
+        connection = connections.__getitem__.return_value
+        connection.ensure_connection.side_effect = (
+            OperationalError("refused")
+        )
+
+        with self.assertRaisesMessage(CommandError, "refused"):
+            call_command(
+                "wait_for_db",
+                "--timeout=0",
+                stdout=io.StringIO(),
+                stderr=io.StringIO(),
+            )
+
+        sleep.assert_not_called()
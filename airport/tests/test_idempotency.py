@@ -0,0 +1,156 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from airport.idempotency import purge_idempotency_keys
+from airport.models import IdempotencyKey, Order, Ticket
+from airport.tests.base_functions import sample_flight, sample_user
+
+ORDER_URL = reverse("airport:order-list")
+
+
+class IdempotentOrderTests(TestCase):
+    """Test retried order creation with an Idempotency-Key header"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = sample_user()
+        self.client.force_authenticate(user=self.user)
+        self.flight = sample_flight()
+
+    def post_order(self, key, row=1, seat=1):
+        return self.client.post(
+            ORDER_URL,
+            {"tickets": [
+                {"flight": self.flight.id, "row": row, "seat": seat}
+            ]},
+            format="json",
+            headers={"Idempotency-Key": key},
+        )
+
+    def test_retry_replays_response(self):
+        """Test a repeated request returns the first response"""
+        first = self.post_order("order-1")
+        with CaptureQueriesContext(connection) as queries:
+            retry = self.post_order("order-1")
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertFalse(any(
+            "airport_ticket" in query["sql"] or "airport_order" in query["sql"]
+            for query in queries.captured_queries
+        ))
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_key_reused_for_other_request(self):
+        """Test a key cannot be reused with a different body"""
+        self.post_order("order-1")
+
+        res = self.post_order("order-1", seat=2)
+
+        self.assertEqual(
+            res.status_code,
+            status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_request_in_progress(self):
+        """Test a retry while the first attempt runs is rejected"""
+        IdempotencyKey.objects.create(
+            user=self.user,
+            key="order-1",
+            request_hash="pending",
+        )
+        with mock.patch(
+            "airport.idempotency.request_hash",
+            return_value="pending"
+        ):
+            res = self.post_order("order-1")
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(Order.objects.exists())
+
+    def test_abandoned_claim_taken_over(self):
+        """Test a claim left in progress past its lease is retried"""
+        IdempotencyKey.objects.create(
+            user=self.user,
+            key="order-1",
+            request_hash="pending",
+        )
+        IdempotencyKey.objects.update(
+            created_at=timezone.now() - timedelta(minutes=2)
+        )
+        with mock.patch(
+            "airport.idempotency.request_hash",
+            return_value="pending"
+        ):
+            res = self.post_order("order-1")
+            retry = self.post_order("order-1")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_failed_request_releases_key(self):
+        """Test a rejected request can be retried with the same key"""
+        res = self.post_order("order-1", row=100)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.post_order("order-1")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_keys_scoped_per_user(self):
+        """Test the same key from another user is a new request"""
+        self.post_order("order-1")
+        self.client.force_authenticate(user=sample_user())
+
+        res = self.post_order("order-1", seat=2)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_expired_key_is_reclaimed(self):
+        """Test a key past its TTL starts a new request"""
+        self.post_order("order-1")
+        IdempotencyKey.objects.update(
+            created_at=timezone.now() - timedelta(days=2)
+        )
+
+        res = self.post_order("order-1", seat=2)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn("Idempotent-Replayed", res)
+
+    def test_purge_expired_and_oldest(self):
+        """Test purging drops expired keys and caps the store size"""
+        now = timezone.now()
+        for minutes in (0, 1, 2, 3 * 24 * 60):
+            record = IdempotencyKey.objects.create(
+                user=self.user,
+                key=f"key-{minutes}",
+                request_hash="hash",
+            )
+            record.created_at = now - timedelta(minutes=minutes)
+            record.save()
+
+        with mock.patch("airport.idempotency.MAX_IDEMPOTENCY_KEYS", 2):
+            self.assertEqual(purge_idempotency_keys(force=True), 2)
+
+        self.assertEqual(
+            sorted(IdempotencyKey.objects.values_list("key", flat=True)),
+            ["key-0", "key-1"]
+        )
+        call_command("purge_idempotency_keys", stdout=mock.Mock())
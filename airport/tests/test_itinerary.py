@@ -0,0 +1,315 @@
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from unittest import skipUnless
+
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from airport import itinerary
+from airport.itinerary import (
+    FlightIndex,
+    get_flight_index,
+    invalidate_flight_index,
+    mark_flight_index_stale,
+    rank_itineraries
+)
+from airport.tests.base_functions import (
+    sample_airplane,
+    sample_airport,
+    sample_flight,
+    sample_order,
+    sample_route,
+    sample_ticket,
+    sample_user
+)
+
+ITINERARY_URL = reverse("airport:flight-itineraries")
+DAY = datetime(2030, 5, 1, tzinfo=timezone.utc)
+
+
+def at(hours, minutes=0):
+    """Return a time on the search day"""
+    return DAY + timedelta(hours=hours, minutes=minutes)
+
+
+class FlightIndexTests(SimpleTestCase):
+    """Test the in-memory itinerary search"""
+
+    def setUp(self):
+        # Airports: 1 -> 2 -> 3, 1 -> 3 directly, 2 -> 1 back.
+        routes = [
+            (10, 1, 2, 500),
+            (20, 2, 3, 400),
+            (30, 1, 3, 1200),
+            (40, 2, 1, 500),
+        ]
+        flights = [
+            (100, 10, at(8), at(9)),
+            (101, 20, at(10), at(11)),
+            (102, 20, at(9, 20), at(10, 20)),
+            (103, 20, at(20), at(21)),
+            (104, 30, at(7), at(11, 30)),
+            (105, 40, at(10), at(11)),
+            (106, 10, at(30), at(31)),
+        ]
+        self.index = FlightIndex(routes, flights)
+
+    def search(self, **kwargs):
+        return self.index.search(1, 3, DAY, DAY + timedelta(days=1), **kwargs)
+
+    def test_direct_and_connecting_journeys(self):
+        """Test journeys respect the layover window"""
+        journeys = {tuple(it.flight_ids) for it in self.search()}
+
+        self.assertEqual(journeys, {(104,), (100, 101)})
+
+    def test_max_legs(self):
+        """Test limiting the number of legs"""
+        journeys = [it.flight_ids for it in self.search(max_legs=1)]
+
+        self.assertEqual(journeys, [[104]])
+
+    def test_layover_window(self):
+        """Test a wider window admits later connections"""
+        journeys = {
+            tuple(it.flight_ids)
+            for it in self.search(
+                min_layover=timedelta(minutes=10),
+                max_layover=timedelta(hours=12)
+            )
+        }
+
+        self.assertEqual(
+            journeys,
+            {(104,), (100, 101), (100, 102), (100, 103)}
+        )
+
+    def test_ranking(self):
+        """Test ranking by duration and by distance"""
+        itineraries = self.search()
+
+        by_duration = rank_itineraries(itineraries, "duration")
+        by_distance = rank_itineraries(itineraries, "distance")
+
+        self.assertEqual(by_duration[0].flight_ids, [100, 101])
+        self.assertEqual(by_distance[0].flight_ids, [100, 101])
+        self.assertEqual(by_duration[0].distance, 900)
+
+    def test_candidate_cap_keeps_best(self):
+        """Test the cap drops the worst journeys, not the last found"""
+        index = FlightIndex(
+            [(10, 1, 2, 500), (20, 2, 3, 500), (30, 1, 3, 1200)],
+            [
+                (100, 10, at(8), at(9)),
+                (101, 20, at(10), at(14)),
+                (102, 30, at(9), at(10)),
+            ],
+        )
+
+        itineraries = index.search(
+            1, 3, DAY, DAY + timedelta(days=1), max_candidates=1
+        )
+
+        self.assertEqual([it.flight_ids for it in itineraries], [[102]])
+
+    def test_add_and_remove_flights(self):
+        """Test flights are inserted, moved and removed in place"""
+        self.index.add(107, 30, at(12), at(13))
+        self.index.add(104, 30, at(16), at(20))
+        self.index.remove(100)
+
+        journeys = [it.flight_ids for it in self.search()]
+
+        self.assertEqual(journeys, [[107], [104]])
+
+
+class ItineraryApiTests(TestCase):
+    """Test the itinerary search endpoint"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=sample_user())
+        self.kyiv = sample_airport(name="KBP", closest_big_city="Kyiv")
+        self.warsaw = sample_airport(name="WAW", closest_big_city="Warsaw")
+        self.lisbon = sample_airport(name="LIS", closest_big_city="Lisbon")
+        self.airplane = sample_airplane(rows=1, seats_in_row=2)
+        self.first_leg = sample_flight(
+            route=sample_route(self.kyiv, self.warsaw, distance=700),
+            airplane=self.airplane,
+            departure_time=at(8),
+            arrival_time=at(10),
+        )
+        self.second_leg = sample_flight(
+            route=sample_route(self.warsaw, self.lisbon, distance=2700),
+            airplane=self.airplane,
+            departure_time=at(11),
+            arrival_time=at(15),
+        )
+        # The flights are never committed, so the index cannot learn
+        # about them; make the next search build it from the database.
+        invalidate_flight_index()
+
+    def get_itineraries(self, **params):
+        params = {
+            "source": self.kyiv.id,
+            "destination": self.lisbon.id,
+            "departure_date": "01-05-2030",
+            **params,
+        }
+        return self.client.get(ITINERARY_URL, params)
+
+    def test_connecting_itinerary(self):
+        """Test a two-leg journey is returned with totals"""
+        res = self.get_itineraries()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 1)
+        self.assertEqual(
+            [leg["id"] for leg in res.data[0]["legs"]],
+            [self.first_leg.id, self.second_leg.id]
+        )
+        self.assertEqual(res.data[0]["total_duration"], 7 * 60)
+        self.assertEqual(res.data[0]["total_distance"], 3400)
+
+    def test_full_flights_excluded(self):
+        """Test journeys without enough free seats are skipped"""
+        order = sample_order()
+        sample_ticket(flight=self.second_leg, order=order, row=1, seat=1)
+
+        self.assertEqual(len(self.get_itineraries(passengers=1).data), 1)
+        self.assertEqual(len(self.get_itineraries(passengers=2).data), 0)
+
+    def test_invalid_parameters(self):
+        """Test malformed search parameters are rejected"""
+        for params in (
+            {"departure_date": "2030-05-01"},
+            {"max_legs": 4},
+            {"sort": "price"},
+            {"min_layover": 120, "max_layover": 60},
+        ):
+            res = self.get_itineraries(**params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class FlightIndexCacheTests(TestCase):
+    """Test keeping the process-wide index current"""
+
+    def setUp(self):
+        self.route = sample_route()
+        self.airplane = sample_airplane()
+        invalidate_flight_index()
+
+    def search(self):
+        return get_flight_index().search(
+            self.route.source_id,
+            self.route.destination_id,
+            DAY,
+            DAY + timedelta(days=1)
+        )
+
+    def test_flight_changes_applied_in_place(self):
+        """Test committed flights update the index without a rebuild"""
+        index = get_flight_index()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            flight = sample_flight(
+                route=self.route,
+                airplane=self.airplane,
+                departure_time=at(8),
+                arrival_time=at(10),
+            )
+        self.assertEqual(
+            [it.flight_ids for it in self.search()],
+            [[flight.id]]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            flight.delete()
+        self.assertEqual(self.search(), [])
+        self.assertIs(get_flight_index(), index)
+
+    def test_stale_index_served_while_rebuilding(self):
+        """Test a stale index answers while another request rebuilds it"""
+        index = get_flight_index()
+        mark_flight_index_stale()
+
+        with itinerary._build_lock:
+            self.assertIs(get_flight_index(), index)
+
+        self.assertIsNot(get_flight_index(), index)
+
+
+@skipUnless(os.getenv("RUN_BENCHMARKS"), "Set RUN_BENCHMARKS=1 to run.")
+class FlightIndexBenchmark(SimpleTestCase):
+    """Search a 2k airport, 100k flight hub network within 50 ms"""
+
+    airports_count = 2000
+    hubs_count = 50
+    hubs_per_airport = 3
+    flights_count = 100_000
+    days = 2
+    searches = 200
+
+    def build_index(self, rng):
+        hubs = range(self.hubs_count)
+        connections = {
+            (source, destination)
+            for source in hubs
+            for destination in hubs
+            if source != destination
+        }
+        for airport in range(self.hubs_count, self.airports_count):
+            for hub in rng.sample(hubs, self.hubs_per_airport):
+                connections |= {(airport, hub), (hub, airport)}
+        routes = [
+            (route_id, source, destination, rng.randrange(300, 3000))
+            for route_id, (source, destination) in enumerate(connections)
+        ]
+
+        flights = []
+        for flight_id in range(self.flights_count):
+            departure = DAY + timedelta(
+                minutes=rng.randrange(self.days * 24 * 60)
+            )
+            flights.append((
+                flight_id,
+                rng.randrange(len(routes)),
+                departure,
+                departure + timedelta(minutes=rng.randrange(60, 600)),
+            ))
+        return FlightIndex(routes, flights)
+
+    def test_search_latency(self):
+        rng = random.Random(42)
+        index = self.build_index(rng)
+
+        timings = []
+        found = 0
+        for _ in range(self.searches):
+            source, destination = rng.sample(
+                range(self.hubs_count, self.airports_count),
+                2
+            )
+            started = time.perf_counter()
+            itineraries = rank_itineraries(
+                index.search(
+                    source,
+                    destination,
+                    DAY,
+                    DAY + timedelta(days=1)
+                )
+            )
+            timings.append(time.perf_counter() - started)
+            found += len(itineraries)
+
+        timings.sort()
+        print(
+            f"\nItinerary search: {found / self.searches:.1f} results, "
+            f"median {timings[len(timings) // 2] * 1000:.2f} ms, "
+            f"max {timings[-1] * 1000:.2f} ms"
+        )
+        self.assertLess(timings[-1], 0.05)
@@ -0,0 +1,217 @@
+import io
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from airport.models import Airport, MediaBlob
+from airport.tests.base_functions import sample_airport
+
+
+def upload_image_url(airport_id):
+    """Return the airport image upload URL"""
+    return reverse("airport:airport-upload-image", args=[airport_id])
+
+
+def media_url(name):
+    """Return the URL serving a media file"""
+    return reverse("media", args=[name])
+
+
+def image_file(color="red"):
+    """Return an uploadable JPEG of one color"""
+    buffer = io.BytesIO()
+    Image.new("RGB", (300, 200), color).save(buffer, "JPEG")
+    return SimpleUploadedFile("photo.jpg", buffer.getvalue())
+
+
+class MediaRootTestCase(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root.name,
+            IMAGE_PROCESSING_EAGER=True,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+
+class ContentAddressedImageTests(MediaRootTestCase):
+    """Test airport images are stored once per content"""
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                email="admin@admin.admin",
+                password="adminpassword",
+            )
+        )
+        self.airports = [
+            sample_airport(name="Boryspil"),
+            sample_airport(name="Zhuliany"),
+        ]
+
+    def upload(self, airport, file):
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                upload_image_url(airport.id),
+                {"image": file},
+                format="multipart",
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        airport.refresh_from_db()
+
+    def test_same_content_shares_blob(self):
+        """Test uploading the same photo twice stores it once"""
+        for airport in self.airports:
+            self.upload(airport, image_file())
+
+        first, second = self.airports
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertEqual(first.image_variants, second.image_variants)
+        self.assertEqual(
+            MediaBlob.objects.get(name=first.image.name).references,
+            2
+        )
+
+    def test_blob_deleted_with_last_reference(self):
+        """Test files are deleted once no airport uses them"""
+        for airport in self.airports:
+            self.upload(airport, image_file())
+        first, second = self.airports
+        name = first.image.name
+        variant = first.image_variants["small"]["files"]["webp"]
+
+        self.upload(first, image_file("blue"))
+        self.assertTrue(default_storage.exists(name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+
+        self.assertFalse(MediaBlob.objects.filter(name=name).exists())
+        self.assertFalse(default_storage.exists(name))
+        self.assertFalse(default_storage.exists(variant))
+
+    def test_untracked_files_kept(self):
+        """Test images stored before blobs were counted are not deleted"""
+        name = default_storage.save(
+            "upload/airports/old.jpg",
+            ContentFile(b"old")
+        )
+        Airport.objects.filter(pk=self.airports[0].pk).update(image=name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Airport.objects.get(pk=self.airports[0].pk).delete()
+
+        self.assertTrue(default_storage.exists(name))
+
+
+class ServeMediaTests(MediaRootTestCase):
+    """Test serving media files"""
+
+    def setUp(self):
+        super().setUp()
+        self.name = default_storage.save(
+            "upload/file.txt",
+            ContentFile(b"0123456789")
+        )
+        self.url = media_url(self.name)
+
+    def test_serves_file_with_validators(self):
+        """Test files are sent with ETag and Last-Modified"""
+        res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(res.streaming_content), b"0123456789")
+        self.assertEqual(res["Content-Type"], "text/plain")
+        self.assertEqual(res["Accept-Ranges"], "bytes")
+        self.assertIn("ETag", res)
+        self.assertIn("Last-Modified", res)
+
+    def test_not_modified(self):
+        """Test matching validators get an empty 304"""
+        etag = self.client.get(self.url)["ETag"]
+
+        res = self.client.get(self.url, headers={"If-None-Match": etag})
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_byte_ranges(self):
+        """Test single byte ranges are served partially"""
+        cases = {
+            "bytes=2-5": (b"2345", "bytes 2-5/10"),
+            "bytes=7-": (b"789", "bytes 7-9/10"),
+            "bytes=-3": (b"789", "bytes 7-9/10"),
+            "bytes=8-100": (b"89", "bytes 8-9/10"),
+        }
+        for header, (content, content_range) in cases.items():
+            with self.subTest(header):
+                res = self.client.get(self.url, headers={"Range": header})
+
+                self.assertEqual(
+                    res.status_code,
+                    status.HTTP_206_PARTIAL_CONTENT
+                )
+                self.assertEqual(b"".join(res.streaming_content), content)
+                self.assertEqual(res["Content-Range"], content_range)
+                self.assertEqual(res["Content-Length"], str(len(content)))
+
+    def test_unsatisfiable_range(self):
+        """Test ranges past the end are rejected"""
+        res = self.client.get(self.url, headers={"Range": "bytes=10-"})
+
+        self.assertEqual(
+            res.status_code,
+            status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+        )
+        self.assertEqual(res["Content-Range"], "bytes */10")
+
+    def test_stale_if_range_sends_whole_file(self):
+        """Test a range for another version of the file is ignored"""
+        res = self.client.get(
+            self.url,
+            headers={"Range": "bytes=2-5", "If-Range": '"stale"'},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    @override_settings(MEDIA_OFFLOAD="x-accel-redirect")
+    def test_accel_redirect(self):
+        """Test nginx is told to send the file"""
+        res = self.client.get(self.url)
+
+        self.assertEqual(
+            res["X-Accel-Redirect"],
+            f"/protected-media/{self.name}"
+        )
+        self.assertEqual(res.content, b"")
+
+    @override_settings(MEDIA_OFFLOAD="x-sendfile")
+    def test_sendfile(self):
+        """Test the web server is given the file path"""
+        res = self.client.get(self.url)
+
+        self.assertEqual(res["X-Sendfile"], default_storage.path(self.name))
+        self.assertEqual(res.content, b"")
+
+    def test_missing_file(self):
+        """Test missing files are not found"""
+        res = self.client.get(media_url("upload/missing.txt"))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_outside_media_root(self):
+        """Test paths cannot escape the media root"""
+        res = self.client.get(media_url("../settings.py"))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,9 +1,12 @@
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework import status
 from rest_framework.reverse import reverse
 
-from airport.models import Order
+from airport.models import Order, Ticket
 from airport.serializers import (
     OrderListSerializer,
     OrderRetrieveSerializer,
@@ -12,7 +15,11 @@ from airport.serializers import (
 from airport.tests.base_functions import (
     sample_order,
     sample_user,
-    sample_ticket
+    sample_ticket,
+    sample_flight,
+    sample_airplane,
+    sample_route,
+    sample_airport
 )
 
 ORDER_URL = reverse("airport:order-list")
@@ -94,3 +101,87 @@ class RetrieveOrderTest(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
+
+
+class BatchedOrderCreationTests(TestCase):
+    """Test order creation validates and writes tickets in batches"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = sample_user()
+        self.client.force_authenticate(user=self.user)
+        self.flight = sample_flight()
+        self.return_flight = sample_flight(
+            route=sample_route(
+                source=sample_airport(),
+                destination=sample_airport()
+            ),
+            airplane=sample_airplane(
+                name="Airbus A350",
+                airplane_type=self.flight.airplane.airplane_type
+            )
+        )
+
+    def order_payload(self, seats):
+        return {
+            "tickets": [
+                {"row": row, "seat": seat, "flight": flight.id}
+                for flight, row, seat in seats
+            ]
+        }
+
+    def count_queries(self, seats):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.post(
+                ORDER_URL,
+                self.order_payload(seats),
+                format="json"
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return len(queries)
+
+    def test_group_booking_constant_queries(self):
+        """Test a 9-passenger booking takes as many queries as a single"""
+        single = self.count_queries([(self.flight, 1, 1)])
+        group = self.count_queries(
+            [(self.flight, 2, seat) for seat in range(1, 6)]
+            + [(self.return_flight, 2, seat) for seat in range(1, 5)]
+        )
+
+        self.assertEqual(group, single)
+        self.assertEqual(Ticket.objects.count(), 10)
+
+    def test_duplicate_seat_in_request(self):
+        """Test the same seat twice in one order is rejected"""
+        res = self.client.post(
+            ORDER_URL,
+            self.order_payload([(self.flight, 4, 4), (self.flight, 4, 4)]),
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data["tickets"][0], {})
+        self.assertIn("seat", res.data["tickets"][1])
+        self.assertFalse(Order.objects.exists())
+
+    def test_unknown_flight(self):
+        """Test a ticket for a missing flight is rejected"""
+        payload = {"tickets": [{"row": 1, "seat": 1, "flight": 10 ** 6}]}
+
+        res = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("flight", res.data["tickets"][0])
+
+    def test_seat_outside_cabin(self):
+        """Test rows and seats are validated against the airplane"""
+        res = self.client.post(
+            ORDER_URL,
+            self.order_payload([(self.flight, 31, 1)]),
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("row", res.data["tickets"][0])
@@ -0,0 +1,254 @@
+import io
+import os
+import time
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from airport.models import Order, OrderJob, Ticket
+from airport.order_queue import claim_batch, drain_queue, enqueue_order
+from airport.tests.base_functions import (
+    sample_airplane,
+    sample_airport,
+    sample_flight,
+    sample_route,
+    sample_user
+)
+
+ORDER_URL = reverse("airport:order-list")
+
+
+class AsyncOrderIntakeTests(TestCase):
+    """Test queued order creation"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = sample_user()
+        self.client.force_authenticate(user=self.user)
+        self.flight = sample_flight()
+
+    def payload(self, seat=1):
+        return {
+            "tickets": [{"flight": self.flight.id, "row": 1, "seat": seat}]
+        }
+
+    def post_order(self, seat=1):
+        return self.client.post(
+            ORDER_URL,
+            self.payload(seat),
+            format="json",
+            headers={"Prefer": "respond-async"},
+        )
+
+    def test_order_queued_and_processed(self):
+        """Test an async order is accepted, then placed by a worker"""
+        res = self.post_order()
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res.data["status"], OrderJob.Status.PENDING)
+        self.assertEqual(res["Location"], res.data["status_url"])
+        self.assertFalse(Order.objects.exists())
+
+        self.assertEqual(drain_queue(), 1)
+
+        job = self.client.get(res.data["status_url"]).data
+        self.assertEqual(job["status"], OrderJob.Status.DONE)
+        order = Order.objects.get(id=job["order"])
+        self.assertEqual(order.user, self.user)
+        self.assertEqual(order.tickets.count(), 1)
+
+    @override_settings(ORDER_INTAKE_ASYNC=True)
+    def test_async_by_default(self):
+        """Test the setting queues orders without a Prefer header"""
+        res = self.client.post(ORDER_URL, self.payload(), format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+
+    def test_invalid_order_not_queued(self):
+        """Test validation still happens before queueing"""
+        res = self.post_order(seat=100)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(OrderJob.objects.exists())
+
+    def test_conflicting_job_fails_alone(self):
+        """Test a seat conflict fails one job and keeps the others"""
+        first = self.post_order().data
+        second = self.post_order().data
+        third = self.post_order(seat=2).data
+
+        drain_queue()
+
+        statuses = dict(OrderJob.objects.values_list("id", "status"))
+        self.assertEqual(statuses, {
+            first["id"]: OrderJob.Status.DONE,
+            second["id"]: OrderJob.Status.FAILED,
+            third["id"]: OrderJob.Status.DONE,
+        })
+        self.assertEqual(
+            OrderJob.objects.get(id=second["id"]).error["seats"],
+            [{"flight": self.flight.id, "row": 1, "seat": 1}]
+        )
+        self.assertEqual(Ticket.objects.count(), 2)
+
+    def test_batches_grouped_by_flight(self):
+        """Test a claimed batch only holds jobs of one flight"""
+        other = sample_flight(
+            route=sample_route(sample_airport(), sample_airport()),
+            airplane=self.flight.airplane
+        )
+        for flight in (self.flight, other, self.flight):
+            enqueue_order(
+                self.user,
+                [{"flight_id": flight.id, "row": 1, "seat": 1}]
+            )
+
+        batch = claim_batch("worker")
+
+        self.assertEqual(
+            [job.flight_id for job in batch],
+            [self.flight.id, self.flight.id]
+        )
+        self.assertEqual(claim_batch("worker")[0].flight_id, other.id)
+        self.assertEqual(claim_batch("worker"), [])
+
+    def test_job_visible_to_owner_only(self):
+        """Test users cannot read the jobs of others"""
+        url = self.post_order().data["status_url"]
+        self.client.force_authenticate(user=sample_user())
+
+        res = self.client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@mock.patch("airport.management.commands.process_order_jobs.connection")
+@mock.patch(
+    "airport.management.commands.process_order_jobs.backoff",
+    return_value=0,
+)
+class ProcessOrderJobsCommandTests(TestCase):
+    """Test the order worker pool survives errors"""
+
+    def run_workers(self, *args):
+        out = io.StringIO()
+        call_command(
+            "process_order_jobs",
+            "--workers=1",
+            "--once",
+            *args,
+            stdout=out,
+        )
+        return out.getvalue()
+
+    @mock.patch("airport.management.commands.process_order_jobs.claim_batch")
+    def test_batch_errors_retried(self, claim, backoff, connection):
+        """Test a database error does not stop the worker"""
+        claim.side_effect = [OperationalError("server closed"), []]
+
+        with self.assertLogs(
+            "airport.management.commands.process_order_jobs",
+            "ERROR"
+        ):
+            out = self.run_workers()
+
+        self.assertEqual(claim.call_count, 2)
+        self.assertIn("Processed 0 order jobs.", out)
+
+    @mock.patch(
+        "airport.management.commands.process_order_jobs.claim_batch",
+        side_effect=SystemExit,
+    )
+    def test_dead_worker_fails_command(self, claim, backoff, connection):
+        """Test the command exits with an error when a worker dies"""
+        with self.assertRaises(CommandError):
+            self.run_workers()
+
+    @mock.patch(
+        "airport.management.commands.process_order_jobs.claim_batch",
+        side_effect=lambda *args: time.sleep(0.2) or [],
+    )
+    @mock.patch(
+        "airport.management.commands.process_order_jobs.requeue_stale_jobs",
+        return_value=0,
+    )
+    def test_stale_jobs_requeued_periodically(
+        self,
+        requeue,
+        claim,
+        backoff,
+        connection
+    ):
+        """Test jobs of dead workers are requeued while running"""
+        self.run_workers("--requeue-interval=0")
+
+        self.assertGreaterEqual(requeue.call_count, 2)
+
+
+@skipUnless(os.getenv("RUN_BENCHMARKS"), "Set RUN_BENCHMARKS=1 to run.")
+@mock.patch.dict(
+    api_settings.DEFAULT_THROTTLE_RATES,
+    {"user": None, "search": None, "order_create": None}
+)
+class OrderIntakeBenchmark(TestCase):
+    """Compare synchronous and queued order throughput"""
+
+    orders_count = 400
+
+    def setUp(self):
+        cache.clear()
+        airplane = sample_airplane(rows=100, seats_in_row=10)
+        self.flights = [
+            sample_flight(
+                route=sample_route(sample_airport(), sample_airport()),
+                airplane=airplane
+            )
+            for _ in range(4)
+        ]
+
+    def post_orders(self, headers):
+        client = APIClient()
+        client.force_authenticate(user=sample_user())
+        started = time.perf_counter()
+        for index in range(self.orders_count):
+            flight = self.flights[index % len(self.flights)]
+            row, seat = divmod(index // len(self.flights), 10)
+            res = client.post(
+                ORDER_URL,
+                {"tickets": [
+                    {"flight": flight.id, "row": row + 1, "seat": seat + 1}
+                ]},
+                format="json",
+                headers=headers,
+            )
+            self.assertLess(res.status_code, 300)
+        return time.perf_counter() - started
+
+    def test_sync_vs_async(self):
+        sync_elapsed = self.post_orders({})
+        Ticket.objects.all().delete()
+        cache.clear()
+
+        intake_elapsed = self.post_orders({"Prefer": "respond-async"})
+        started = time.perf_counter()
+        drain_queue()
+        drain_elapsed = time.perf_counter() - started
+
+        print(
+            f"\nOrder intake: sync {self.orders_count / sync_elapsed:.0f}"
+            f" orders/s, async accept "
+            f"{self.orders_count / intake_elapsed:.0f} requests/s, "
+            f"worker {self.orders_count / drain_elapsed:.0f} orders/s"
+        )
+        self.assertEqual(Ticket.objects.count(), self.orders_count)
+        self.assertFalse(
+            OrderJob.objects.exclude(status=OrderJob.Status.DONE).exists()
+        )
@@ -0,0 +1,160 @@
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from airport.models import Flight, Route
+from airport.pagination import KeysetPagination
+from airport.tests.base_functions import (
+    sample_airplane,
+    sample_airport,
+    sample_flight,
+    sample_route,
+    sample_user
+)
+
+FLIGHT_URL = reverse("airport:flight-list")
+ROUTE_URL = reverse("airport:route-list")
+
+
+class KeysetPaginationTests(TestCase):
+    """Test keyset pagination of catalog endpoints"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=sample_user())
+
+        route = sample_route()
+        airplane = sample_airplane()
+        departure_time = datetime(2025, 3, 1, 8, 0, tzinfo=timezone.utc)
+        for index in range(7):
+            sample_flight(
+                route=route,
+                airplane=airplane,
+                departure_time=departure_time + timedelta(hours=index // 2),
+                arrival_time=departure_time + timedelta(hours=5),
+            )
+
+    def collect_pages(self, url, direction="next"):
+        ids = []
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            page = [flight["id"] for flight in res.data["results"]]
+            ids = ids + page if direction == "next" else page + ids
+            url = res.data[direction]
+        return ids, res
+
+    def test_pages_follow_model_ordering(self):
+        """Test walking next links visits every flight in order once"""
+        expected = list(
+            Flight.objects.order_by(
+                "departure_time",
+                "arrival_time",
+                "id"
+            ).values_list("id", flat=True)
+        )
+
+        ids, res = self.collect_pages(f"{FLIGHT_URL}?page_size=3")
+
+        self.assertEqual(ids, expected)
+        self.assertIsNotNone(res.data["previous"])
+
+    def test_previous_links_walk_back(self):
+        """Test previous links return the same pages in reverse"""
+        ids, res = self.collect_pages(f"{FLIGHT_URL}?page_size=2")
+        previous_ids, first_page = self.collect_pages(
+            res.data["previous"],
+            direction="previous"
+        )
+
+        self.assertEqual(previous_ids, ids[:len(previous_ids)])
+        self.assertEqual(len(previous_ids), len(ids) - 1)
+        self.assertIsNone(first_page.data["previous"])
+
+    def test_no_count_query(self):
+        """Test pages are fetched without counting the table"""
+        first_page = self.client.get(f"{FLIGHT_URL}?page_size=2")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(first_page.data["next"])
+
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("COUNT(*)", queries[0]["sql"].split("FROM")[0])
+
+    def test_position_filter_bounds_leading_column(self):
+        """Test the filter gives the index a range on the first column"""
+        ordering = ["-departure_time", "arrival_time", "pk"]
+        position = [1, 2, 3]
+
+        position_filter = KeysetPagination.get_position_filter(
+            ordering,
+            position,
+            reverse=False
+        )
+        reverse_filter = KeysetPagination.get_position_filter(
+            ordering,
+            position,
+            reverse=True
+        )
+
+        self.assertEqual(position_filter.connector, "AND")
+        self.assertEqual(
+            position_filter.children[0],
+            ("departure_time__lte", 1)
+        )
+        self.assertEqual(
+            reverse_filter.children[0],
+            ("departure_time__gte", 1)
+        )
+
+    def test_invalid_cursor(self):
+        """Test a malformed cursor returns not found"""
+        res = self.client.get(f"{FLIGHT_URL}?cursor=not-a-cursor")
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_invalid_position(self):
+        """Test positions the ordering fields cannot take return not found"""
+        departure = "2025-03-01T08:00:00+00:00"
+        for position in (
+            ["garbage", "x", 1],
+            [{"a": 1}, 1, 1],
+            [None, None, None],
+            [departure, departure, "x"],
+        ):
+            with self.subTest(position=position):
+                cursor = base64.urlsafe_b64encode(
+                    json.dumps({"p": position}).encode()
+                ).decode()
+
+                res = self.client.get(FLIGHT_URL, {"cursor": cursor})
+
+                self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_related_field_ordering(self):
+        """Test routes paginate by source and destination names"""
+        airports = [
+            sample_airport(name=name, closest_big_city=name)
+            for name in ("Alpha", "Bravo", "Charlie")
+        ]
+        for source in airports:
+            for destination in airports:
+                if source != destination:
+                    sample_route(source=source, destination=destination)
+        expected = [route.id for route in Route.objects.all()]
+
+        ids = []
+        url = f"{ROUTE_URL}?page_size=4"
+        while url:
+            res = self.client.get(url)
+            ids += [route["id"] for route in res.data["results"]]
+            url = res.data["next"]
+
+        self.assertEqual(ids, expected)
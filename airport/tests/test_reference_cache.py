@@ -0,0 +1,100 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from airport import reference_cache
+from airport.models import Airport
+from airport.reference_cache import (
+    REFERENCE_VERSION_KEY,
+    get_reference_data
+)
+from airport.tests.base_functions import (
+    sample_airport,
+    sample_flight,
+    sample_route,
+    sample_user
+)
+
+FLIGHT_URL = reverse("airport:flight-list")
+
+
+class ReferenceCacheTests(TestCase):
+    """Test the in-process cache of airports, airplanes and routes"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=sample_user())
+        self.source = sample_airport(name="KBP", closest_big_city="Kyiv")
+        self.destination = sample_airport(
+            name="WAW",
+            closest_big_city="Warsaw"
+        )
+        self.route = sample_route(self.source, self.destination)
+
+    def test_names_and_adjacency(self):
+        """Test the snapshot holds names, route strings and adjacency"""
+        reference_data = get_reference_data()
+
+        self.assertEqual(reference_data.airport_name(self.source.id), "KBP")
+        self.assertEqual(
+            reference_data.route_name(self.route.id),
+            "KBP -> WAW"
+        )
+        self.assertIn(
+            (self.route.id, self.destination.id),
+            reference_data.routes_from[self.source.id]
+        )
+
+    def test_flight_list_resolves_names_from_memory(self):
+        """Test flight list names routes and airplanes without joins"""
+        sample_flight(route=self.route)
+        self.client.get(FLIGHT_URL)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["route"], "KBP -> WAW")
+        self.assertEqual(
+            res.data["results"][0]["airplane"],
+            "Boeing 777X"
+        )
+
+    def test_save_invalidates_snapshot(self):
+        """Test renaming an airport is visible on the next read"""
+        get_reference_data()
+        self.source.name = "Boryspil"
+        self.source.save()
+
+        self.assertEqual(
+            get_reference_data().route_name(self.route.id),
+            "Boryspil -> WAW"
+        )
+
+    def test_version_moved_by_another_worker(self):
+        """Test a snapshot reloads when the shared version changes"""
+        snapshot = get_reference_data()
+        Airport.objects.filter(id=self.source.id).update(name="Boryspil")
+        cache.incr(REFERENCE_VERSION_KEY)
+
+        with mock.patch.object(reference_cache, "VERSION_CHECK_INTERVAL", 0):
+            reloaded = get_reference_data()
+
+        self.assertIsNot(reloaded, snapshot)
+        self.assertEqual(reloaded.airport_name(self.source.id), "Boryspil")
+
+    def test_snapshot_expires_without_shared_cache(self):
+        """Test renames by workers with their own cache show up in time"""
+        snapshot = get_reference_data()
+        Airport.objects.filter(id=self.source.id).update(name="Boryspil")
+
+        with mock.patch.object(reference_cache, "VERSION_CHECK_INTERVAL", 0):
+            self.assertIs(get_reference_data(), snapshot)
+            with override_settings(REFERENCE_DATA_MAX_AGE=0):
+                reloaded = get_reference_data()
+
+        self.assertEqual(reloaded.airport_name(self.source.id), "Boryspil")
@@ -1,4 +1,7 @@
+from datetime import datetime, timedelta, timezone
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 from rest_framework.test import APIClient
 from rest_framework import status
@@ -13,7 +16,11 @@ from airport.serializers import (
 from airport.tests.base_functions import (
     sample_route,
     sample_user,
-    sample_airport
+    sample_airport,
+    sample_airplane,
+    sample_flight,
+    sample_order,
+    sample_ticket
 )
 
 ROUTE_URL = reverse("airport:route-list")
@@ -24,6 +31,11 @@ def route_detail_url(route_id):
     return reverse("airport:route-detail", args=[route_id])
 
 
+def route_availability_url(route_id):
+    """Return the route availability calendar URL"""
+    return reverse("airport:route-availability", args=[route_id])
+
+
 class UnauthenticatedRouteTests(TestCase):
     """Test unauthenticated route API access"""
 
@@ -76,7 +88,7 @@ class AuthenticatedRouteTests(TestCase):
         serializer = RouteListSerializer(routes, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_retrieve_route(self):
         """Test retrieving a specific route as an authenticated user"""
@@ -130,3 +142,77 @@ class AdminRouteTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
         self.assertEqual(res.data, serializer.data)
+
+
+class RouteAvailabilityTests(TestCase):
+    """Test the route seat availability calendar"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=sample_user())
+        self.route = sample_route()
+        airplane = sample_airplane(rows=2, seats_in_row=2)
+        day = datetime(2025, 3, 10, tzinfo=timezone.utc)
+        self.flights = [
+            sample_flight(
+                route=self.route,
+                airplane=airplane,
+                departure_time=day + timedelta(hours=hours),
+                arrival_time=day + timedelta(hours=hours + 3),
+            )
+            for hours in (18, 7, 24 * 21)
+        ]
+        sample_flight(
+            route=self.route,
+            airplane=airplane,
+            departure_time=day + timedelta(days=30),
+            arrival_time=day + timedelta(days=30, hours=3),
+        )
+        sample_ticket(flight=self.flights[0], order=sample_order())
+
+    def test_month_calendar(self):
+        """Test flights are grouped per day with availability bounds"""
+        url = route_availability_url(self.route.id)
+
+        res = self.client.get(url, {"month": "2025-03"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["month"], "2025-03")
+        self.assertEqual(
+            [dict(day) for day in res.data["days"]],
+            [
+                {
+                    "date": "2025-03-10",
+                    "flights": 2,
+                    "min_tickets_available": 3,
+                    "max_tickets_available": 4,
+                    "earliest_departure": "10-03-2025 07:00:00",
+                },
+                {
+                    "date": "2025-03-31",
+                    "flights": 1,
+                    "min_tickets_available": 4,
+                    "max_tickets_available": 4,
+                    "earliest_departure": "31-03-2025 00:00:00",
+                },
+            ]
+        )
+
+    def test_month_calendar_cached(self):
+        """Test a repeated calendar request skips the aggregate query"""
+        url = route_availability_url(self.route.id)
+        self.client.get(url, {"month": "2025-03"})
+
+        with self.assertNumQueries(1):
+            res = self.client.get(url, {"month": "2025-03"})
+
+        self.assertEqual(len(res.data["days"]), 2)
+
+    def test_invalid_month(self):
+        """Test a malformed month is rejected"""
+        url = route_availability_url(self.route.id)
+
+        res = self.client.get(url, {"month": "03-2025"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
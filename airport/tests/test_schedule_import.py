@@ -0,0 +1,232 @@
+import gzip
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from pathlib import Path
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from airport.models import Airplane, Airport, Crew, Flight, Route
+from airport.reference_cache import get_reference_data
+from airport.tests.base_functions import sample_airport
+
+AIRPORTS_CSV = """type,name,closest_big_city
+airport,JFK Airport,New York
+airport,LAX Airport,Los Angeles
+"""
+
+FLIGHTS_CSV = """source,destination,airplane,departure_time,arrival_time,crew
+JFK Airport,LAX Airport,Boeing 737,2030-01-01T08:00:00Z,\
+2030-01-01T14:00:00Z,Laura Palmer;Dale Cooper
+LAX Airport,JFK Airport,Boeing 737,2030-01-02T08:00:00Z,\
+2030-01-02T14:00:00Z,Dale Cooper
+"""
+
+SCHEDULE_JSONL = [
+    {"type": "airplane", "name": "Boeing 737", "rows": 20,
+     "seats_in_row": 6, "airplane_type": "Narrow-body"},
+    {"type": "route", "source": "JFK Airport",
+     "destination": "LAX Airport", "distance": 3980},
+    {"type": "route", "source": "LAX Airport",
+     "destination": "JFK Airport", "distance": 3980},
+]
+
+
+class ImportScheduleTests(TestCase):
+    """Test the bulk schedule import command"""
+
+    def setUp(self):
+        cache.clear()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, content):
+        path = Path(self.tmp.name) / name
+        if name.endswith(".gz"):
+            with gzip.open(path, "wt") as file:
+                file.write(content)
+        else:
+            path.write_text(content)
+        return str(path)
+
+    def write_jsonl(self, name, records):
+        return self.write(
+            name,
+            "\n".join(json.dumps(record) for record in records) + "\n"
+        )
+
+    def import_schedule(self, *args):
+        out = StringIO()
+        call_command("import_schedule", *args, stdout=out)
+        return out.getvalue()
+
+    def import_sample(self, *args):
+        return self.import_schedule(
+            self.write("airports.csv", AIRPORTS_CSV),
+            self.write_jsonl("schedule.jsonl", SCHEDULE_JSONL),
+            self.write("flights.csv.gz", FLIGHTS_CSV),
+            *args,
+        )
+
+    def test_import_schedule(self):
+        """Test every record type is imported with natural keys"""
+        get_reference_data()
+        output = self.import_sample("--type", "flight")
+
+        self.assertIn("Imported 2 flights", output)
+        self.assertEqual(Route.objects.count(), 2)
+        self.assertEqual(
+            Airplane.objects.get().airplane_type.name,
+            "Narrow-body"
+        )
+        flight = Flight.objects.get(departure_time__day=1)
+        self.assertEqual(flight.route.source.name, "JFK Airport")
+        self.assertEqual(
+            flight.arrival_time,
+            datetime(2030, 1, 1, 14, tzinfo=timezone.utc)
+        )
+        self.assertEqual(
+            sorted(crew.full_name for crew in flight.crew.all()),
+            ["Dale Cooper", "Laura Palmer"]
+        )
+        self.assertEqual(Crew.objects.count(), 2)
+        self.assertEqual(
+            get_reference_data().airport_name(flight.route.source_id),
+            "JFK Airport"
+        )
+
+    def test_small_batches(self):
+        """Test buffered keys resolve when batches flush early"""
+        self.import_schedule(
+            self.write_jsonl("schedule.jsonl", [
+                {"type": "airport", "name": "JFK Airport",
+                 "closest_big_city": "New York"},
+                {"type": "airport", "name": "LAX Airport",
+                 "closest_big_city": "Los Angeles"},
+                *SCHEDULE_JSONL,
+                {"type": "flight", "source": "JFK Airport",
+                 "destination": "LAX Airport", "airplane": "Boeing 737",
+                 "departure_time": "2030-01-01T08:00:00",
+                 "arrival_time": "2030-01-01T14:00:00",
+                 "crew": ["Laura Palmer"]},
+            ]),
+            "--batch-size", "1",
+        )
+
+        self.assertEqual(Flight.objects.get().crew.get().last_name, "Palmer")
+
+    def test_existing_reference_rows_kept(self):
+        """Test existing airports are reused and reimports add flights"""
+        airport = sample_airport(
+            name="JFK Airport",
+            closest_big_city="New York"
+        )
+
+        self.import_sample("--type", "flight")
+        self.import_sample("--type", "flight")
+
+        self.assertEqual(Airport.objects.count(), 2)
+        self.assertEqual(Airport.objects.get(name="JFK Airport"), airport)
+        self.assertEqual(Route.objects.count(), 2)
+        self.assertEqual(Flight.objects.count(), 4)
+
+    def test_unknown_key_rolls_back(self):
+        """Test an unknown airport aborts the whole import"""
+        path = self.write(
+            "flights.csv",
+            FLIGHTS_CSV.replace("LAX Airport,JFK", "SFO Airport,JFK")
+        )
+
+        with self.assertRaisesMessage(
+            CommandError,
+            "Line 3: Unknown airport 'SFO Airport'."
+        ):
+            self.import_schedule(
+                self.write("airports.csv", AIRPORTS_CSV),
+                self.write_jsonl("schedule.jsonl", SCHEDULE_JSONL),
+                path,
+                "--type", "flight",
+            )
+
+        self.assertFalse(Airport.objects.exists())
+        self.assertFalse(Flight.objects.exists())
+
+    def test_invalid_flight_times(self):
+        """Test flights must arrive after they depart"""
+        path = self.write(
+            "flights.csv",
+            FLIGHTS_CSV.replace("2030-01-01T14", "2030-01-01T07")
+        )
+
+        with self.assertRaisesMessage(
+            CommandError,
+            "Line 2: Arrival time must be later than departure time."
+        ):
+            self.import_schedule(
+                self.write("airports.csv", AIRPORTS_CSV),
+                self.write_jsonl("schedule.jsonl", SCHEDULE_JSONL),
+                path,
+                "--type", "flight",
+            )
+
+    def test_missing_type(self):
+        """Test rows without a type need --type"""
+        with self.assertRaisesMessage(
+            CommandError,
+            "Line 2: unknown record type None."
+        ):
+            self.import_schedule(self.write("flights.csv", FLIGHTS_CSV))
+
+
+@skipUnless(os.getenv("RUN_BENCHMARKS"), "Set RUN_BENCHMARKS=1 to run.")
+class ImportScheduleBenchmark(TestCase):
+    """Measure schedule import throughput"""
+
+    flights_count = 100_000
+
+    def test_import_flights(self):
+        start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "flights.jsonl"
+            with path.open("w") as file:
+                for name in ("JFK Airport", "LAX Airport"):
+                    file.write(json.dumps({
+                        "type": "airport",
+                        "name": name,
+                        "closest_big_city": name,
+                    }) + "\n")
+                for record in SCHEDULE_JSONL:
+                    file.write(json.dumps(record) + "\n")
+                for index in range(self.flights_count):
+                    departure = start + timedelta(minutes=index)
+                    file.write(json.dumps({
+                        "source": "JFK Airport",
+                        "destination": "LAX Airport",
+                        "airplane": "Boeing 737",
+                        "departure_time": departure.isoformat(),
+                        "arrival_time": (
+                            departure + timedelta(hours=6)
+                        ).isoformat(),
+                        "crew": [f"Pilot {index % 100}"],
+                    }) + "\n")
+
+            started = time.perf_counter()
+            call_command(
+                "import_schedule",
+                str(path),
+                "--type", "flight",
+                stdout=StringIO(),
+            )
+            elapsed = time.perf_counter() - started
+
+        print(
+            f"\nSchedule import: {self.flights_count / elapsed:.0f} "
+            f"flights/s"
+        )
+        self.assertEqual(Flight.objects.count(), self.flights_count)
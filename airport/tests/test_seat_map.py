@@ -0,0 +1,187 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from airport.seat_map import SeatMap, get_seat_map, get_seat_maps
+from airport.tests.base_functions import (
+    sample_flight,
+    sample_order,
+    sample_ticket,
+    sample_user
+)
+
+ORDER_URL = reverse("airport:order-list")
+
+
+def flight_detail_url(flight_id):
+    """Return the flight detail URL"""
+    return reverse("airport:flight-detail", args=[flight_id])
+
+
+class SeatMapTests(TestCase):
+    """Test the seat occupancy bitmap"""
+
+    def test_take_and_release(self):
+        """Test taking and releasing seats updates counts"""
+        seat_map = SeatMap(rows=3, seats_in_row=4)
+        seat_map.take(1, 1)
+        seat_map.take(3, 4)
+
+        self.assertTrue(seat_map.is_taken(3, 4))
+        self.assertFalse(seat_map.is_taken(2, 2))
+        self.assertEqual(seat_map.taken_count, 2)
+        self.assertEqual(seat_map.available, 10)
+
+        seat_map.release(1, 1)
+
+        self.assertEqual(list(seat_map.taken_seats()), [(3, 4)])
+
+    def test_taken_seats_in_cabin_order(self):
+        """Test taken seats are listed ordered by row and seat"""
+        seats = [(5, 2), (1, 6), (2, 1), (5, 1)]
+        seat_map = SeatMap.build(5, 6, seats)
+
+        self.assertEqual(list(seat_map.taken_seats()), sorted(seats))
+
+    def test_cache_round_trip(self):
+        """Test a seat map survives serialization to the cache format"""
+        seat_map = SeatMap.build(40, 9, [(40, 9), (17, 3)])
+        restored = SeatMap.from_cache(seat_map.to_cache())
+
+        self.assertEqual(
+            list(restored.taken_seats()),
+            list(seat_map.taken_seats())
+        )
+
+    def test_seat_outside_cabin(self):
+        """Test seats outside the cabin are never reported as taken"""
+        seat_map = SeatMap(rows=2, seats_in_row=2)
+
+        self.assertFalse(seat_map.is_taken(3, 1))
+        with self.assertRaises(IndexError):
+            seat_map.take(3, 1)
+
+    def test_find_adjacent_in_one_row(self):
+        """Test the first row with a long enough free run is used"""
+        seat_map = SeatMap.build(3, 6, [(1, 3), (1, 5), (2, 2), (2, 6)])
+
+        self.assertEqual(seat_map.find_adjacent(3), [(2, 3), (2, 4), (2, 5)])
+        self.assertEqual(seat_map.find_adjacent(2), [(1, 1), (1, 2)])
+
+    def test_find_adjacent_nearest_rows(self):
+        """Test a group split across the narrowest band of rows"""
+        seat_map = SeatMap.build(
+            4,
+            3,
+            [(1, 1), (1, 2), (1, 3), (2, 2), (3, 1), (3, 3), (4, 2)]
+        )
+
+        self.assertEqual(
+            seat_map.find_adjacent(4),
+            [(2, 1), (2, 3), (3, 2), (4, 1)]
+        )
+        self.assertEqual(
+            seat_map.find_adjacent(2),
+            [(2, 1), (2, 3)]
+        )
+        self.assertIsNone(seat_map.find_adjacent(6))
+
+
+class FlightSeatMapTests(TestCase):
+    """Test seat maps of stored flights"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = sample_user()
+        self.client.force_authenticate(user=self.user)
+        self.flight = sample_flight()
+        self.order = sample_order(user=self.user)
+
+    def test_retrieve_served_from_cached_seat_map(self):
+        """Test flight retrieve does not query tickets once cached"""
+        sample_ticket(flight=self.flight, order=self.order, row=2, seat=3)
+        url = flight_detail_url(self.flight.id)
+        self.client.get(url)
+
+        with self.assertNumQueries(2):
+            res = self.client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["taken_seats"], [{"Row": 2, "Seat": 3}])
+        self.assertEqual(
+            res.data["tickets_available"],
+            self.flight.airplane.capacity - 1
+        )
+
+    def test_ticket_writes_invalidate_cached_seat_map(self):
+        """Test creating and deleting tickets retires the cached map"""
+        get_seat_map(self.flight)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket = sample_ticket(
+                flight=self.flight,
+                order=self.order,
+                row=4,
+                seat=5
+            )
+
+        with self.assertNumQueries(1):
+            self.assertTrue(get_seat_map(self.flight).is_taken(4, 5))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket.delete()
+
+        self.assertFalse(get_seat_map(self.flight).is_taken(4, 5))
+
+    def test_map_built_before_a_write_not_served(self):
+        """Test a map filled after a racing write's invalidation is unused"""
+        build = SeatMap.build
+
+        def build_then_write(*args):
+            seat_map = build(*args)
+            with self.captureOnCommitCallbacks(execute=True):
+                sample_ticket(
+                    flight=self.flight,
+                    order=self.order,
+                    row=4,
+                    seat=5
+                )
+            return seat_map
+
+        for load in (get_seat_map, lambda flight: get_seat_maps([flight])):
+            cache.clear()
+            self.flight.tickets.all().delete()
+            with mock.patch.object(
+                SeatMap,
+                "build",
+                side_effect=build_then_write
+            ):
+                load(self.flight)
+
+            self.assertTrue(get_seat_map(self.flight).is_taken(4, 5))
+            self.assertTrue(
+                get_seat_maps([self.flight])[self.flight.id].is_taken(4, 5)
+            )
+
+    def test_order_for_taken_seat_conflicts(self):
+        """Test ordering an already taken seat names it in a conflict"""
+        sample_ticket(flight=self.flight, order=self.order, row=1, seat=1)
+        payload = {
+            "tickets": [
+                {"row": 1, "seat": 2, "flight": self.flight.id},
+                {"row": 1, "seat": 1, "flight": self.flight.id},
+            ]
+        }
+
+        res = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            res.data["seats"],
+            [{"flight": self.flight.id, "row": 1, "seat": 1}]
+        )
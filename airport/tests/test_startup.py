@@ -0,0 +1,134 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+from rest_framework.reverse import reverse
+
+from airport.tests.base_functions import sample_flight, sample_user
+from airport_service.settings import dev, prod
+
+FLIGHT_URL = reverse("airport:flight-list")
+
+LOADED_MODULES = """
+import json, sys, time
+started = time.perf_counter()
+import airport_service.wsgi
+elapsed = time.perf_counter() - started
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def load_wsgi(settings_module: str) -> dict:
+    """Import the WSGI application in a fresh interpreter"""
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": settings_module,
+        "SECRET_KEY": "startup",
+        "WARMUP_ON_STARTUP": "False",
+    }
+    output = subprocess.run(
+        [sys.executable, "-c", LOADED_MODULES],
+        cwd=settings.BASE_DIR,
+        env=env,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+class ProductionSettingsTests(TestCase):
+    """Test the production profile stays lean"""
+
+    def test_no_debug_tooling(self):
+        """Test production never loads the toolbar"""
+        self.assertFalse(prod.DEBUG)
+        self.assertNotIn("debug_toolbar", prod.INSTALLED_APPS)
+        self.assertFalse(
+            any("debug_toolbar" in name for name in prod.MIDDLEWARE)
+        )
+        self.assertIn("debug_toolbar", dev.INSTALLED_APPS)
+
+    def test_cached_template_loaders(self):
+        """Test templates are compiled once per process"""
+        options = prod.TEMPLATES[0]["OPTIONS"]
+
+        self.assertFalse(prod.TEMPLATES[0]["APP_DIRS"])
+        self.assertEqual(
+            options["loaders"][0][0],
+            "django.template.loaders.cached.Loader"
+        )
+        self.assertNotIn(
+            "django.template.context_processors.debug",
+            options["context_processors"]
+        )
+
+    def test_startup_skips_documentation_and_toolbar(self):
+        """Test loading the application defers optional modules"""
+        modules = set(load_wsgi("airport_service.settings.prod")["modules"])
+
+        self.assertIn("airport_service.urls", modules)
+        self.assertNotIn("drf_spectacular.views", modules)
+        self.assertNotIn("debug_toolbar", modules)
+
+    def test_documentation_loaded_on_request(self):
+        """Test lazily registered documentation views still respond"""
+        for name in ("schema", "swagger-ui", "redoc"):
+            with self.subTest(name):
+                res = self.client.get(reverse(name))
+
+                self.assertEqual(res.status_code, 200)
+
+
+@skipUnless(os.getenv("RUN_BENCHMARKS"), "Set RUN_BENCHMARKS=1 to run.")
+@mock.patch.dict(
+    api_settings.DEFAULT_THROTTLE_RATES,
+    {"user": None, "search": None}
+)
+class StartupBenchmark(TestCase):
+    """Measure WSGI import time and middleware cost per profile"""
+
+    runs = 7
+    requests = 300
+
+    def test_import_time(self):
+        for profile in ("dev", "prod"):
+            timings = [
+                load_wsgi(f"airport_service.settings.{profile}")["elapsed"]
+                for _ in range(self.runs)
+            ]
+            print(
+                f"\nImport airport_service.wsgi ({profile}): "
+                f"{statistics.median(timings) * 1000:.0f} ms median"
+            )
+
+    def test_middleware(self):
+        sample_flight()
+        client = APIClient()
+        client.force_authenticate(user=sample_user())
+        profiles = {
+            "dev": {"DEBUG": True, "MIDDLEWARE": dev.MIDDLEWARE},
+            "prod": {"DEBUG": False, "MIDDLEWARE": prod.MIDDLEWARE},
+        }
+        for profile, overrides in profiles.items():
+            with override_settings(**overrides):
+                client.get(FLIGHT_URL)
+                started = time.perf_counter()
+                for _ in range(self.requests):
+                    client.get(FLIGHT_URL)
+                elapsed = time.perf_counter() - started
+            print(
+                f"\nFlight list ({profile} middleware): "
+                f"{self.requests / elapsed:.0f} req/s, "
+                f"{elapsed / self.requests * 1e6:.0f} us/request"
+            )
@@ -0,0 +1,121 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from airport.models import ThrottleCounter
+from airport.tests.base_functions import sample_flight, sample_user
+from airport.throttling import OrderCreateRateThrottle
+
+ORDER_URL = reverse("airport:order-list")
+FLIGHT_URL = reverse("airport:flight-list")
+
+
+def throttle_rates(**rates):
+    """Patch throttle rates for the duration of a test"""
+    return mock.patch.dict(api_settings.DEFAULT_THROTTLE_RATES, rates)
+
+
+class SlidingWindowThrottleTestsMixin:
+    """Test the sliding window counter against one store"""
+
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().post("/")
+        self.request.user = sample_user()
+        patcher = throttle_rates(order_create="4/min")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def hit(self, at: float) -> bool:
+        throttle = OrderCreateRateThrottle()
+        throttle.timer = lambda: at
+        self.throttle = throttle
+        return throttle.allow_request(self.request, None)
+
+    def test_window_slides(self):
+        """Test the previous window counts in proportion to its overlap"""
+        self.assertEqual([self.hit(60.0 + i) for i in range(5)], [
+            True, True, True, True, False
+        ])
+
+        # Half of the previous window overlaps: 4 * 0.5 + 2 allowed.
+        self.assertEqual([self.hit(150.0) for _ in range(3)], [
+            True, True, False
+        ])
+        self.assertEqual(self.throttle.wait(), 15.0)
+
+        self.assertTrue(self.hit(165.0))
+
+    def test_rejected_requests_not_counted(self):
+        """Test hammering while throttled does not extend the block"""
+        for _ in range(10):
+            self.hit(60.0)
+
+        self.assertEqual(self.throttle.current, 4)
+        self.assertEqual(self.throttle.wait(), 75.0)
+        self.assertFalse(self.hit(134.0))
+        self.assertTrue(self.hit(135.0))
+
+    def test_keys_are_separate(self):
+        """Test each user has their own counter"""
+        for _ in range(4):
+            self.hit(60.0)
+        self.request.user = sample_user()
+
+        self.assertTrue(self.hit(60.0))
+
+
+@override_settings(THROTTLE_STORE="cache")
+class CacheThrottleStoreTests(SlidingWindowThrottleTestsMixin, TestCase):
+    pass
+
+
+@override_settings(THROTTLE_STORE="database")
+class DatabaseThrottleStoreTests(SlidingWindowThrottleTestsMixin, TestCase):
+    def test_one_row_per_window(self):
+        """Test counters take constant space per key and window"""
+        for _ in range(3):
+            self.hit(60.0)
+
+        self.assertEqual(ThrottleCounter.objects.get().count, 3)
+
+
+class EndpointThrottleTests(TestCase):
+    """Test per-endpoint rates"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=sample_user())
+
+    @throttle_rates(order_create="1/min")
+    def test_order_creation_rate(self):
+        """Test order attempts are limited separately from reads"""
+        flight = sample_flight()
+        payload = {"tickets": [{"flight": flight.id, "row": 1, "seat": 1}]}
+
+        first = self.client.post(ORDER_URL, payload, format="json")
+        second = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            second.status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertIn("Retry-After", second)
+        self.assertEqual(
+            self.client.get(ORDER_URL).status_code,
+            status.HTTP_200_OK
+        )
+
+    @throttle_rates(search="2/min")
+    def test_search_rate(self):
+        """Test flight searches are limited"""
+        codes = [self.client.get(FLIGHT_URL).status_code for _ in range(3)]
+
+        self.assertEqual(codes[-1], status.HTTP_429_TOO_MANY_REQUESTS)
@@ -52,7 +52,7 @@ class AuthenticatedTicketTests(TestCase):
         serializer = TicketListSerializer(tickets, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_retrieve_ticket(self):
         """Test retrieving a specific ticket as an authenticated user"""
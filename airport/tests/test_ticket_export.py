@@ -0,0 +1,175 @@
+import csv
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from airport.models import Order
+from airport.tests.base_functions import (
+    sample_airport,
+    sample_flight,
+    sample_flights_with_tickets,
+    sample_order,
+    sample_route,
+    sample_ticket,
+    sample_user
+)
+
+EXPORT_URL = reverse("airport:order-export")
+
+
+def content(response) -> str:
+    return b"".join(response.streaming_content).decode()
+
+
+class TicketExportTests(TestCase):
+    """Test the staff ticket export endpoint and command"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=sample_user(is_staff=True))
+        self.user = sample_user(email="finance@test.com")
+        self.flight = sample_flight()
+        self.other_flight = sample_flight(
+            route=sample_route(sample_airport(), sample_airport()),
+            airplane=self.flight.airplane,
+        )
+        self.old_order = sample_order(user=self.user)
+        Order.objects.filter(id=self.old_order.id).update(
+            created_at=datetime(2025, 1, 10, 12, tzinfo=timezone.utc)
+        )
+        self.order = sample_order(user=self.user)
+        Order.objects.filter(id=self.order.id).update(
+            created_at=datetime(2025, 2, 10, 12, tzinfo=timezone.utc)
+        )
+        self.old_ticket = sample_ticket(
+            order=self.old_order,
+            flight=self.flight,
+        )
+        self.ticket = sample_ticket(
+            order=self.order,
+            flight=self.other_flight,
+            row=2,
+            seat=3,
+        )
+
+    def export(self, **params):
+        res = self.client.get(EXPORT_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res
+
+    def test_csv_export(self):
+        """Test every ticket is a CSV row with order, flight and route"""
+        res = self.export()
+
+        self.assertEqual(res["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn("attachment;", res["Content-Disposition"])
+        rows = list(csv.DictReader(StringIO(content(res))))
+        self.assertEqual(
+            [int(row["ticket_id"]) for row in rows],
+            [self.old_ticket.id, self.ticket.id]
+        )
+        self.assertEqual(rows[0]["user_email"], "finance@test.com")
+        self.assertEqual(rows[0]["source"], "DXB Airport")
+        self.assertEqual(
+            rows[0]["order_created_at"],
+            "2025-01-10 12:00:00+00:00"
+        )
+        self.assertEqual((rows[1]["row"], rows[1]["seat"]), ("2", "3"))
+
+    def test_jsonl_export_with_filters(self):
+        """Test JSON lines filtered by order date and flight"""
+        res = self.export(
+            export_format="jsonl",
+            created_date_from="01-02-2025",
+            created_date_to="10-02-2025",
+        )
+        lines = [json.loads(line) for line in content(res).splitlines()]
+
+        self.assertEqual([line["ticket_id"] for line in lines], [
+            self.ticket.id
+        ])
+        self.assertEqual(lines[0]["order_id"], self.order.id)
+        self.assertEqual(lines[0]["departure_time"][:4], "2025")
+
+        res = self.export(export_format="jsonl", flight=self.flight.id)
+
+        self.assertEqual(
+            json.loads(content(res))["ticket_id"],
+            self.old_ticket.id
+        )
+
+    def test_invalid_params(self):
+        """Test bad formats, dates and flights are rejected"""
+        for params in (
+            {"export_format": "xml"},
+            {"created_date_from": "2025-02-01"},
+            {"flight": "first"},
+            {"flight": "0"},
+        ):
+            res = self.client.get(EXPORT_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_staff_only(self):
+        """Test regular users cannot export orders"""
+        self.client.force_authenticate(user=self.user)
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_command(self):
+        """Test the command writes the same rows"""
+        out = StringIO()
+        call_command(
+            "export_tickets",
+            "--export-format", "jsonl",
+            "--created-to", "2025-01-31",
+            stdout=out,
+        )
+
+        [line] = out.getvalue().splitlines()
+        self.assertEqual(json.loads(line)["ticket_id"], self.old_ticket.id)
+
+
+@skipUnless(os.getenv("RUN_BENCHMARKS"), "Set RUN_BENCHMARKS=1 to run.")
+class TicketExportBenchmark(TestCase):
+    """Measure time to first byte, throughput and memory of the export"""
+
+    flights_count = 100
+    tickets_per_flight = 1_000
+
+    def test_export(self):
+        sample_flights_with_tickets(
+            self.flights_count,
+            self.tickets_per_flight,
+        )
+        client = APIClient()
+        client.force_authenticate(user=sample_user(is_staff=True))
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        chunks = client.get(EXPORT_URL).streaming_content
+        next(chunks)
+        first_byte = time.perf_counter() - started
+        size = sum(len(chunk) for chunk in chunks)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        tickets = self.flights_count * self.tickets_per_flight
+        print(
+            f"\nExport of {tickets} tickets ({size / 2 ** 20:.1f} MiB): "
+            f"first byte {first_byte * 1000:.0f} ms, "
+            f"{tickets / elapsed:.0f} rows/s, "
+            f"peak {peak / 2 ** 20:.1f} MiB"
+        )
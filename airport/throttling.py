@@ -0,0 +1,213 @@
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+from airport.models import ThrottleCounter
+
+PURGE_INTERVAL = 60.0
+
+THROTTLE_STORES = {
+    "cache": "airport.throttling.CacheThrottleStore",
+    "database": "airport.throttling.DatabaseThrottleStore",
+}
+
+
+class CacheThrottleStore:
+    """Keep counters in the Django cache.
+
+    Counters are shared across processes and hosts with a shared backend
+    such as Redis; with the local-memory backend they are per process.
+    """
+
+    @property
+    def cache(self):
+        return caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def increment(self, key: str, period: int, timeout: int) -> int:
+        cache_key = f"{key}:{period}"
+        self.cache.add(cache_key, 0, timeout)
+        try:
+            return self.cache.incr(cache_key)
+        except ValueError:
+            # Expired between add() and incr().
+            self.cache.add(cache_key, 1, timeout)
+            return 1
+
+    def decrement(self, key: str, period: int) -> None:
+        try:
+            self.cache.decr(f"{key}:{period}")
+        except ValueError:
+            pass
+
+    def count(self, key: str, period: int) -> int:
+        return self.cache.get(f"{key}:{period}", 0)
+
+
+class DatabaseThrottleStore:
+    """Keep counters in the ``ThrottleCounter`` table.
+
+    Needs no extra service, at the price of a write per throttled
+    request. Expired counters are purged at most once per
+    ``PURGE_INTERVAL`` seconds per process.
+    """
+
+    def __init__(self):
+        self.purged_at = 0.0
+        self.lock = threading.Lock()
+
+    def increment(self, key: str, period: int, timeout: int) -> int:
+        self.purge()
+        quote = connection.ops.quote_name
+        table = quote(ThrottleCounter._meta.db_table)
+        key_column, period_column, count_column, expires_column = (
+            quote(ThrottleCounter._meta.get_field(name).column)
+            for name in ("key", "period", "count", "expires_at")
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} "
+                f"({key_column}, {period_column}, {count_column}, "
+                f"{expires_column}) VALUES (%s, %s, 1, %s) "
+                f"ON CONFLICT ({key_column}, {period_column}) DO UPDATE "
+                f"SET {count_column} = {table}.{count_column} + 1 "
+                f"RETURNING {count_column}",
+                [key, period, timezone.now() + timedelta(seconds=timeout)],
+            )
+            return cursor.fetchone()[0]
+
+    def decrement(self, key: str, period: int) -> None:
+        ThrottleCounter.objects.filter(
+            key=key,
+            period=period,
+            count__gt=0,
+        ).update(count=F("count") - 1)
+
+    def count(self, key: str, period: int) -> int:
+        return (
+            ThrottleCounter.objects.filter(key=key, period=period)
+            .values_list("count", flat=True)
+            .first()
+        ) or 0
+
+    def purge(self) -> None:
+        now = time.monotonic()
+        if now - self.purged_at < PURGE_INTERVAL:
+            return
+        if not self.lock.acquire(blocking=False):
+            return
+        try:
+            self.purged_at = now
+            ThrottleCounter.objects.filter(
+                expires_at__lt=timezone.now()
+            ).delete()
+        finally:
+            self.lock.release()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_throttle_store():
+    """Return the store named by ``THROTTLE_STORE``, one per process"""
+    path = THROTTLE_STORES.get(
+        settings.THROTTLE_STORE,
+        settings.THROTTLE_STORE
+    )
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = import_string(path)()
+        return _stores[path]
+
+
+class SlidingWindowThrottleMixin:
+    """Rate limit with a sliding window counter kept in a shared store.
+
+    Requests are counted per fixed window of the rate's duration. The
+    rate applies to the previous window's count, weighted by how much of
+    it still overlaps the sliding window, plus the current count: two
+    integers per key instead of DRF's list of request timestamps.
+    Rejected requests are not counted.
+    """
+
+    def get_rate(self):
+        # Read the rates on every request so settings overrides apply.
+        try:
+            return api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+        except KeyError:
+            raise ImproperlyConfigured(
+                f"No default throttle rate set for '{self.scope}' scope"
+            )
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        store = get_throttle_store()
+        position = self.timer() / self.duration
+        period = int(position)
+        self.elapsed = position - period
+        self.current = store.increment(self.key, period, 2 * self.duration)
+        self.previous = store.count(self.key, period - 1)
+        if self.previous * (1 - self.elapsed) + self.current <= (
+            self.num_requests
+        ):
+            return True
+
+        store.decrement(self.key, period)
+        self.current -= 1
+        return False
+
+    def wait(self):
+        """Seconds until one more request fits in the window"""
+        if self.current + 1 <= self.num_requests:
+            # Wait for the previous window to slide out far enough.
+            needed = 1 - (self.num_requests - self.current - 1) / max(
+                self.previous,
+                1,
+            )
+            return max(needed - self.elapsed, 0) * self.duration
+
+        # Wait for the next window, where this one becomes the previous.
+        needed = 1 - (self.num_requests - 1) / self.current
+        return (1 - self.elapsed + max(needed, 0)) * self.duration
+
+
+class SlidingWindowAnonRateThrottle(
+    SlidingWindowThrottleMixin,
+    AnonRateThrottle
+):
+    pass
+
+
+class SlidingWindowUserRateThrottle(
+    SlidingWindowThrottleMixin,
+    UserRateThrottle
+):
+    pass
+
+
+class SearchRateThrottle(SlidingWindowUserRateThrottle):
+    """Limit flight and itinerary searches per user or address"""
+
+    scope = "search"
+
+
+class OrderCreateRateThrottle(SlidingWindowUserRateThrottle):
+    """Limit order attempts per user"""
+
+    scope = "order_create"
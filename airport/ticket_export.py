@@ -0,0 +1,101 @@
+import csv
+from datetime import date, datetime, time, timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from airport.models import Ticket
+
+CHUNK_SIZE = 5_000
+EXPORT_FORMATS = ("csv", "jsonl")
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/jsonl; charset=utf-8",
+}
+
+# Exported column -> ticket lookup. One flat row per ticket.
+EXPORT_COLUMNS = {
+    "order_id": "order_id",
+    "order_created_at": "order__created_at",
+    "user_id": "order__user_id",
+    "user_email": "order__user__email",
+    "ticket_id": "id",
+    "row": "row",
+    "seat": "seat",
+    "flight_id": "flight_id",
+    "departure_time": "flight__departure_time",
+    "arrival_time": "flight__arrival_time",
+    "route_id": "flight__route_id",
+    "source": "flight__route__source__name",
+    "destination": "flight__route__destination__name",
+    "distance": "flight__route__distance",
+}
+
+
+def start_of_day(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def export_rows(
+    created_from: date = None,
+    created_to: date = None,
+    flight_id: int = None,
+    chunk_size: int = CHUNK_SIZE,
+):
+    """Yield ticket rows with their order, user, flight and route.
+
+    Rows come in ticket id order from a single joined query read with
+    ``iterator()``, i.e. a server-side cursor on PostgreSQL, so the first
+    rows are sent right away and memory does not grow with the export.
+    Dates filter orders by creation day, both bounds inclusive.
+    """
+    queryset = Ticket.objects.all()
+    if created_from:
+        queryset = queryset.filter(
+            order__created_at__gte=start_of_day(created_from)
+        )
+    if created_to:
+        queryset = queryset.filter(
+            order__created_at__lt=start_of_day(created_to + timedelta(1))
+        )
+    if flight_id is not None:
+        queryset = queryset.filter(flight_id=flight_id)
+
+    return (
+        queryset.order_by("id")
+        .values_list(*EXPORT_COLUMNS.values())
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+class _Lines:
+    """File-like object handing back what ``csv.writer`` writes"""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def format_rows(rows, export_format: str, lines_per_chunk: int = 1_000):
+    """Encode rows as CSV with a header or as JSON lines.
+
+    Lines are yielded in chunks to keep the number of writes low.
+    """
+    if export_format == "csv":
+        writer = csv.writer(_Lines())
+        yield writer.writerow(EXPORT_COLUMNS)
+        encode = writer.writerow
+    else:
+        encoder = DjangoJSONEncoder()
+        columns = list(EXPORT_COLUMNS)
+
+        def encode(row):
+            return encoder.encode(dict(zip(columns, row))) + "\n"
+
+    chunk = []
+    for row in rows:
+        chunk.append(encode(row))
+        if len(chunk) >= lines_per_chunk:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
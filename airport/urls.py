@@ -9,6 +9,7 @@ from airport.views import (
     CrewViewSet,
     FlightViewSet,
     OrderViewSet,
+    OrderJobViewSet,
     TicketViewSet
 )
 
@@ -21,6 +22,7 @@ router.register("routes", RouteViewSet)
 router.register("crews", CrewViewSet)
 router.register("flights", FlightViewSet)
 router.register("orders", OrderViewSet)
+router.register("order_jobs", OrderJobViewSet)
 router.register("tickets", TicketViewSet)
 
 urlpatterns = [path("", include(router.urls))]
@@ -1,12 +1,16 @@
-from datetime import datetime
+from datetime import datetime, time, timedelta
 
+from django.conf import settings
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import status, mixins
 from rest_framework.decorators import action
 from rest_framework.exceptions import ParseError
 from rest_framework.pagination import PageNumberPagination
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
@@ -18,6 +22,7 @@ from airport.models import (
     Crew,
     Flight,
     Order,
+    OrderJob,
     Ticket
 )
 from airport.serializers import (
@@ -35,12 +40,34 @@ from airport.serializers import (
     RouteRetrieveSerializer,
     OrderListSerializer,
     OrderRetrieveSerializer,
+    OrderJobSerializer,
     FlightListSerializer,
     FlightRetrieveSerializer,
     TicketListSerializer,
     TicketRetrieveSerializer,
     AirportImageSerializer,
+    ItinerarySerializer,
+    RouteAvailabilitySerializer,
 )
+from airport.idempotency import IDEMPOTENCY_HEADER, idempotent_response
+from airport.image_pipeline import schedule_airport_image
+from airport.itinerary import (
+    MAX_LEGS,
+    SORT_KEYS,
+    get_flight_index,
+    with_seats_available,
+)
+from airport.order_queue import enqueue_order
+from airport.pagination import KeysetPagination
+from airport.throttling import OrderCreateRateThrottle, SearchRateThrottle
+from airport.ticket_export import (
+    CONTENT_TYPES,
+    EXPORT_FORMATS,
+    export_rows,
+    format_rows
+)
+
+ROUTE_AVAILABILITY_CACHE_TIMEOUT = 60
 
 
 class AirplaneTypeViewSet(
@@ -82,6 +109,7 @@ class AirportViewSet(
     GenericViewSet,
 ):
     queryset = Airport.objects.all()
+    pagination_class = KeysetPagination
 
     def get_serializer_class(self):
         if self.action == "upload_image":
@@ -99,7 +127,8 @@ class AirportViewSet(
         serializer = self.get_serializer(airport, data=request.data)
 
         if serializer.is_valid():
-            serializer.save()
+            airport = serializer.save(image_variants={})
+            schedule_airport_image(airport)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -112,6 +141,7 @@ class RouteViewSet(
     GenericViewSet,
 ):
     queryset = Route.objects.all()
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         queryset = self.queryset
@@ -125,9 +155,62 @@ class RouteViewSet(
             return RouteListSerializer
         if self.action == "retrieve":
             return RouteRetrieveSerializer
+        if self.action == "availability":
+            return RouteAvailabilitySerializer
 
         return RouteSerializer
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "month",
+                type=OpenApiTypes.STR,
+                required=True,
+                description="Calendar month (ex. ?month=2025-02)",
+            ),
+        ]
+    )
+    @action(
+        detail=True,
+        methods=["GET"],
+        url_path="availability",
+    )
+    def availability(self, request, pk=None):
+        """Endpoint for per-day flights and seat availability in a month"""
+        try:
+            month = datetime.strptime(
+                request.query_params.get("month", ""),
+                "%Y-%m"
+            ).date()
+        except ValueError:
+            raise ParseError("Invalid format for month. Use YYYY-MM.")
+
+        route = self.get_object()
+        cache_key = f"airport:route_availability:{route.id}:{month:%Y-%m}"
+        days = cache.get(cache_key)
+        if days is None:
+            next_month = (month + timedelta(days=32)).replace(day=1)
+            flights = Flight.objects.filter(
+                route=route,
+                departure_time__gte=timezone.make_aware(
+                    datetime.combine(month, time.min)
+                ),
+                departure_time__lt=timezone.make_aware(
+                    datetime.combine(next_month, time.min)
+                ),
+            )
+            days = self.get_serializer(
+                flights.availability_by_day(),
+                many=True
+            ).data
+            cache.set(cache_key, days, ROUTE_AVAILABILITY_CACHE_TIMEOUT)
+
+        return Response({
+            "route": route.id,
+            "month": f"{month:%Y-%m}",
+            "days": days,
+        })
+
 
 class CrewViewSet(
     mixins.CreateModelMixin,
@@ -135,6 +218,7 @@ class CrewViewSet(
     GenericViewSet,
 ):
     queryset = Crew.objects.all()
+    pagination_class = KeysetPagination
     serializer_class = CrewSerializer
 
 
@@ -145,21 +229,22 @@ class FlightViewSet(
     GenericViewSet,
 ):
     queryset = Flight.objects.all()
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         queryset = self.queryset
 
         source_id = self.request.query_params.get("source")
         destination_id = self.request.query_params.get("destination")
-        departure_date = self.request.query_params.get("departure_date")
-        arrival_date = self.request.query_params.get("arrival_date")
 
-        if self.action in ("list", "retrieve"):
-            queryset = self.queryset.select_related(
+        if self.action == "list":
+            queryset = queryset.with_availability()
+
+        if self.action == "retrieve":
+            queryset = queryset.select_related(
                 "airplane__airplane_type",
-                "route__source",
-                "route__destination",
-            ).prefetch_related("crew", "tickets")
+                "route",
+            ).prefetch_related("crew")
 
         if source_id:
             queryset = queryset.filter(route__source_id=source_id)
@@ -167,40 +252,40 @@ class FlightViewSet(
         if destination_id:
             queryset = queryset.filter(route__destination_id=destination_id)
 
-        if departure_date:
-            try:
-                departure_date = (
-                    datetime.strptime(departure_date, "%d-%m-%Y")
-                    .date()
-                )
-                queryset = queryset.filter(departure_time__date=departure_date)
-            except ValueError:
-                raise ParseError(
-                    "Invalid format for departure_date. Use DD-MM-YYYY."
+        for field_name, param in (
+            ("departure_time", "departure_date"),
+            ("arrival_time", "arrival_date"),
+        ):
+            date_from, date_to = self.get_date_range_params(param)
+            if date_from:
+                queryset = queryset.filter(
+                    **{f"{field_name}__gte": self.start_of_day(date_from)}
                 )
+            if date_to:
+                queryset = queryset.filter(**{
+                    f"{field_name}__lt": self.start_of_day(
+                        date_to + timedelta(days=1)
+                    )
+                })
 
-        if arrival_date:
-            try:
-                arrival_date = (
-                    datetime.strptime(arrival_date, "%d-%m-%Y")
-                    .date()
-                )
-                queryset = queryset.filter(arrival_time__date=arrival_date)
-            except ValueError:
-                raise ParseError(
-                    "Invalid format for arrival_date. Use DD-MM-YYYY."
-                )
-
-        return queryset.distinct()
+        return queryset
 
     def get_serializer_class(self):
         if self.action == "list":
             return FlightListSerializer
         if self.action == "retrieve":
             return FlightRetrieveSerializer
+        if self.action == "itineraries":
+            return ItinerarySerializer
 
         return FlightSerializer
 
+    def get_throttles(self):
+        throttles = super().get_throttles()
+        if self.action in ("list", "itineraries"):
+            throttles.append(SearchRateThrottle())
+        return throttles
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -219,17 +304,223 @@ class FlightViewSet(
                 description="Filter by departure date "
                             "(ex. ?departure_date=24-02-2022)",
             ),
+            OpenApiParameter(
+                "departure_date_from",
+                type=OpenApiTypes.DATE,
+                description="Filter by departure on or after a date "
+                            "(ex. ?departure_date_from=24-02-2022)",
+            ),
+            OpenApiParameter(
+                "departure_date_to",
+                type=OpenApiTypes.DATE,
+                description="Filter by departure on or before a date "
+                            "(ex. ?departure_date_to=28-02-2022)",
+            ),
             OpenApiParameter(
                 "arrival_date",
                 type=OpenApiTypes.DATE,
                 description="Filter by arrival date "
                             "(ex. ?arrival_date=25-02-2022)",
             ),
+            OpenApiParameter(
+                "arrival_date_from",
+                type=OpenApiTypes.DATE,
+                description="Filter by arrival on or after a date "
+                            "(ex. ?arrival_date_from=25-02-2022)",
+            ),
+            OpenApiParameter(
+                "arrival_date_to",
+                type=OpenApiTypes.DATE,
+                description="Filter by arrival on or before a date "
+                            "(ex. ?arrival_date_to=01-03-2022)",
+            ),
         ]
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @staticmethod
+    def start_of_day(day):
+        return timezone.make_aware(datetime.combine(day, time.min))
+
+    def get_date_param(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+
+        try:
+            return datetime.strptime(value, "%d-%m-%Y").date()
+        except ValueError:
+            raise ParseError(f"Invalid format for {name}. Use DD-MM-YYYY.")
+
+    def get_date_range_params(self, name):
+        """Return the inclusive ``(from, to)`` dates requested for a field.
+
+        They are applied as a half-open ``[from, to + 1 day)`` timestamp
+        range so the indexes on the datetime columns can serve it.
+        """
+        day = self.get_date_param(name)
+        if day:
+            return day, day
+
+        date_from = self.get_date_param(f"{name}_from")
+        date_to = self.get_date_param(f"{name}_to")
+        if date_from and date_to and date_from > date_to:
+            raise ParseError(
+                f"The {name}_from parameter must not be after {name}_to."
+            )
+        return date_from, date_to
+
+    def get_int_param(self, name, default=None, minimum=1, maximum=None):
+        value = self.request.query_params.get(name)
+        if value is None:
+            if default is None:
+                raise ParseError(f"The {name} parameter is required.")
+            return default
+
+        try:
+            value = int(value)
+        except ValueError:
+            raise ParseError(f"Invalid value for {name}. Use an integer.")
+
+        if value < minimum or (maximum is not None and value > maximum):
+            raise ParseError(
+                f"The {name} parameter must be in the range "
+                f"({minimum}, {maximum if maximum is not None else 'inf'})."
+            )
+        return value
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "source",
+                type=OpenApiTypes.INT,
+                required=True,
+                description="Departure airport id (ex. ?source=1)",
+            ),
+            OpenApiParameter(
+                "destination",
+                type=OpenApiTypes.INT,
+                required=True,
+                description="Arrival airport id (ex. ?destination=2)",
+            ),
+            OpenApiParameter(
+                "departure_date",
+                type=OpenApiTypes.DATE,
+                required=True,
+                description="Day of the first departure "
+                            "(ex. ?departure_date=24-02-2022)",
+            ),
+            OpenApiParameter(
+                "max_legs",
+                type=OpenApiTypes.INT,
+                description=f"Maximum number of flights, 1 to {MAX_LEGS} "
+                            f"(default {MAX_LEGS})",
+            ),
+            OpenApiParameter(
+                "min_layover",
+                type=OpenApiTypes.INT,
+                description="Minimum connection time in minutes "
+                            "(default 45)",
+            ),
+            OpenApiParameter(
+                "max_layover",
+                type=OpenApiTypes.INT,
+                description="Maximum connection time in minutes "
+                            "(default 360)",
+            ),
+            OpenApiParameter(
+                "passengers",
+                type=OpenApiTypes.INT,
+                description="Seats needed on every flight (default 1)",
+            ),
+            OpenApiParameter(
+                "sort",
+                type=OpenApiTypes.STR,
+                enum=tuple(SORT_KEYS),
+                description="Rank by total duration or distance "
+                            "(default duration)",
+            ),
+            OpenApiParameter(
+                "limit",
+                type=OpenApiTypes.INT,
+                description="Maximum number of itineraries (default 10)",
+            ),
+        ]
+    )
+    @action(
+        detail=False,
+        methods=["GET"],
+        url_path="itineraries",
+    )
+    def itineraries(self, request):
+        """Endpoint for searching journeys with up to three connections"""
+        source_id = self.get_int_param("source")
+        destination_id = self.get_int_param("destination")
+        max_legs = self.get_int_param(
+            "max_legs",
+            default=MAX_LEGS,
+            maximum=MAX_LEGS
+        )
+        min_layover = self.get_int_param("min_layover", 45, minimum=0)
+        max_layover = self.get_int_param("max_layover", 360, minimum=0)
+        passengers = self.get_int_param("passengers", default=1)
+        limit = self.get_int_param("limit", default=10, maximum=50)
+        sort = request.query_params.get("sort", "duration")
+
+        if sort not in SORT_KEYS:
+            raise ParseError(
+                f"Invalid sort. Use one of: {', '.join(SORT_KEYS)}."
+            )
+        if min_layover > max_layover:
+            raise ParseError(
+                "The min_layover parameter must not exceed max_layover."
+            )
+
+        departure_date = self.get_date_param("departure_date")
+        if departure_date is None:
+            raise ParseError("The departure_date parameter is required.")
+
+        departure_from = self.start_of_day(departure_date)
+        itineraries = get_flight_index().search(
+            source_id,
+            destination_id,
+            departure_from,
+            departure_from + timedelta(days=1),
+            max_legs=max_legs,
+            min_layover=timedelta(minutes=min_layover),
+            max_layover=timedelta(minutes=max_layover),
+            sort=sort,
+        )
+        itineraries = with_seats_available(itineraries, passengers, limit)
+
+        flights = Flight.objects.with_availability().in_bulk({
+            flight_id
+            for itinerary in itineraries
+            for flight_id in itinerary.flight_ids
+        })
+        serializer = self.get_serializer(
+            [
+                {
+                    "legs": [
+                        flights[flight_id]
+                        for flight_id in itinerary.flight_ids
+                    ],
+                    "departure_time": flights[
+                        itinerary.flight_ids[0]
+                    ].departure_time,
+                    "arrival_time": flights[
+                        itinerary.flight_ids[-1]
+                    ].arrival_time,
+                    "total_duration": int(itinerary.duration // 60),
+                    "total_distance": itinerary.distance,
+                }
+                for itinerary in itineraries
+            ],
+            many=True
+        )
+        return Response(serializer.data)
+
 
 class OrderPagination(PageNumberPagination):
     page_size = 10
@@ -248,15 +539,154 @@ class OrderViewSet(
 
     def get_queryset(self):
         queryset = self.queryset
-        if self.action in ("list", "retrieve"):
+        if self.action == "list":
             queryset = queryset.select_related("user").prefetch_related(
                 "tickets__flight__route__source",
                 "tickets__flight__route__destination",
-                "tickets__flight__airplane"
             )
 
+        if self.action == "retrieve":
+            queryset = queryset.prefetch_related("tickets__flight")
+
         return queryset.filter(user=self.request.user)
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                IDEMPOTENCY_HEADER,
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.HEADER,
+                description="Unique key of this order attempt; retries "
+                "with the same key replay the first response",
+            ),
+            OpenApiParameter(
+                "Prefer",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.HEADER,
+                description="respond-async to queue the order and get "
+                "202 Accepted with a status URL",
+            ),
+        ],
+        responses={
+            status.HTTP_201_CREATED: OrderSerializer,
+            status.HTTP_202_ACCEPTED: OrderJobSerializer,
+        },
+    )
+    def create(self, request, *args, **kwargs):
+        if self.wants_async(request):
+            return idempotent_response(request, lambda: self.enqueue(request))
+        return idempotent_response(
+            request,
+            lambda: super(OrderViewSet, self).create(
+                request,
+                *args,
+                **kwargs
+            ),
+        )
+
+    @staticmethod
+    def wants_async(request) -> bool:
+        """Whether to queue the order instead of placing it now"""
+        prefer = request.headers.get("Prefer", "")
+        return settings.ORDER_INTAKE_ASYNC or "respond-async" in prefer
+
+    def enqueue(self, request):
+        """Validate the order, queue it and point to its status"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = enqueue_order(
+            request.user,
+            serializer.validated_data["tickets"]
+        )
+        data = OrderJobSerializer(
+            job,
+            context=self.get_serializer_context()
+        ).data
+        return Response(
+            data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": data["status_url"]},
+        )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "export_format",
+                type=OpenApiTypes.STR,
+                enum=EXPORT_FORMATS,
+                description="csv (default) or jsonl",
+            ),
+            OpenApiParameter(
+                "created_date_from",
+                type=OpenApiTypes.DATE,
+                description="Orders created on or after this day "
+                            "(ex. ?created_date_from=01-02-2025)",
+            ),
+            OpenApiParameter(
+                "created_date_to",
+                type=OpenApiTypes.DATE,
+                description="Orders created on or before this day "
+                            "(ex. ?created_date_to=28-02-2025)",
+            ),
+            OpenApiParameter(
+                "flight",
+                type=OpenApiTypes.INT,
+                description="Only tickets of this flight (ex. ?flight=2)",
+            ),
+        ],
+        responses={(status.HTTP_200_OK, "text/csv"): OpenApiTypes.STR},
+    )
+    @action(
+        detail=False,
+        methods=["GET"],
+        url_path="export",
+        permission_classes=(IsAdminUser,),
+        pagination_class=None,
+    )
+    def export(self, request):
+        """Stream all tickets with their order, user, flight and route"""
+        params = request.query_params
+        export_format = params.get("export_format", "csv")
+        if export_format not in EXPORT_FORMATS:
+            raise ParseError(
+                "Invalid value for export_format. Use csv or jsonl."
+            )
+
+        dates = {}
+        for name in ("created_date_from", "created_date_to"):
+            try:
+                dates[name] = params.get(name) and datetime.strptime(
+                    params[name],
+                    "%d-%m-%Y"
+                ).date()
+            except ValueError:
+                raise ParseError(
+                    f"Invalid format for {name}. Use DD-MM-YYYY."
+                )
+
+        flight_id = params.get("flight")
+        if flight_id is not None:
+            if not flight_id.isdigit() or int(flight_id) < 1:
+                raise ParseError(
+                    "Invalid value for flight. Use a positive integer."
+                )
+            flight_id = int(flight_id)
+
+        rows = export_rows(
+            created_from=dates["created_date_from"],
+            created_to=dates["created_date_to"],
+            flight_id=flight_id,
+        )
+        response = StreamingHttpResponse(
+            format_rows(rows, export_format),
+            content_type=CONTENT_TYPES[export_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="tickets-{timezone.now():%Y%m%d}'
+            f'.{export_format}"'
+        )
+        return response
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
@@ -268,6 +698,21 @@ class OrderViewSet(
 
         return OrderSerializer
 
+    def get_throttles(self):
+        throttles = super().get_throttles()
+        if self.action == "create":
+            throttles.append(OrderCreateRateThrottle())
+        return throttles
+
+
+class OrderJobViewSet(mixins.RetrieveModelMixin, GenericViewSet):
+    queryset = OrderJob.objects.all()
+    serializer_class = OrderJobSerializer
+    permission_classes = (IsAuthenticated,)
+
+    def get_queryset(self):
+        return self.queryset.filter(user=self.request.user)
+
 
 class TicketViewSet(
     mixins.ListModelMixin,
@@ -275,16 +720,12 @@ class TicketViewSet(
     GenericViewSet,
 ):
     queryset = Ticket.objects.all()
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         queryset = self.queryset
         if self.action in ("list", "retrieve"):
-            queryset = queryset.select_related(
-                "order__user",
-                "flight__route__source",
-                "flight__route__destination",
-                "flight__airplane"
-            )
+            queryset = queryset.select_related("flight")
 
         return queryset.filter(order__user=self.request.user)
 
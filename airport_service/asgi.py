@@ -9,8 +9,17 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_service.settings")
+os.environ.setdefault(
+    "DJANGO_SETTINGS_MODULE",
+    "airport_service.settings.prod"
+)
 
 application = get_asgi_application()
+
+if settings.WARMUP_ON_STARTUP:
+    from airport_service.health import warmup
+
+    warmup.start()
@@ -0,0 +1,224 @@
+import hashlib
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+# Models whose reads may be served by a replica. Orders, tickets, users
+# and everything else always stay on the primary.
+REPLICA_MODELS = {
+    "airport.airplanetype",
+    "airport.airplane",
+    "airport.airport",
+    "airport.route",
+    "airport.crew",
+    "airport.flight",
+}
+
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery()
+            OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+        THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+
+class ReplicaRead:
+    """Replica choice of the current request, made on its first read"""
+
+    __slots__ = ("enabled", "alias")
+
+    def __init__(self):
+        self.enabled = True
+        self.alias = None
+
+
+_replica_read = ContextVar("replica_read", default=None)
+
+
+class ReplicaHealth:
+    """Track which replicas are reachable and close enough to primary.
+
+    Replicas are probed at most once per
+    ``REPLICA_HEALTH_CHECK_INTERVAL`` seconds per process. A replica that
+    fails a probe or a request is ejected until the next probe passes.
+    """
+
+    def __init__(self):
+        self.ejected = set()
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+
+    def check(self, alias: str) -> bool:
+        try:
+            with connections[alias].cursor() as cursor:
+                if connections[alias].vendor != "postgresql":
+                    cursor.execute("SELECT 1")
+                    return True
+                cursor.execute(REPLICA_LAG_SQL)
+                (lag,) = cursor.fetchone()
+        except DatabaseError:
+            return False
+        return float(lag or 0) <= settings.REPLICA_MAX_LAG
+
+    def healthy(self, aliases: list[str]) -> list[str]:
+        now = time.monotonic()
+        if (
+            now - self.checked_at >= settings.REPLICA_HEALTH_CHECK_INTERVAL
+            and self.lock.acquire(blocking=False)
+        ):
+            try:
+                self.checked_at = now
+                self.ejected = {
+                    alias for alias in aliases if not self.check(alias)
+                }
+            finally:
+                self.lock.release()
+        return [alias for alias in aliases if alias not in self.ejected]
+
+    def eject(self, alias: str) -> None:
+        self.ejected = self.ejected | {alias}
+
+
+replica_health = ReplicaHealth()
+
+
+class ReplicaRouter:
+    """Send catalog reads of safe requests to a healthy replica"""
+
+    def db_for_read(self, model, **hints):
+        state = _replica_read.get()
+        if (
+            state is None
+            or not state.enabled
+            or model._meta.label_lower not in REPLICA_MODELS
+        ):
+            return "default"
+
+        if state.alias is None:
+            replicas = replica_health.healthy(settings.REPLICA_DATABASES)
+            state.alias = random.choice(replicas) if replicas else "default"
+        return state.alias
+
+    def db_for_write(self, model, **hints):
+        # Reads after a write in the same request must see that write.
+        state = _replica_read.get()
+        if state is not None:
+            state.enabled = False
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+def pin_key(request) -> str | None:
+    """Identify the client whose writes must be readable right away"""
+    credentials = request.headers.get("Authorization") or request.COOKIES.get(
+        settings.SESSION_COOKIE_NAME
+    )
+    if not credentials:
+        return None
+    return (
+        "db:primary_pin:"
+        + hashlib.sha256(credentials.encode()).hexdigest()
+    )
+
+
+class ReplicaMiddleware:
+    """Allow replica reads for GET and HEAD requests.
+
+    Clients that made a successful write are pinned to the primary for
+    ``REPLICA_PIN_SECONDS``, long enough for replicas to catch up, so
+    they always read their own writes. The pin lives in the default
+    cache, so it only holds across workers when that cache is shared.
+    """
+
+    sync_capable = True
+    async_capable = True
+    safe_methods = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        if settings.REPLICA_DATABASES and not settings.SHARED_CACHE:
+            logger.warning(
+                "Read replicas are enabled without a shared cache; set "
+                "REDIS_URL so clients read their writes on every worker."
+            )
+
+    def replica_read(self, request, pinned) -> ReplicaRead | None:
+        if request.method in self.safe_methods and not pinned:
+            return ReplicaRead()
+        return None
+
+    def pins(self, request, key, response) -> bool:
+        return bool(
+            key
+            and request.method not in self.safe_methods
+            and response.status_code < 400
+        )
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.REPLICA_DATABASES:
+            return self.get_response(request)
+
+        key = pin_key(request)
+        pinned = (
+            request.method in self.safe_methods
+            and key
+            and cache.get(key)
+        )
+        token = _replica_read.set(self.replica_read(request, pinned))
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica_read.reset(token)
+
+        if self.pins(request, key, response):
+            cache.set(key, True, settings.REPLICA_PIN_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.REPLICA_DATABASES:
+            return await self.get_response(request)
+
+        key = pin_key(request)
+        pinned = (
+            request.method in self.safe_methods
+            and key
+            and await cache.aget(key)
+        )
+        token = _replica_read.set(self.replica_read(request, pinned))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _replica_read.reset(token)
+
+        if self.pins(request, key, response):
+            await cache.aset(key, True, settings.REPLICA_PIN_SECONDS)
+        return response
+
+    def process_exception(self, request, exception):
+        state = _replica_read.get()
+        if (
+            isinstance(exception, DatabaseError)
+            and state is not None
+            and state.alias not in (None, "default")
+        ):
+            replica_health.eject(state.alias)
@@ -0,0 +1,142 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+from airport.itinerary import get_flight_index
+from airport.reference_cache import get_reference_data
+
+HEALTH_CACHE_KEY = "health:probe"
+
+_migrations_applied = False
+
+
+def timed(check):
+    """Run a check, adding its duration or turning its error into a failure"""
+    started = time.perf_counter()
+    try:
+        result = check()
+    except Exception as error:
+        result = {"ok": False, "error": str(error)}
+    result["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return result
+
+
+def check_database() -> dict:
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute("SELECT 1")
+    return {"ok": True}
+
+
+def check_migrations() -> dict:
+    """Report unapplied migrations; once none are left, stop looking"""
+    global _migrations_applied
+
+    if not _migrations_applied:
+        executor = MigrationExecutor(connections[DEFAULT_DB_ALIAS])
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        if plan:
+            return {"ok": False, "pending": len(plan)}
+        _migrations_applied = True
+    return {"ok": True, "pending": 0}
+
+
+def check_cache() -> dict:
+    token = uuid.uuid4().hex
+    cache.set(HEALTH_CACHE_KEY, token, 10)
+    return {"ok": cache.get(HEALTH_CACHE_KEY) == token}
+
+
+class Warmup:
+    """Load what the first requests would otherwise load themselves.
+
+    Runs once per process in a background thread; a failed warmup, e.g.
+    before the database is up, is started again by the next readiness
+    check.
+    """
+
+    PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+    def __init__(self):
+        self.state = self.PENDING
+        self.error = None
+        self.seconds = None
+        self.lock = threading.Lock()
+
+    def start(self) -> None:
+        with self.lock:
+            if self.state not in (self.PENDING, self.FAILED):
+                return
+            self.state = self.RUNNING
+        threading.Thread(
+            target=self.run_in_thread,
+            name="warmup",
+            daemon=True,
+        ).start()
+
+    def run_in_thread(self) -> None:
+        try:
+            self.run()
+        finally:
+            connections.close_all()
+
+    def run(self) -> None:
+        self.state = self.RUNNING
+        started = time.perf_counter()
+        try:
+            connections[DEFAULT_DB_ALIAS].ensure_connection()
+            get_reference_data()
+            get_flight_index()
+            # Imported here so that loading the WSGI application does not
+            # pull in drf-spectacular; the warmup thread pays for it.
+            from airport_service.schema import CachedSchemaGenerator
+
+            CachedSchemaGenerator().get_schema(request=None, public=True)
+        except Exception as error:
+            self.error = str(error)
+            self.state = self.FAILED
+        else:
+            self.error = None
+            self.state = self.DONE
+        self.seconds = round(time.perf_counter() - started, 3)
+
+    def report(self) -> dict:
+        return {
+            "ok": self.state == self.DONE,
+            "state": self.state,
+            "seconds": self.seconds,
+            "error": self.error,
+        }
+
+
+warmup = Warmup()
+
+
+def readiness() -> dict:
+    """Run the readiness checks; ready when all of them pass"""
+    warmup.start()
+    database = timed(check_database)
+    if (
+        database["ok"]
+        and database["latency_ms"] > settings.READINESS_DB_MAX_LATENCY_MS
+    ):
+        database["ok"] = False
+        database["error"] = "Database is too slow"
+    checks = {
+        "warmup": warmup.report(),
+        "database": database,
+        "migrations": (
+            timed(check_migrations)
+            if database["ok"]
+            else {"ok": False, "error": "Database is unavailable"}
+        ),
+        "cache": timed(check_cache),
+    }
+    return {
+        "ready": all(check["ok"] for check in checks.values()),
+        "checks": checks,
+    }
@@ -0,0 +1,31 @@
+import threading
+
+from drf_spectacular.generators import SchemaGenerator
+
+# Schema extensions register themselves on import; they are loaded with
+# the generator so workers that never build the schema skip them.
+import user.schema  # noqa: F401,E402
+
+
+class CachedSchemaGenerator(SchemaGenerator):
+    """Generate the public schema once per process.
+
+    The schema only changes with the code, so it is built by the startup
+    warmup, or by the first request, and reused after that.
+    """
+
+    _schemas = {}
+    _lock = threading.Lock()
+
+    def get_schema(self, request=None, public=False):
+        if not public:
+            return super().get_schema(request=request, public=public)
+
+        key = (self.api_version, self.urlconf)
+        with self._lock:
+            if key not in self._schemas:
+                self._schemas[key] = super().get_schema(
+                    request=request,
+                    public=public,
+                )
+            return self._schemas[key]
@@ -0,0 +1,307 @@
+"""
+Django settings shared by the dev and prod profiles of airport_service.
+
+Generated by 'django-admin startproject' using Django 5.1.6.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.1/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/5.1/ref/settings/
+"""
+import copy
+import os
+
+from datetime import timedelta
+from dotenv import load_dotenv
+from pathlib import Path
+
+load_dotenv()
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.getenv("SECRET_KEY")
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = False
+
+ALLOWED_HOSTS = ["127.0.0.1", "localhost"]
+
+# Application definition
+
+INSTALLED_APPS = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+    "rest_framework",
+    "airport",
+    "user",
+    "drf_spectacular"
+]
+
+AUTH_USER_MODEL = "user.User"
+
+MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "airport_service.db_routing.ReplicaMiddleware",
+]
+
+ROOT_URLCONF = "airport_service.urls"
+
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [],
+        "APP_DIRS": True,
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.debug",
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+                "django.contrib.messages.context_processors.messages",
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = "airport_service.wsgi.application"
+
+
+# Database
+# https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.getenv("POSTGRES_DB"),
+        "USER": os.getenv("POSTGRES_USER"),
+        "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
+        "HOST": os.getenv("POSTGRES_HOST"),
+        "PORT": os.getenv("POSTGRES_PORT"),
+        "CONN_HEALTH_CHECKS": True,
+    }
+}
+
+# With DB_POOL=True every process keeps a psycopg connection pool per
+# database: connections are health-checked on checkout and recycled after
+# DB_POOL_MAX_IDLE idle or DB_POOL_MAX_LIFETIME total seconds. Otherwise
+# connections persist for CONN_MAX_AGE seconds between requests.
+if os.getenv("DB_POOL", "") == "True":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+            "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", 300)),
+            "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", 3600)),
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+        },
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("CONN_MAX_AGE", 60))
+
+# Read replicas as comma-separated "host[:port]" entries, e.g.
+# POSTGRES_REPLICA_HOSTS=replica1:5432,replica2. Catalog reads of safe
+# requests go to them through airport_service.db_routing.
+REPLICA_DATABASES = []
+for index, replica in enumerate(
+    filter(None, os.getenv("POSTGRES_REPLICA_HOSTS", "").split(",")),
+    start=1,
+):
+    host, _, port = replica.strip().partition(":")
+    alias = f"replica_{index}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "OPTIONS": copy.deepcopy(DATABASES["default"].get("OPTIONS", {})),
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ["airport_service.db_routing.ReplicaRouter"]
+
+# Seconds a client reads from the primary after a write.
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", 5))
+
+# Replicas lagging more than this many seconds are ejected.
+REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", 10))
+
+REPLICA_HEALTH_CHECK_INTERVAL = 5
+
+
+# Password validation
+# https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        "NAME": "django.contrib.auth.password_validation."
+                "UserAttributeSimilarityValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation."
+                "MinimumLengthValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation."
+                "CommonPasswordValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation."
+                "NumericPasswordValidator",
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/5.1/topics/i18n/
+
+LANGUAGE_CODE = "en-us"
+
+TIME_ZONE = "UTC"
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/5.1/howto/static-files/
+
+STATIC_URL = "static/"
+
+MEDIA_ROOT = "/files/media"
+
+MEDIA_URL = "/media/"
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+    "airport_images": {
+        "BACKEND": "airport.storage.ContentAddressedStorage",
+    },
+}
+
+# Hand media downloads to the web server: "x-accel-redirect" (nginx, with
+# an internal location at MEDIA_ACCEL_PREFIX aliased to MEDIA_ROOT) or
+# "x-sendfile" (Apache, lighttpd). Empty serves files from Python.
+MEDIA_OFFLOAD = os.getenv("MEDIA_OFFLOAD", "")
+MEDIA_ACCEL_PREFIX = os.getenv("MEDIA_ACCEL_PREFIX", "/protected-media/")
+
+# Uploaded airport images are normalized and thumbnailed by a thread pool
+# of IMAGE_PROCESSING_WORKERS per process; eager mode processes them on
+# commit in the request thread instead.
+IMAGE_PROCESSING_WORKERS = int(os.getenv("IMAGE_PROCESSING_WORKERS", "2"))
+IMAGE_PROCESSING_EAGER = os.getenv("IMAGE_PROCESSING_EAGER", "") == "True"
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+REST_FRAMEWORK = {
+    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DATETIME_FORMAT": "%d-%m-%Y %H:%M:%S",
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "user.authentication.ClaimsJWTAuthentication",
+    ],
+    "DEFAULT_PERMISSION_CLASSES": [
+        "user.permissions.IsAdminOrIfAuthenticatedReadOnly"
+    ],
+    "DEFAULT_THROTTLE_CLASSES": [
+        "airport.throttling.SlidingWindowAnonRateThrottle",
+        "airport.throttling.SlidingWindowUserRateThrottle"
+    ],
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "100/day",
+        "user": "1000/day",
+        "search": os.getenv("THROTTLE_SEARCH_RATE", "120/min"),
+        "order_create": os.getenv("THROTTLE_ORDER_CREATE_RATE", "20/min"),
+    }
+}
+
+# Throttle counters live in the cache, shared by all workers once
+# REDIS_URL points them at Redis, or in the database ("database").
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+
+# Without Redis every worker process has its own cache, so entries
+# invalidated by one worker stay stale in the others until they expire.
+SHARED_CACHE = bool(os.getenv("REDIS_URL"))
+
+# Ticket writes retire cached seat maps; the next read rebuilds them.
+SEAT_MAP_CACHE_TIMEOUT = 60 * 60 if SHARED_CACHE else 10
+
+# Workers reload airport, airplane and route names when the version shared
+# through the cache moves, and at least this often (seconds).
+REFERENCE_DATA_MAX_AGE = 60 * 60 if SHARED_CACHE else 30
+
+THROTTLE_STORE = os.getenv("THROTTLE_STORE", "cache")
+THROTTLE_CACHE_ALIAS = "default"
+
+SPECTACULAR_SETTINGS = {
+    "TITLE": "Airport Service API",
+    "DESCRIPTION": "Order airport tickets",
+    "VERSION": "1.0.0",
+    "SERVE_INCLUDE_SCHEMA": False,
+    "DEFAULT_GENERATOR_CLASS": "airport_service.schema.CachedSchemaGenerator",
+    "SWAGGER_UI_SETTINGS": {
+        "deepLinking": True,
+        "defaultModelRendering": "model",
+        "defaultModelsExpandDepth": 2,
+        "defaultModelExpandDepth": 2,
+    },
+}
+
+# Threads per process that handle the async read endpoints under ASGI.
+ASYNC_READ_WORKERS = int(os.getenv("ASYNC_READ_WORKERS", "16"))
+
+# Queue POST /orders/ for the process_order_jobs workers and answer with
+# 202 Accepted; clients may also opt in with "Prefer: respond-async".
+ORDER_INTAKE_ASYNC = os.getenv("ORDER_INTAKE_ASYNC", "") == "True"
+
+# Web workers load reference data, the flight index and the OpenAPI schema
+# in the background on startup; /readyz answers 503 until they are done or
+# when a database round trip takes over READINESS_DB_MAX_LATENCY_MS.
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "True") == "True"
+READINESS_DB_MAX_LATENCY_MS = float(
+    os.getenv("READINESS_DB_MAX_LATENCY_MS", "500")
+)
+
+SIMPLE_JWT = {
+    "ACCESS_TOKEN_LIFETIME": timedelta(minutes=100),
+    "REFRESH_TOKEN_LIFETIME": timedelta(days=3),
+    "ROTATE_REFRESH_TOKENS": False,
+    "TOKEN_OBTAIN_SERIALIZER": "user.serializers.TokenObtainPairSerializer",
+}
+
+# Read requests trust the user claims of access tokens; each process
+# re-checks a user's token version at most once per JWT_USER_STATE_TTL
+# seconds, remembering up to JWT_USER_STATE_CACHE_SIZE users.
+JWT_USER_STATE_TTL = float(os.getenv("JWT_USER_STATE_TTL", "30"))
+JWT_USER_STATE_CACHE_SIZE = int(
+    os.getenv("JWT_USER_STATE_CACHE_SIZE", "10000")
+)
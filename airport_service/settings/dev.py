@@ -0,0 +1,19 @@
+"""
+Development settings: debug mode and the debug toolbar.
+"""
+import os
+
+from airport_service.settings.base import *  # noqa: F401,F403
+from airport_service.settings.base import INSTALLED_APPS, MIDDLEWARE
+
+DEBUG = os.getenv("DEBUG", "") != "False"
+
+INTERNAL_IPS = ["127.0.0.1", ]
+
+INSTALLED_APPS = [*INSTALLED_APPS, "debug_toolbar"]
+
+MIDDLEWARE = [
+    MIDDLEWARE[0],
+    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    *MIDDLEWARE[1:],
+]
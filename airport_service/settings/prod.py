@@ -0,0 +1,39 @@
+"""
+Production settings: no debug tooling and cached templates.
+"""
+import os
+
+from airport_service.settings.base import *  # noqa: F401,F403
+from airport_service.settings.base import ALLOWED_HOSTS, TEMPLATES
+
+DEBUG = False
+
+# Comma-separated, e.g. ALLOWED_HOSTS=api.example.com,10.0.0.5
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.getenv("ALLOWED_HOSTS", "").split(",")
+    if host.strip()
+] or ALLOWED_HOSTS
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        "APP_DIRS": False,
+        "OPTIONS": {
+            "context_processors": [
+                processor
+                for processor in TEMPLATES[0]["OPTIONS"]["context_processors"]
+                if processor != "django.template.context_processors.debug"
+            ],
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
+        },
+    },
+]
@@ -15,31 +15,57 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import path, include
-from debug_toolbar.toolbar import debug_toolbar_urls
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularRedocView,
-    SpectacularSwaggerView
+from django.urls import path, include, re_path
+
+from airport_service.views import (
+    DatabasePoolView,
+    healthz,
+    lazy_view,
+    readyz,
+    serve_media
 )
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/airport/", include("airport.urls"), name="airport"),
+    path(
+        "api/v1/airport/async/",
+        include("airport.async_urls"),
+        name="airport-async"
+    ),
     path("api/v1/user/", include("user.urls"), name="user"),
-    path("api/v1/doc/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/v1/db-pool/", DatabasePoolView.as_view(), name="db-pool"),
+    path("healthz", healthz, name="healthz"),
+    path("readyz", readyz, name="readyz"),
+    re_path(
+        rf"^{settings.MEDIA_URL.strip('/')}/(?P<path>.*)$",
+        serve_media,
+        name="media"
+    ),
+    path(
+        "api/v1/doc/",
+        lazy_view("drf_spectacular.views.SpectacularAPIView"),
+        name="schema"
+    ),
     path(
         "api/v1/doc/swagger/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
+        lazy_view(
+            "drf_spectacular.views.SpectacularSwaggerView",
+            url_name="schema"
+        ),
         name="swagger-ui"
     ),
     path(
         "api/v1/doc/redoc/",
-        SpectacularRedocView.as_view(url_name="schema"),
+        lazy_view(
+            "drf_spectacular.views.SpectacularRedocView",
+            url_name="schema"
+        ),
         name="redoc"
     ),
-] + debug_toolbar_urls()
+]
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# The toolbar views answer 404 unless the toolbar is shown, i.e. with DEBUG.
+if "debug_toolbar" in settings.INSTALLED_APPS:
+    urlpatterns.append(path("__debug__/", include("debug_toolbar.urls")))
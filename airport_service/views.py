@@ -0,0 +1,222 @@
+import mimetypes
+import posixpath
+import re
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db import connections
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse
+)
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.utils.module_loading import import_string
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_safe
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from airport_service.health import readiness
+
+
+def database_pool_stats(connection) -> dict:
+    """Summarize the connection pool of one database alias"""
+    pool = getattr(connection, "pool", None)
+    if pool is None:
+        return {
+            "pooled": False,
+            "conn_max_age": connection.settings_dict["CONN_MAX_AGE"],
+        }
+
+    stats = pool.get_stats()
+    in_use = stats["pool_size"] - stats["pool_available"]
+    checkouts = stats.get("requests_num", 0)
+    return {
+        "pooled": True,
+        "min_size": stats["pool_min"],
+        "max_size": stats["pool_max"],
+        "size": stats["pool_size"],
+        "available": stats["pool_available"],
+        "in_use": in_use,
+        "utilization": round(in_use / stats["pool_max"], 3),
+        "waiting": stats["requests_waiting"],
+        "checkouts": checkouts,
+        "queued_checkouts": stats.get("requests_queued", 0),
+        "avg_checkout_wait_ms": round(
+            stats.get("requests_wait_ms", 0) / checkouts, 3
+        ) if checkouts else 0.0,
+        "checkout_errors": stats.get("requests_errors", 0),
+        "bad_returns": stats.get("returns_bad", 0),
+        "connections_opened": stats.get("connections_num", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+    }
+
+
+class DatabasePoolView(APIView):
+    """Connection pool usage of the worker process serving the request"""
+
+    permission_classes = (IsAdminUser,)
+
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    def get(self, request):
+        return Response({
+            alias: database_pool_stats(connections[alias])
+            for alias in connections
+        })
+
+
+def lazy_view(view_path: str, **initkwargs):
+    """Import a class-based view on its first request, not at startup"""
+    view = None
+
+    def dispatch(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(view_path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    return dispatch
+
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Return the inclusive byte range of a single-range ``Range`` header.
+
+    Malformed and multi-range headers return None, so the whole file is
+    sent. Unsatisfiable ranges start at or past ``size``.
+    """
+    match = RANGE_RE.match(header)
+    if match is None or match[1] == match[2] == "":
+        return None
+
+    if match[1] == "":
+        suffix = int(match[2])
+        start = max(size - suffix, 0) if suffix else size
+        return start, size - 1
+
+    start = int(match[1])
+    end = int(match[2]) if match[2] else size - 1
+    if match[2] and end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def read_range(path: Path, start: int, length: int):
+    with path.open("rb") as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(FileResponse.block_size, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def media_response(request, path: str, fullpath: Path, size: int, validators):
+    """Send the file, the requested byte range of it, or hand it off"""
+    if settings.MEDIA_OFFLOAD == "x-accel-redirect":
+        response = HttpResponse()
+        response.headers["X-Accel-Redirect"] = quote(
+            settings.MEDIA_ACCEL_PREFIX + path
+        )
+        return response
+    if settings.MEDIA_OFFLOAD == "x-sendfile":
+        response = HttpResponse()
+        response.headers["X-Sendfile"] = str(fullpath)
+        return response
+
+    byte_range = None
+    if_range = request.headers.get("If-Range")
+    if "Range" in request.headers and (
+        if_range is None or if_range in validators
+    ):
+        byte_range = parse_range(request.headers["Range"], size)
+    if byte_range is None:
+        return FileResponse(fullpath.open("rb"))
+
+    start, end = byte_range
+    if start >= size:
+        response = HttpResponse(status=416)
+        response.headers["Content-Range"] = f"bytes */{size}"
+        return response
+
+    response = StreamingHttpResponse(
+        read_range(fullpath, start, end - start + 1),
+        status=206,
+    )
+    response.headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response.headers["Content-Length"] = str(end - start + 1)
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """Serve an uploaded file with validators and byte ranges.
+
+    With ``MEDIA_OFFLOAD`` set, only the validators are checked here and
+    the web server sends the bytes.
+    """
+    path = posixpath.normpath(path).lstrip("/")
+    fullpath = Path(safe_join(settings.MEDIA_ROOT, path))
+    if not fullpath.is_file():
+        raise Http404("File not found")
+
+    stat = fullpath.stat()
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=last_modified,
+    )
+    if response is None:
+        response = media_response(
+            request,
+            path,
+            fullpath,
+            stat.st_size,
+            (etag, http_date(last_modified)),
+        )
+
+    content_type, encoding = mimetypes.guess_type(path)
+    response.headers["Content-Type"] = (
+        content_type or "application/octet-stream"
+    )
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = http_date(last_modified)
+    response.headers["Accept-Ranges"] = "bytes"
+    return response
+
+
+@never_cache
+@require_safe
+def healthz(request):
+    """Liveness: the process answers requests"""
+    return JsonResponse({"status": "ok"})
+
+
+@never_cache
+@require_safe
+def readyz(request):
+    """Readiness: warmed up, with the database, schema and cache usable"""
+    report = readiness()
+    return JsonResponse(
+        {
+            "status": "ok" if report["ready"] else "unavailable",
+            "checks": report["checks"],
+        },
+        status=200 if report["ready"] else 503,
+    )
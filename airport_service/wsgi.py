@@ -9,8 +9,17 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_service.settings")
+os.environ.setdefault(
+    "DJANGO_SETTINGS_MODULE",
+    "airport_service.settings.prod"
+)
 
 application = get_wsgi_application()
+
+if settings.WARMUP_ON_STARTUP:
+    from airport_service.health import warmup
+
+    warmup.start()
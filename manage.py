@@ -6,7 +6,10 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "airport_service.settings")
+    os.environ.setdefault(
+        "DJANGO_SETTINGS_MODULE",
+        "airport_service.settings.dev"
+    )
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
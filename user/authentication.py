@@ -0,0 +1,151 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from user.tokens import EMAIL_CLAIM, IS_STAFF_CLAIM, TOKEN_VERSION_CLAIM
+
+USER_CLAIMS = (EMAIL_CLAIM, IS_STAFF_CLAIM, TOKEN_VERSION_CLAIM)
+
+
+class UserStateCache:
+    """Bounded LRU of ``(token_version, is_active, is_staff)`` per user.
+
+    Entries are trusted for ``JWT_USER_STATE_TTL`` seconds, so a revoked
+    token keeps working on read requests of other processes for at most
+    that long.
+    """
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id):
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            checked_at, state = entry
+            if time.monotonic() - checked_at >= settings.JWT_USER_STATE_TTL:
+                del self.entries[user_id]
+                return None
+            self.entries.move_to_end(user_id)
+            return state
+
+    def set(self, user_id, state) -> None:
+        with self.lock:
+            self.entries[user_id] = (time.monotonic(), state)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > settings.JWT_USER_STATE_CACHE_SIZE:
+                self.entries.popitem(last=False)
+
+    def discard(self, user_id) -> None:
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+user_states = UserStateCache()
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """Authenticate read requests from the token claims alone.
+
+    Safe methods get an unsaved user built from the signed id, email and
+    is_staff claims, checked against a cached token version instead of
+    loading the row. Writes, and tokens issued without the claims, load
+    the user from the database as ``JWTAuthentication`` does.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        if request.method in SAFE_METHODS and all(
+            claim in validated_token for claim in USER_CLAIMS
+        ):
+            return self.get_token_user(validated_token), validated_token
+
+        return self.get_user(validated_token), validated_token
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        user_states.set(
+            user.pk,
+            (user.token_version, user.is_active, user.is_staff)
+        )
+        self.check_claims(validated_token, user.token_version, user.is_staff)
+        return user
+
+    def get_token_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        state = user_states.get(user_id)
+        if state is None:
+            state = (
+                self.user_model.objects.filter(pk=user_id)
+                .values_list("token_version", "is_active", "is_staff")
+                .first()
+            )
+            if state is None:
+                raise AuthenticationFailed(
+                    _("User not found"),
+                    code="user_not_found"
+                )
+            user_states.set(user_id, state)
+
+        token_version, is_active, is_staff = state
+        if api_settings.CHECK_USER_IS_ACTIVE and not is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"),
+                code="user_inactive"
+            )
+        self.check_claims(validated_token, token_version, is_staff)
+
+        user = self.user_model(
+            pk=user_id,
+            email=validated_token[EMAIL_CLAIM],
+            is_staff=is_staff,
+            token_version=token_version,
+        )
+        user._state.adding = False
+        return user
+
+    def get_user_id(self, validated_token):
+        try:
+            return self.user_model._meta.pk.to_python(
+                validated_token[api_settings.USER_ID_CLAIM]
+            )
+        except (KeyError, ValidationError):
+            raise AuthenticationFailed(
+                _("Token contained no recognizable user identification"),
+                code="token_not_valid"
+            )
+
+    @staticmethod
+    def check_claims(validated_token, token_version, is_staff) -> None:
+        """Reject tokens issued before a password or staff status change"""
+        claimed_version = validated_token.get(TOKEN_VERSION_CLAIM)
+        claimed_staff = validated_token.get(IS_STAFF_CLAIM, is_staff)
+        if claimed_version is None:
+            return
+        if claimed_version != token_version or claimed_staff != is_staff:
+            raise AuthenticationFailed(
+                _("Token has been revoked"),
+                code="token_revoked"
+            )
@@ -40,6 +40,7 @@ class UserManager(BaseUserManager):
 class User(AbstractUser):
     username = None
     email = models.EmailField(_("email address"), unique=True)
+    token_version = models.PositiveIntegerField(default=0, editable=False)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
@@ -53,3 +54,31 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.email
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        user._loaded_email = user.__dict__.get("email")
+        return user
+
+    def save(self, *args, **kwargs):
+        """Revoke issued tokens when the password or email changes.
+
+        Read requests take the email from the token claims, so tokens
+        carrying the old address must stop working.
+        """
+        update_fields = kwargs.get("update_fields")
+        loaded_email = getattr(self, "_loaded_email", None)
+        email_changed = (
+            loaded_email is not None
+            and loaded_email != self.email
+            and (update_fields is None or "email" in update_fields)
+        )
+        if (
+            self._password is not None or email_changed
+        ) and not self._state.adding:
+            self.token_version += 1
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "token_version"}
+        super().save(*args, **kwargs)
+        self._loaded_email = self.email
@@ -1,3 +1,197 @@
-from django.test import TestCase
+import os
+import time
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from airport.tests.base_functions import sample_flight, sample_user
+from airport.views import FlightViewSet
+from user.authentication import ClaimsJWTAuthentication, user_states
+from user.tokens import AccessToken
+
+TOKEN_URL = reverse("user:token_obtain_pair")
+ME_URL = reverse("user:manage")
+FLIGHT_URL = reverse("airport:flight-list")
+
+
+class ClaimsJWTAuthenticationTests(TestCase):
+    """Test read requests authenticate from token claims"""
+
+    def setUp(self):
+        cache.clear()
+        user_states.clear()
+        self.user = sample_user()
+        self.client = APIClient()
+        self.authorize(AccessToken.for_user(self.user))
+
+    def authorize(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_obtained_tokens_carry_claims(self):
+        """Test the token endpoint signs the user claims"""
+        res = APIClient().post(
+            TOKEN_URL,
+            {"email": self.user.email, "password": "testpassword"}
+        )
+
+        token = AccessToken(res.data["access"])
+        self.assertEqual(token["email"], self.user.email)
+        self.assertFalse(token["is_staff"])
+        self.assertEqual(token["token_version"], self.user.token_version)
+
+    def test_reads_skip_user_query(self):
+        """Test only the first read checks the token version"""
+        with self.assertNumQueries(1):
+            self.client.get(ME_URL)
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["id"], self.user.id)
+        self.assertEqual(res.data["email"], self.user.email)
+
+    def test_writes_load_user(self):
+        """Test writes get the stored user"""
+        user = sample_user(is_staff=True)
+        self.authorize(AccessToken.for_user(user))
+
+        res = self.client.patch(ME_URL, {"password": "newpassword"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertTrue(user.check_password("newpassword"))
+        self.assertEqual(user.token_version, 1)
+
+    def test_password_change_revokes_tokens(self):
+        """Test tokens issued before a password change are rejected"""
+        self.client.get(ME_URL)
+        self.user.set_password("newpassword")
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(res.data["code"], "token_revoked")
+
+    def test_email_change_revokes_tokens(self):
+        """Test tokens claiming the old email are rejected"""
+        self.client.get(ME_URL)
+
+        self.user.email = "new@test.com"
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(res.data["code"], "token_revoked")
+
+        self.user.refresh_from_db()
+        self.authorize(AccessToken.for_user(self.user))
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.data["email"], "new@test.com")
+
+    def test_password_rehash_keeps_tokens(self):
+        """Test upgrading a password hash on login does not revoke tokens"""
+        with mock.patch(
+            "django.contrib.auth.hashers.PBKDF2PasswordHasher.must_update",
+            return_value=True,
+        ):
+            self.assertTrue(self.user.check_password("testpassword"))
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.token_version, 0)
+
+    def test_staff_change_revokes_tokens(self):
+        """Test claims no longer matching the user are rejected"""
+        self.user.is_staff = True
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_inactive_user_rejected(self):
+        """Test deactivated users cannot read"""
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_tokens_without_claims_load_user(self):
+        """Test tokens issued before the claims existed still work"""
+        self.authorize(tokens.AccessToken.for_user(self.user))
+
+        with self.assertNumQueries(1):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    @override_settings(JWT_USER_STATE_CACHE_SIZE=2)
+    def test_state_cache_bounded(self):
+        """Test the least recently used users are evicted"""
+        for user_id in range(3):
+            user_states.set(user_id, (0, True, False))
+
+        self.assertIsNone(user_states.get(0))
+        self.assertIsNotNone(user_states.get(2))
+
+    @override_settings(JWT_USER_STATE_TTL=0)
+    def test_state_cache_expires(self):
+        """Test every read checks the token version without a TTL"""
+        self.client.get(ME_URL)
+
+        with self.assertNumQueries(1):
+            self.client.get(ME_URL)
+
+
+@skipUnless(os.getenv("RUN_BENCHMARKS"), "Set RUN_BENCHMARKS=1 to run.")
+@mock.patch.dict(
+    api_settings.DEFAULT_THROTTLE_RATES,
+    {"user": None, "search": None}
+)
+class FlightListAuthenticationBenchmark(TestCase):
+    """Compare loading the user with trusting the token claims"""
+
+    requests_count = 1000
+
+    def setUp(self):
+        cache.clear()
+        user_states.clear()
+        sample_flight()
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(sample_user())}"
+        )
+
+    def measure(self, authentication_class):
+        with mock.patch.object(
+            FlightViewSet,
+            "authentication_classes",
+            [authentication_class],
+        ):
+            self.client.get(FLIGHT_URL)
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                for _ in range(self.requests_count):
+                    self.client.get(FLIGHT_URL)
+                elapsed = time.perf_counter() - started
+        print(
+            f"{authentication_class.__name__}: "
+            f"{self.requests_count / elapsed:.0f} req/s, "
+            f"{len(queries) / self.requests_count:.1f} queries/request"
+        )
+
+    def test_flight_list(self):
+        print(f"\nFlight list, {self.requests_count} requests")
+        self.measure(JWTAuthentication)
+        self.measure(ClaimsJWTAuthentication)
@@ -0,0 +1,27 @@
+from rest_framework_simplejwt import tokens
+
+EMAIL_CLAIM = "email"
+IS_STAFF_CLAIM = "is_staff"
+TOKEN_VERSION_CLAIM = "token_version"
+
+
+class UserClaimsMixin:
+    """Sign the claims read requests need to skip loading the user"""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[EMAIL_CLAIM] = user.email
+        token[IS_STAFF_CLAIM] = user.is_staff
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+
+
+class AccessToken(UserClaimsMixin, tokens.AccessToken):
+    pass
+
+
+class RefreshToken(UserClaimsMixin, tokens.RefreshToken):
+    """Refresh token whose access tokens carry the user claims"""
+
+    access_token_class = AccessToken